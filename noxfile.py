@@ -403,7 +403,9 @@ def security_tests(session: nox.Session) -> None:
 def perf(session: nox.Session) -> None:
     """Run performance and load tests.
 
-    Tests focused on performance benchmarking and load testing.
+    Tests focused on performance benchmarking and load testing. Benchmark
+    results are saved as JSON under ``.benchmarks/``; compare against the
+    previous run with ``nox -s perf -- --benchmark-compare``.
     """
     session.install("-e", ".[dev]")
     session.run(
@@ -413,6 +415,8 @@ def perf(session: nox.Session) -> None:
         "-v",
         "--tb=short",
         "--durations=10",
+        "--no-cov",
+        "--benchmark-autosave",
         *session.posargs,
     )
 
@@ -14,8 +14,10 @@ Implements:
 
 from __future__ import annotations
 
+import asyncio
 import sys
 import time
+from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
@@ -43,6 +45,10 @@ class ReadinessCheck(BaseModel):
     status: bool = Field(..., description="Check passed")
     latency_ms: float | None = Field(None, description="Check latency in milliseconds")
     error: str | None = Field(None, description="Error message if failed")
+    critical: bool = Field(
+        default=True, description="A failure makes the application not ready"
+    )
+    detail: dict[str, Any] | None = Field(None, description="Dependency diagnostics")
 
 
 class ReadinessStatus(HealthStatus):
@@ -108,29 +114,44 @@ async def check_database() -> ReadinessCheck:
 async def check_cache() -> ReadinessCheck:
     """Check Redis/cache connectivity.
 
+    The cache is not critical: cache operations fall back to the wrapped
+    functions while Redis is down, so a failure is reported but does not
+    make the application unready. While the circuit breaker is open the
+    check reports its state without contacting Redis.
+
     Returns:
-        ReadinessCheck with cache status and latency
+        ReadinessCheck with cache status, latency and circuit breaker state
     """
     start = time.time()
     try:
-        # Example Redis check - adjust based on your cache implementation
-        # from template_sample.core.cache import redis_client
-        # await redis_client.ping()
+        from template_sample.core.cache import get_circuit_breaker, get_redis
+    except ImportError as e:
+        # Caching extra not installed
+        return ReadinessCheck(name="cache", status=False, error=str(e), critical=False)
+
+    breaker = get_circuit_breaker()
+    try:
+        redis = await get_redis()
+        await asyncio.wait_for(redis.ping(), timeout=breaker.probe_timeout)
 
-        # Placeholder - replace with actual cache check
         latency_ms = (time.time() - start) * 1000
         return ReadinessCheck(
             name="cache",
             status=True,
             latency_ms=round(latency_ms, 2),
+            critical=False,
+            detail={"circuit": breaker.stats()},
         )
     except Exception as e:
+        breaker.record_error(e)
         latency_ms = (time.time() - start) * 1000
         return ReadinessCheck(
             name="cache",
             status=False,
             latency_ms=round(latency_ms, 2),
-            error=str(e),
+            error=str(e) or type(e).__name__,
+            critical=False,
+            detail={"circuit": breaker.stats()},
         )
 
 
@@ -191,14 +212,13 @@ async def readiness() -> ReadinessStatus:
     # Run all checks in parallel for better performance
     # For now, run sequentially - can be optimized with asyncio.gather()
     checks["database"] = await check_database()
-    # Uncomment if using cache:
-    # checks["cache"] = await check_cache()
+    checks["cache"] = await check_cache()
 
     # Uncomment if checking external services:
     # checks["external_api"] = await check_external_service()
 
-    # Determine overall status
-    all_healthy = all(check.status for check in checks.values())
+    # Determine overall status (non-critical checks are reported only)
+    all_healthy = all(check.status for check in checks.values() if check.critical)
 
     if not all_healthy:
         # Return 503 if any critical check fails
@@ -6,6 +6,15 @@ This module provides production-ready caching patterns:
 - Async Redis connection pool
 - TTL (time-to-live) management
 - Cache warming patterns
+- Optional in-process L1 tier (bounded LRU with per-entry TTL)
+- Stampede protection (single-flight coalescing and Redis recompute locks)
+- Stale-while-revalidate with probabilistic early refresh (XFetch)
+- Pluggable binary serialization and compression (see core.serialization)
+- Tag-based invalidation (O(keys-in-tag) instead of a keyspace SCAN)
+- Versioned namespaces (O(1) invalidation of everything under a prefix)
+- Opt-in client-side caching kept coherent by Redis CLIENT TRACKING
+- Per-prefix hit/miss counters and latency histograms (see core.cache_metrics)
+- Circuit breaker that skips Redis immediately while it is unreachable
 
 Setup:
     1. Install Redis client:
@@ -17,6 +26,7 @@ Setup:
     3. Configure in .env:
        REDIS_URL=redis://localhost:6379/0
        CACHE_TTL_SECONDS=3600
+       REDIS_CLIENT_TRACKING=1  # optional, see enable_client_tracking()
 
 Performance:
     - 10-100x faster than database queries for cached data
@@ -26,96 +36,2099 @@ Performance:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import fnmatch
 import functools
-import hashlib
-import json
-import logging
+import importlib
+import math
+import random
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
 from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, TypeVar
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
+
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis, RedisCluster
+from redis.asyncio.connection import parse_url
+from redis.asyncio.sentinel import Sentinel
+from redis.cluster import LoadBalancingStrategy
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from template_sample.core.cache_keys import DEFAULT_DIGEST_SIZE, make_key_builder
+from template_sample.core.cache_memory import MemoryRedis, MemoryStore, register_script
+from template_sample.core.cache_metrics import CacheMetrics
+from template_sample.core.config import settings
+from template_sample.core.serialization import (
+    DEFAULT_ALLOWED_FORMATS,
+    CacheCodec,
+    compress_payload,
+)
+from template_sample.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Iterable,
+        Mapping,
+        Sequence,
+    )
+    from concurrent.futures import Executor
+
+    from fastapi import FastAPI
+
+    from template_sample.core.config import Settings
+
+    # Static tags, or a callable deriving them from the call's arguments
+    Tags = Sequence[str] | Callable[..., Sequence[str]] | None
+    Namespace = str | Callable[..., str] | None
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Global Redis connection pool
+_redis_pool: Redis | None = None
+# Clients for read replicas, when cache reads are routed to them
+_redis_replicas: list[Redis] = []
+# Serializes creation of the clients above (never taken once they exist)
+_redis_init_lock = threading.Lock()
+
+# Redis sets holding the keys registered under each tag
+_TAG_KEY_PREFIX = "cache:tag:"
+
+# Redis counters holding the current generation of each namespace
+_NAMESPACE_KEY_PREFIX = "cache:ns:"
+
+# How long a namespace generation is trusted locally before re-reading it.
+# Bounds how long other processes keep using a namespace after invalidation.
+NAMESPACE_REFRESH_SECONDS = 1.0
+
+# namespace -> (generation, refresh_at)
+_namespace_generations: dict[str, tuple[int, float]] = {}
+
+# Sentinel distinguishing "not cached" from a cached falsy value
+_MISSING: Any = object()
+
+
+# =============================================================================
+# In-Process L1 Cache
+# =============================================================================
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL and a byte budget.
+
+    Sits in front of Redis so hot keys are served without a network
+    round-trip or deserialization. Values are stored already decoded, so
+    callers must treat results returned from the cache as read-only.
+
+    Entries are evicted least-recently-used first whenever either
+    ``max_entries`` or ``max_bytes`` would be exceeded. Expired entries are
+    dropped lazily on access.
+
+    ``generation`` increases on every explicit invalidation (``delete``,
+    ``delete_pattern``, ``clear``). A caller that reads from Redis and then
+    fills the cache can pass the generation it saw before the read as
+    ``if_generation``, so a value invalidated in between is not re-inserted.
+
+    Example:
+        >>> local = LocalCache(max_entries=1000, max_bytes=8 * 1024 * 1024)
+        >>> local.set("user:123", {"name": "Ada"}, ttl=30, size=15)
+        >>> local.get("user:123")
+        {'name': 'Ada'}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the local cache.
+
+        Args:
+            max_entries: Maximum number of entries held at once
+            max_bytes: Maximum total payload size in bytes
+            clock: Monotonic clock used for expiry (injectable for tests)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # key -> (value, expires_at, size)
+        self._entries: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries currently held."""
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        """Get a value, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is absent or expired
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        size: int = 0,
+        if_generation: int | None = None,
+    ) -> bool:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Decoded value to store
+            ttl: Time to live in seconds
+            size: Payload size in bytes, counted against ``max_bytes``
+            if_generation: Only store if ``generation`` still equals this,
+                i.e. nothing was invalidated since the value was read
+
+        Returns:
+            True if stored, False if the entry can never fit, ttl <= 0, or
+            the generation changed
+        """
+        if if_generation is not None and if_generation != self.generation:
+            return False
+        if ttl <= 0 or size > self.max_bytes:
+            self.delete(key)
+            return False
+
+        self._remove(key)
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or self._bytes + size > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+        self._entries[key] = (value, self._clock() + ttl, size)
+        self._bytes += size
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key was present
+        """
+        self.generation += 1
+        return self._remove(key)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a Redis-style glob pattern.
+
+        Args:
+            pattern: Key pattern (supports * wildcard)
+
+        Returns:
+            Number of keys deleted
+        """
+        self.generation += 1
+        matches = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in matches:
+            self._remove(key)
+        return len(matches)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self.generation += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get local cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / max(lookups, 1)) * 100,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+
+# Global L1 cache shared by all @cached functions that opt in via local_ttl
+_local_cache = LocalCache()
+
+
+def get_local_cache() -> LocalCache:
+    """Get the process-wide L1 cache.
+
+    Returns:
+        The shared LocalCache instance
+    """
+    return _local_cache
+
+
+def configure_local_cache(
+    max_entries: int = 1024,
+    max_bytes: int = 16 * 1024 * 1024,
+) -> LocalCache:
+    """Replace the process-wide L1 cache with a newly sized one.
+
+    Call this once at startup, before serving traffic.
+
+    Args:
+        max_entries: Maximum number of entries held at once
+        max_bytes: Maximum total payload size in bytes
+
+    Returns:
+        The new LocalCache instance
+    """
+    global _local_cache
+
+    _local_cache = LocalCache(max_entries=max_entries, max_bytes=max_bytes)
+    return _local_cache
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+# Global codec used by every cache operation that is not given its own
+_codec = CacheCodec()
+
+
+def get_codec() -> CacheCodec:
+    """Get the process-wide cache codec.
+
+    Returns:
+        The shared CacheCodec instance
+    """
+    return _codec
+
+
+def configure_codec(
+    serializer: str = "json",
+    compression: str | None = None,
+    compress_threshold: int = 1024,
+    *,
+    allowed_formats: Iterable[str] = DEFAULT_ALLOWED_FORMATS,
+) -> CacheCodec:
+    """Replace the process-wide cache codec.
+
+    Entries written with the previous codec remain readable if its format is
+    in ``allowed_formats``, because every payload records its own format in
+    a header byte. Entries in other formats are treated as misses.
+
+    Args:
+        serializer: "json" (default), "msgpack" or "pickle"
+        compression: "zlib", "zstd", "lz4" or None
+        compress_threshold: Only compress payloads at least this many bytes
+        allowed_formats: Other serializers to decode (default: json and
+            msgpack); add "pickle" only if Redis is fully trusted
+
+    Returns:
+        The new CacheCodec instance
+
+    Example:
+        >>> # Lossless Decimals/datetimes, zstd for payloads over 1 KiB
+        >>> configure_codec("msgpack", compression="zstd")
+    """
+    global _codec
+
+    _codec = CacheCodec(
+        serializer, compression, compress_threshold, allowed_formats=allowed_formats
+    )
+    return _codec
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+# Global metrics recorded by every cache operation
+_metrics = CacheMetrics()
+
+
+def get_cache_metrics() -> CacheMetrics:
+    """Get the process-wide cache metrics.
+
+    Returns:
+        The shared CacheMetrics instance
+
+    Example:
+        >>> get_cache_metrics().snapshot()["user"]["hits"]
+        {'local': 120, 'redis': 31}
+        >>> text = get_cache_metrics().render_prometheus()
+    """
+    return _metrics
+
+
+def _key_prefix(key: str) -> str:
+    """Metrics label for a raw key: its first ``:``-separated segment."""
+    return key.partition(":")[0]
+
+
+def _encode_observed(codec: CacheCodec, value: Any, prefix: str) -> bytes:
+    """Encode a value, recording serialize time and payload size."""
+    start = time.perf_counter()
+    payload = codec.encode(value)
+    _metrics.observe("serialize_seconds", prefix, time.perf_counter() - start)
+    _metrics.observe("payload_bytes", prefix, len(payload))
+    return payload
+
+
+def _decode_observed(codec: CacheCodec, payload: bytes, prefix: str) -> Any:
+    """Decode a payload, recording deserialize time."""
+    start = time.perf_counter()
+    value = codec.decode(payload)
+    _metrics.observe("deserialize_seconds", prefix, time.perf_counter() - start)
+    return value
+
+
+# =============================================================================
+# Entry Size Limits
+# =============================================================================
+
+OversizePolicy = Literal["skip", "compress", "chunk"]
+
+# First bytes of a chunk manifest; never the start of a codec payload (whose
+# first byte has bit 7 set) or of legacy JSON
+_CHUNK_MANIFEST_MAGIC = b"\x00chunks:"
+
+
+@dataclass(frozen=True)
+class EntrySizeLimit:
+    """What to do with encoded entries larger than ``max_bytes``.
+
+    Policies:
+        skip: Don't cache the entry; the function runs again next time.
+        compress: Compress the payload (if the codec didn't already) and
+            skip it if it is still too large.
+        chunk: Store the payload as ``chunk_bytes`` pieces under
+            ``{key}:chunk:{id}:{n}`` keys, with a small manifest under the
+            key itself. Chunks expire with the entry; deleting just the key
+            leaves them to expire on their own.
+
+    Attributes:
+        max_bytes: Largest payload stored as-is (0 disables the limit)
+        policy: "skip", "compress" or "chunk"
+        chunk_bytes: Size of each chunk
+        compression: Compressor used by the compress policy
+    """
+
+    max_bytes: int = 0
+    policy: OversizePolicy = "skip"
+    chunk_bytes: int = 512 * 1024
+    compression: str = "zlib"
+
+
+# Global limit applied by cached(), set_cached(), set_many() and warm_cache()
+_size_limit = EntrySizeLimit(
+    max_bytes=settings.cache_max_entry_bytes,
+    policy=settings.cache_oversize_policy,
+    chunk_bytes=settings.cache_chunk_bytes,
+    compression=settings.cache_oversize_compression,
+)
+
+
+def get_entry_size_limit() -> EntrySizeLimit:
+    """Get the process-wide entry size limit.
+
+    Returns:
+        The shared EntrySizeLimit
+    """
+    return _size_limit
+
+
+def configure_entry_size_limit(
+    max_bytes: int,
+    policy: OversizePolicy = "skip",
+    chunk_bytes: int = 512 * 1024,
+    compression: str = "zlib",
+) -> EntrySizeLimit:
+    """Replace the process-wide entry size limit.
+
+    Args:
+        max_bytes: Largest payload stored as-is (0 disables the limit)
+        policy: "skip", "compress" or "chunk" (see :class:`EntrySizeLimit`)
+        chunk_bytes: Size of each chunk for the chunk policy
+        compression: "zlib", "zstd" or "lz4" for the compress policy
+
+    Returns:
+        The new EntrySizeLimit
+
+    Example:
+        >>> # Split anything over 1 MiB into 256 KiB pieces
+        >>> configure_entry_size_limit(1024 * 1024, "chunk", chunk_bytes=256 * 1024)
+    """
+    global _size_limit
+
+    _size_limit = EntrySizeLimit(max_bytes, policy, chunk_bytes, compression)
+    return _size_limit
+
+
+def _fit_payload(
+    payload: bytes, key: str, prefix: str, limit: EntrySizeLimit
+) -> tuple[bytes | None, int]:
+    """Apply the oversize policy to an encoded entry.
+
+    Returns:
+        ``(payload, chunk_bytes)``: the payload to store, or None to skip
+        caching, and the chunk size to split it with (0 for a single key)
+    """
+    if not limit.max_bytes or len(payload) <= limit.max_bytes:
+        return payload, 0
+
+    if limit.policy == "chunk":
+        _metrics.inc("oversized", prefix, "chunked")
+        return payload, limit.chunk_bytes
+    if limit.policy == "compress":
+        compressed = compress_payload(payload, limit.compression)
+        if len(compressed) <= limit.max_bytes:
+            _metrics.inc("oversized", prefix, "compressed")
+            return compressed, 0
+
+    _metrics.inc("oversized", prefix, "skipped")
+    logger.warning(
+        "cache_entry_oversized",
+        key=key,
+        size=len(payload),
+        max_bytes=limit.max_bytes,
+        policy=limit.policy,
+    )
+    return None, 0
+
+
+def _split_payload(
+    key: str, payload: bytes, chunk_bytes: int
+) -> tuple[bytes, dict[str, bytes]]:
+    """Split a payload into chunk keys plus the manifest stored at ``key``."""
+    chunk_id = secrets.token_hex(4)
+    chunks = {
+        f"{key}:chunk:{chunk_id}:{index}": payload[start : start + chunk_bytes]
+        for index, start in enumerate(range(0, len(payload), chunk_bytes))
+    }
+    manifest = _CHUNK_MANIFEST_MAGIC + (
+        f"{chunk_id}:{len(chunks)}:{len(payload)}".encode()
+    )
+    return manifest, chunks
+
+
+async def _join_chunks(redis: Redis, key: str, payload: bytes) -> bytes | None:
+    """Resolve a chunk manifest into the full payload.
+
+    Returns:
+        ``payload`` itself if it is not a manifest, the reassembled payload,
+        or None if any chunk has expired or been evicted (a cache miss)
+    """
+    if not payload.startswith(_CHUNK_MANIFEST_MAGIC):
+        return payload
+    chunk_id, count, size = payload[len(_CHUNK_MANIFEST_MAGIC) :].decode().split(":")
+    keys = [f"{key}:chunk:{chunk_id}:{index}" for index in range(int(count))]
+    if isinstance(redis, RedisCluster):
+        chunks = await redis.mget_nonatomic(keys)
+    else:
+        chunks = await redis.mget(keys)
+    if any(chunk is None for chunk in chunks):
+        logger.debug("cache_chunks_missing", key=key)
+        return None
+    joined = b"".join(chunks)
+    return joined if len(joined) == int(size) else None
+
+
+async def _get_payload(redis: Redis, key: str) -> bytes | None:
+    """GET a key, reassembling chunked entries."""
+    payload = await redis.get(key)
+    if payload is None:
+        return None
+    return await _join_chunks(redis, key, payload)
+
+
+# =============================================================================
+# Circuit Breaker
+# =============================================================================
+
+
+# Gauge values exported as cache_circuit_state
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CacheUnavailableError(RedisError):
+    """Raised instead of contacting Redis while the circuit breaker is open.
+
+    Subclasses ``RedisError``, so every cache operation already falls back
+    (calls the wrapped function, returns the default, ...) without waiting
+    for a connection or socket timeout.
+    """
+
+
+class CircuitBreaker:
+    """Circuit breaker for Redis connectivity.
+
+    - closed: requests go to Redis. ``failure_threshold`` connection or
+      timeout errors within ``failure_window`` seconds open the circuit.
+    - open: requests fail fast with :class:`CacheUnavailableError` for
+      ``reset_timeout`` seconds.
+    - half-open: one caller probes Redis with a PING (bounded by
+      ``probe_timeout``) while everyone else keeps failing fast. Success
+      closes the circuit; failure re-opens it.
+
+    Errors where Redis answered (e.g. ``ResponseError``) don't count, since
+    the server is reachable.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=5, reset_timeout=5)
+        >>> breaker.record_error(redis.exceptions.TimeoutError())
+        >>> breaker.state
+        'closed'
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        failure_window: float = 10.0,
+        reset_timeout: float = 5.0,
+        probe_timeout: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Failures within the window that open the
+                circuit (0 disables the breaker)
+            failure_window: Sliding window for counting failures, in seconds
+            reset_timeout: Seconds to stay open before probing
+            probe_timeout: Seconds to wait for the half-open PING
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._failures: deque[float] = deque()
+        self._probing = False
+
+    def record_error(self, error: BaseException) -> None:
+        """Count a failed Redis operation.
+
+        Args:
+            error: The exception the operation raised
+        """
+        if (
+            self.state != self.CLOSED
+            or not self.failure_threshold
+            or isinstance(error, CacheUnavailableError)
+            or not isinstance(error, (RedisConnectionError, RedisTimeoutError))
+        ):
+            return
+
+        now = self._clock()
+        self._failures.append(now)
+        while self._failures and self._failures[0] <= now - self.failure_window:
+            self._failures.popleft()
+        if len(self._failures) >= self.failure_threshold:
+            self._open(now)
+
+    def try_acquire_probe(self) -> bool:
+        """Claim the half-open probe if the circuit is open and has cooled down.
+
+        Returns:
+            True if the caller should probe Redis and report the result with
+            :meth:`record_probe`
+        """
+        if self._probing or self.state == self.CLOSED:
+            return False
+        if self._clock() < self.opened_at + self.reset_timeout:
+            return False
+        self._probing = True
+        self._set_state(self.HALF_OPEN)
+        return True
+
+    def record_probe(self, success: bool) -> None:
+        """Report the half-open probe's outcome.
+
+        Args:
+            success: Whether Redis answered the probe
+        """
+        self._probing = False
+        if success:
+            self._failures.clear()
+            self._set_state(self.CLOSED)
+            logger.info("cache_circuit_closed")
+        else:
+            self._open(self._clock())
+
+    def stats(self) -> dict[str, Any]:
+        """Get breaker state for diagnostics.
+
+        Returns:
+            Dictionary with the state, recent failures and open count
+        """
+        return {
+            "state": self.state,
+            "recent_failures": len(self._failures),
+            "times_opened": self.times_opened,
+        }
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self._failures.clear()
+        if self.state == self.CLOSED:
+            self.times_opened += 1
+            logger.warning("cache_circuit_opened", reset_timeout=self.reset_timeout)
+        self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        _metrics.set_gauge("circuit_state", _CIRCUIT_STATE_VALUES[state])
+
+
+# Global breaker guarding every cache operation
+_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    failure_window=settings.redis_breaker_failure_window,
+    reset_timeout=settings.redis_breaker_reset_timeout,
+    probe_timeout=settings.redis_breaker_probe_timeout,
+)
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide Redis circuit breaker.
+
+    Returns:
+        The shared CircuitBreaker instance
+    """
+    return _circuit_breaker
+
+
+async def _check_circuit(client: Redis) -> None:
+    """Fail fast while the circuit is open; run the half-open probe.
+
+    Raises:
+        CacheUnavailableError: If Redis should not be contacted
+    """
+    breaker = _circuit_breaker
+    if not breaker.try_acquire_probe():
+        msg = "Redis circuit breaker is open"
+        raise CacheUnavailableError(msg)
+    try:
+        await asyncio.wait_for(client.ping(), timeout=breaker.probe_timeout)
+    except (RedisError, OSError, TimeoutError) as e:
+        breaker.record_probe(success=False)
+        msg = "Redis circuit breaker is open (probe failed)"
+        raise CacheUnavailableError(msg) from e
+    except BaseException:
+        # Cancelled mid-probe: count it as failed so the probe slot is freed
+        breaker.record_probe(success=False)
+        raise
+    breaker.record_probe(success=True)
+
+
+def _log_redis_error(
+    error: RedisError, event: str, *, level: str = "warning", **fields: Any
+) -> None:
+    """Log a cache operation that failed with a Redis error.
+
+    Fast failures while the circuit breaker is open are logged at debug
+    level: the breaker already logged the outage when it opened, and a
+    warning per call would flood the logs for as long as it lasts.
+    """
+    if isinstance(error, CacheUnavailableError):
+        logger.debug(event, error=str(error), **fields)
+    else:
+        getattr(logger, level)(event, error=str(error), **fields)
+
+
+# =============================================================================
+# Connection Management
+# =============================================================================
+
+
+def create_redis_clients(config: Settings | None = None) -> tuple[Redis, list[Redis]]:
+    """Build the cache's Redis clients from settings.
+
+    No connection is opened until the first command.
+
+    Args:
+        config: Settings to use (default: the global ``settings``)
+
+    Returns:
+        ``(primary, replicas)``: the client used for writes, and clients
+        for cache reads (empty when reads go to the primary, or when Redis
+        Cluster routes reads to replicas itself). In Cluster mode the
+        primary is a ``RedisCluster``, and in memory mode a
+        :class:`~template_sample.core.cache_memory.MemoryRedis`; both have
+        the same command API.
+
+    Raises:
+        ValueError: If Sentinel mode is selected without any sentinels
+        ImportError: If fakeredis mode is selected without fakeredis installed
+    """
+    config = config or settings
+
+    if config.redis_mode == "memory":
+        store = MemoryStore(
+            max_entries=config.cache_memory_max_entries,
+            max_bytes=config.cache_memory_max_bytes,
+        )
+        return cast("Redis", MemoryRedis(store)), []
+
+    if config.redis_mode == "fakeredis":
+        try:
+            fakeredis = importlib.import_module("fakeredis.aioredis")
+        except ImportError as e:
+            msg = "redis_mode='fakeredis' requires fakeredis: pip install fakeredis"
+            raise ImportError(msg) from e
+        return fakeredis.FakeRedis(max_connections=config.redis_max_connections), []
+
+    common: dict[str, Any] = {
+        "decode_responses": False,  # Cache payloads may be binary
+        "socket_keepalive": True,
+        "socket_connect_timeout": config.redis_connect_timeout,
+        "socket_timeout": config.redis_socket_timeout,
+        "health_check_interval": config.redis_health_check_interval,
+    }
+
+    if config.redis_mode == "cluster":
+        cluster = RedisCluster.from_url(
+            config.redis_url,
+            max_connections=config.redis_max_connections,
+            load_balancing_strategy=(
+                LoadBalancingStrategy.ROUND_ROBIN_REPLICAS
+                if config.redis_read_from_replicas
+                else None
+            ),
+            **common,
+        )
+        return cast("Redis", cluster), []
+
+    if config.redis_mode == "sentinel":
+        if not config.redis_sentinels:
+            msg = "redis_mode='sentinel' requires redis_sentinels"
+            raise ValueError(msg)
+        addresses = [
+            (host, int(port))
+            for host, _, port in (
+                address.rpartition(":") for address in config.redis_sentinels
+            )
+        ]
+        # Credentials and database come from the URL; its host is unused
+        auth = {
+            key: value
+            for key, value in parse_url(config.redis_url).items()
+            if key in {"username", "password", "db"}
+        }
+        sentinel = Sentinel(
+            addresses,
+            sentinel_kwargs={
+                "socket_timeout": config.redis_socket_timeout,
+                "socket_connect_timeout": config.redis_connect_timeout,
+            },
+            **auth,
+            **common,
+        )
+        service = config.redis_sentinel_service
+        pool_kwargs = {"max_connections": config.redis_max_connections}
+        primary = sentinel.master_for(service, **pool_kwargs)
+        if config.redis_read_from_replicas:
+            return primary, [sentinel.slave_for(service, **pool_kwargs)]
+        return primary, []
+
+    common["retry_on_timeout"] = True
+
+    def standalone(url: str) -> Redis:
+        if config.redis_pool_blocking:
+            pool = BlockingConnectionPool.from_url(
+                url,
+                max_connections=config.redis_max_connections,
+                timeout=config.redis_pool_timeout,
+                **common,
+            )
+        else:
+            pool = ConnectionPool.from_url(
+                url, max_connections=config.redis_max_connections, **common
+            )
+        return Redis.from_pool(pool)
+
+    replicas = (
+        [standalone(url) for url in config.redis_replica_urls]
+        if config.redis_read_from_replicas
+        else []
+    )
+    return standalone(config.redis_url), replicas
+
+
+async def get_redis(read_only: bool = False) -> Redis:
+    """Get Redis connection from pool.
+
+    The topology, pool size and timeouts come from ``core.config.Settings``
+    (see :func:`create_redis_clients`).
+
+    Args:
+        read_only: The caller only reads cache entries, so the command may
+            go to a read replica when ``redis_read_from_replicas`` is set.
+            Replicas lag the primary slightly; leave False for reads that
+            must observe a write made just before (locks, counters).
+
+    Returns:
+        Redis connection
+
+    Raises:
+        CacheUnavailableError: While the circuit breaker is open
+
+    Example:
+        >>> redis = await get_redis()
+        >>> await redis.set("key", "value", ex=60)
+        >>> value = await redis.get("key")  # b"value"
+
+    Note:
+        Responses are not decoded (values are ``bytes``), since cache
+        payloads may be binary.
+    """
+    if _redis_pool is None and _create_global_clients():
+        logger.info(
+            "redis_connection_initialized",
+            mode=settings.redis_mode,
+            max_connections=settings.redis_max_connections,
+            replicas=len(_redis_replicas),
+        )
+
+        if settings.redis_client_tracking:
+            try:
+                await enable_client_tracking(settings.redis_client_tracking_prefixes)
+            except RedisError as e:
+                _circuit_breaker.record_error(e)
+                # Caching still works, just without the coherent L1 tier
+                _log_redis_error(e, "cache_client_tracking_unavailable")
+
+    if _circuit_breaker.state != CircuitBreaker.CLOSED:
+        await _check_circuit(_redis_pool)
+
+    # Tracked L1 entries must be read on a connection that is tracking them
+    if read_only and _redis_replicas and not _tracking_local_ttl:
+        return random.choice(_redis_replicas)  # noqa: S311 - load spreading
+    return _redis_pool
+
+
+def _create_global_clients() -> bool:
+    """Create the global clients unless another caller already has.
+
+    Building clients does no I/O, so within one event loop nothing can
+    interleave between the check and the assignment; the lock covers
+    callers in other threads. Replicas are published before the primary,
+    so anyone who sees the primary also sees its replicas.
+
+    Returns:
+        True if this call created the clients
+    """
+    global _redis_pool, _redis_replicas
+
+    with _redis_init_lock:
+        if _redis_pool is not None:
+            return False
+        primary, replicas = create_redis_clients()
+        _redis_replicas = replicas
+        _redis_pool = primary
+        return True
+
+
+async def warm_redis_connections(min_connections: int | None = None) -> int:
+    """Open pooled connections ahead of traffic.
+
+    Issues concurrent PINGs, each of which holds its own connection, so the
+    pool ends up with ``min_connections`` established connections to the
+    primary (and to each read replica) that later requests reuse.
+
+    Args:
+        min_connections: Connections per client (default:
+            ``settings.redis_min_connections``), capped at the pool size
+
+    Returns:
+        Number of connections successfully opened across all clients
+    """
+    if min_connections is None:
+        min_connections = settings.redis_min_connections
+    count = min(min_connections, settings.redis_max_connections)
+    if count <= 0:
+        return 0
+
+    primary = await get_redis()
+    results = await asyncio.gather(
+        *(
+            client.ping()
+            for client in (primary, *_redis_replicas)
+            for _ in range(count)
+        ),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    opened = len(results) - len(errors)
+    if errors:
+        logger.warning(
+            "redis_warmup_incomplete",
+            opened=opened,
+            failed=len(errors),
+            error=str(errors[0]),
+        )
+    else:
+        logger.info("redis_warmup_complete", connections=opened)
+    return opened
+
+
+async def open_cache(min_connections: int | None = None) -> None:
+    """Initialize the cache clients, pre-warm their pools and warm keys.
+
+    Keys registered with :func:`get_warmup_registry` are loaded with
+    ``settings.cache_warmup_concurrency`` loaders at a time, within
+    ``settings.cache_warmup_budget`` seconds.
+
+    Safe to call when Redis is down: warm-up failures are logged and the
+    cache degrades as usual until Redis is reachable.
+
+    Args:
+        min_connections: Connections to pre-open per client (default:
+            ``settings.redis_min_connections``)
+    """
+    await get_redis()
+    await warm_redis_connections(min_connections)
+    if len(_warmup_registry):
+        await _warmup_registry.run(
+            concurrency=settings.cache_warmup_concurrency,
+            budget=settings.cache_warmup_budget or None,
+        )
+
+
+def init_cache(app: FastAPI, min_connections: int | None = None) -> None:
+    """Hook cache startup and shutdown into a FastAPI app's lifespan.
+
+    On startup the Redis clients are created and pre-warmed (see
+    :func:`open_cache`) before the app's own lifespan runs; on shutdown
+    they are closed after it. Any ``lifespan`` the app already has keeps
+    working.
+
+    Args:
+        app: FastAPI application
+        min_connections: Connections to pre-open per client (default:
+            ``settings.redis_min_connections``)
+
+    Example:
+        >>> app = FastAPI(lifespan=lifespan)
+        >>> init_cache(app)
+    """
+    inner = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(lifespan_app: Any) -> AsyncIterator[Any]:
+        await open_cache(min_connections)
+        try:
+            async with inner(lifespan_app) as state:
+                yield state
+        finally:
+            await close_redis()
+
+    app.router.lifespan_context = lifespan
+
+
+async def close_redis() -> None:
+    """Close Redis connection pools.
+
+    Call this on application shutdown.
+    """
+    global _redis_pool, _redis_replicas
+
+    await disable_client_tracking()
+    for replica in _redis_replicas:
+        await replica.aclose()
+    _redis_replicas = []
+    if _redis_pool is not None:
+        await _redis_pool.aclose()
+        _redis_pool = None
+        logger.info("redis_connection_closed")
+
+
+# =============================================================================
+# Client-Side Caching
+# =============================================================================
+
+# Channel Redis publishes tracking invalidations on (redirect mode)
+_INVALIDATE_CHANNEL = b"__redis__:invalidate"
+
+# Listener task receiving invalidations while client tracking is enabled
+_tracking_task: asyncio.Task[None] | None = None
+
+# L1 TTL for get_cached() while tracking keeps L1 coherent (0 = not active)
+_tracking_local_ttl = 0
+
+
+def is_client_tracking_active() -> bool:
+    """Check whether L1 is currently kept coherent by Redis invalidations.
+
+    Returns:
+        True while the invalidation listener is connected
+    """
+    return _tracking_local_ttl > 0
+
+
+async def enable_client_tracking(
+    prefixes: Sequence[str] = (), local_ttl: int = 300
+) -> None:
+    """Enable Redis server-assisted client-side caching.
+
+    Every pooled connection turns on ``CLIENT TRACKING`` and redirects
+    invalidation messages to a dedicated listener connection. Whenever a
+    key this process has read is modified anywhere (another replica, a
+    worker, ``redis-cli``), Redis pushes an invalidation and the key is
+    dropped from the L1 cache. While tracking is active, :func:`get_cached`
+    serves repeated reads from L1 and ``@cached(local_ttl=...)`` entries
+    are evicted as soon as another process changes them.
+
+    Invalidations are redirected to a dedicated listener connection, so
+    this does not depend on RESP3 push support in the client. If the
+    listener connection drops, L1 is cleared and reads go to Redis until
+    it reconnects.
+
+    Opt in at startup with ``REDIS_CLIENT_TRACKING=1`` (and optionally
+    ``REDIS_CLIENT_TRACKING_PREFIXES='["user:", "product:"]'``), see
+    ``Settings.redis_client_tracking``, or call this directly.
+
+    Args:
+        prefixes: Track only keys with these prefixes, in broadcast mode
+            (Redis remembers prefixes instead of every key read, which uses
+            less server memory). Empty tracks exactly the keys read.
+        local_ttl: Upper bound on how long get_cached() keeps a value in
+            L1; a safety net for missed invalidations
+
+    Raises:
+        RedisError: If the listener cannot connect or subscribe
+
+    Example:
+        >>> await enable_client_tracking(prefixes=["config:", "feature:"])
+        >>> await get_cached("config:limits")  # Redis round-trip
+        >>> await get_cached("config:limits")  # Served from process memory
+    """
+    global _tracking_task
+
+    if _tracking_task is not None:
+        return
+
+    redis = await get_redis()
+    if isinstance(redis, RedisCluster):
+        msg = "Client tracking is not supported in Redis Cluster mode"
+        raise RedisError(msg)
+    if isinstance(redis, MemoryRedis):
+        msg = "Client tracking needs a Redis server, not the memory backend"
+        raise RedisError(msg)
+    ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    _tracking_task = asyncio.create_task(
+        _track_invalidations(redis, list(prefixes), local_ttl, ready)
+    )
+    try:
+        await ready
+    except BaseException:
+        _tracking_task = None
+        raise
+
+    logger.info(
+        "cache_client_tracking_enabled", prefixes=list(prefixes), local_ttl=local_ttl
+    )
+
+
+async def disable_client_tracking() -> None:
+    """Disable client-side caching and stop the invalidation listener.
+
+    Pooled connections are reconnected without tracking, and L1 is cleared
+    since it no longer receives invalidations.
+    """
+    global _tracking_task, _tracking_local_ttl
+
+    if _tracking_task is None:
+        return
+
+    task, _tracking_task = _tracking_task, None
+    _tracking_local_ttl = 0
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+    if _redis_pool is not None:
+        await _install_connect_hook(_redis_pool, None)
+    _local_cache.clear()
+    logger.info("cache_client_tracking_disabled")
+
+
+async def _track_invalidations(
+    redis: Redis,
+    prefixes: list[str],
+    local_ttl: int,
+    ready: asyncio.Future[None],
+) -> None:
+    """Run the invalidation listener, reconnecting with backoff."""
+    global _tracking_local_ttl
+
+    backoff = 0.1
+    while True:
+        pool = redis.connection_pool
+        # No read timeout: the listener legitimately idles between messages
+        kwargs = {**pool.connection_kwargs, "socket_timeout": None}
+        kwargs.pop("redis_connect_func", None)
+        listener = pool.connection_class(**kwargs)
+        try:
+            await listener.connect()
+            await listener.send_command("CLIENT", "ID")
+            client_id = int(await listener.read_response())
+            await listener.send_command("SUBSCRIBE", _INVALIDATE_CHANNEL)
+            await listener.read_response()
+
+            # Reconnect pooled connections so they redirect to this listener,
+            # and check the server accepts CLIENT TRACKING (Redis 6+)
+            await _install_connect_hook(redis, _tracking_hook(client_id, prefixes))
+            await redis.ping()
+            _local_cache.clear()
+            _tracking_local_ttl = local_ttl
+            if not ready.done():
+                ready.set_result(None)
+            backoff = 0.1
+
+            while True:
+                _handle_invalidation(await listener.read_response())
+
+        except (RedisError, OSError) as e:
+            _tracking_local_ttl = 0
+            # Redirecting to a dead listener would fail every new connection
+            with contextlib.suppress(RedisError, OSError):
+                await _install_connect_hook(redis, None)
+            if not ready.done():
+                ready.set_exception(e)
+                return
+            # Invalidations may have been missed while disconnected
+            _local_cache.clear()
+            logger.warning("cache_tracking_listener_lost", error=str(e))
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 5.0)
+        finally:
+            await listener.disconnect()
+
+
+def _tracking_hook(
+    client_id: int, prefixes: Sequence[str]
+) -> Callable[[Any], Awaitable[None]]:
+    """Build an on-connect hook enabling tracking redirected to client_id."""
+    command: list[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", client_id]
+    if prefixes:
+        command.append("BCAST")
+        for prefix in prefixes:
+            command.extend(["PREFIX", prefix])
+
+    async def on_connect(connection: Any) -> None:
+        await connection.on_connect()
+        await connection.send_command(*command)
+        response = await connection.read_response()
+        if response not in (b"OK", "OK"):
+            msg = f"CLIENT TRACKING failed: {response!r}"
+            raise RedisError(msg)
+
+    return on_connect
+
+
+async def _install_connect_hook(
+    redis: Redis, hook: Callable[[Any], Awaitable[None]] | None
+) -> None:
+    """Apply an on-connect hook to new and existing pooled connections.
+
+    Existing connections are disconnected so they run the hook when next
+    used; commands in flight on them are retried by redis-py.
+    """
+    pool = redis.connection_pool
+    pool.connection_kwargs["redis_connect_func"] = hook
+    # redis-py has no public way to reach connections it already created
+    existing = (*pool._available_connections, *pool._in_use_connections)  # noqa: SLF001
+    for connection in existing:
+        connection.redis_connect_func = hook
+    await pool.disconnect()
+
+
+def _handle_invalidation(message: Any) -> None:
+    """Drop invalidated keys from L1.
+
+    Messages arrive as ``[b"message", channel, keys]``; ``keys`` is None
+    when Redis flushed the whole database.
+    """
+    if not isinstance(message, list) or len(message) != 3:
+        return
+    if message[0] != b"message" or message[1] != _INVALIDATE_CHANNEL:
+        return
+    keys = message[2]
+    if keys is None:
+        _local_cache.clear()
+        return
+    if not isinstance(keys, list):
+        return
+    for key in keys:
+        _local_cache.delete(key.decode() if isinstance(key, bytes) else key)
+
+
+# =============================================================================
+# Stampede Protection
+# =============================================================================
+
+# In-flight computations keyed by cache key (per-process single-flight)
+_inflight: dict[str, asyncio.Future[Any]] = {}
+
+# Delete the lock only if we still own it (compare-and-delete)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _release_lock_in_memory(
+    store: MemoryStore, keys: list[bytes], args: list[bytes]
+) -> int:
+    """Equivalent of _RELEASE_LOCK_SCRIPT for the memory backend."""
+    if store.get(keys[0]) == args[0]:
+        return int(store.delete(keys[0]))
+    return 0
+
+
+register_script(_RELEASE_LOCK_SCRIPT, _release_lock_in_memory)
+
+
+def _start_flight(key: str, fn: Callable[[], Awaitable[T]]) -> asyncio.Future[T]:
+    """Get the in-flight computation for a key, starting it if needed.
+
+    Args:
+        key: Cache key identifying the computation
+        fn: Coroutine function producing the value
+
+    Returns:
+        Task running the shared computation
+    """
+    task = _inflight.get(key)
+    if task is not None:
+        logger.debug("cache_coalesced", key=key)
+        return task
+
+    task = asyncio.ensure_future(fn())
+    _inflight[key] = task
+
+    def _forget(done: asyncio.Future[Any]) -> None:
+        if _inflight.get(key) is done:
+            del _inflight[key]
+
+    task.add_done_callback(_forget)
+    return task
+
+
+async def _single_flight(key: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """Run ``fn`` once per key, sharing its result with concurrent callers.
+
+    The computation runs in its own task, so cancelling the caller that
+    started it does not cancel the result other callers are waiting on.
+
+    Args:
+        key: Cache key identifying the computation
+        fn: Coroutine function producing the value
+
+    Returns:
+        Result of the shared computation
+    """
+    return await asyncio.shield(_start_flight(key, fn))
+
+
+def _refresh_in_background(key: str, fn: Callable[[], Awaitable[Any]]) -> None:
+    """Start a background recomputation unless one is already running.
+
+    Callers that miss while the refresh runs coalesce onto it. Failures are
+    logged rather than raised, since the caller was already served.
+
+    Args:
+        key: Cache key being refreshed
+        fn: Coroutine function that computes and stores the value
+    """
+    if key in _inflight:
+        return
+
+    def _log_failure(done: asyncio.Future[Any]) -> None:
+        if not done.cancelled() and done.exception() is not None:
+            logger.warning("cache_refresh_failed", key=key, error=str(done.exception()))
+
+    logger.debug("cache_refresh_scheduled", key=key)
+    _start_flight(key, fn).add_done_callback(_log_failure)
+
+
+async def _recompute_with_lock(
+    redis: Redis,
+    cache_key: str,
+    compute: Callable[[], Awaitable[T]],
+    lock_ttl: float,
+    *,
+    decode: Callable[[bytes], Any],
+    poll_interval: float = 0.05,
+) -> T:
+    """Recompute a value while holding a short Redis lock.
+
+    Only the worker that acquires ``{cache_key}:lock`` runs ``compute``;
+    the others poll for the value it stores. If the value has not appeared
+    when the lock expires, waiters compute it themselves.
+
+    Args:
+        redis: Redis connection
+        cache_key: Cache key being recomputed
+        compute: Coroutine function that computes and stores the value
+        lock_ttl: Lock expiry (and maximum wait) in seconds
+        decode: Decodes the stored payload into the value
+        poll_interval: Delay between cache polls while waiting
+
+    Returns:
+        Computed or freshly cached value
+    """
+    lock_key = f"{cache_key}:lock"
+    token = secrets.token_hex(8)
+
+    if await redis.set(lock_key, token, nx=True, px=int(lock_ttl * 1000)):
+        try:
+            return await compute()
+        finally:
+            await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    logger.debug("cache_lock_wait", key=cache_key)
+    deadline = time.monotonic() + lock_ttl
+    while time.monotonic() < deadline:
+        await asyncio.sleep(poll_interval)
+        cached_value = await _get_payload(redis, cache_key)
+        if cached_value is not None:
+            return decode(cached_value)
+
+    logger.warning("cache_lock_wait_timeout", key=cache_key)
+    return await compute()
+
+
+# =============================================================================
+# Stale-While-Revalidate
+# =============================================================================
+
+
+def _encode_envelope(codec: CacheCodec, value: Any, ttl: int, delta: float) -> bytes:
+    """Wrap a value with its soft expiry and recompute cost.
+
+    The envelope is a ``[kind, value, soft expiry, delta]`` list encoded as
+    a codec record, so it is recognized by the header flag rather than by
+    its contents. ``kind`` is "error" for a :class:`_CachedError` (which is
+    always stored in an envelope) and "value" otherwise.
+
+    Args:
+        codec: Codec used to encode the envelope
+        value: Value to cache
+        ttl: Soft TTL in seconds (after which the value is stale)
+        delta: Seconds the value took to compute
+
+    Returns:
+        Encoded payload
+    """
+    if isinstance(value, _CachedError):
+        envelope = ["error", value.data, time.time() + ttl, delta]
+    else:
+        envelope = ["value", value, time.time() + ttl, delta]
+    return codec.encode(envelope, record=True)
+
+
+def _decode_envelope(codec: CacheCodec, payload: bytes) -> tuple[Any, float, float]:
+    """Unwrap a payload written by :func:`_encode_envelope`.
+
+    Plain payloads (written before stale-while-revalidate was enabled for
+    the key) are returned as fresh with no recompute cost. Cached errors
+    are returned as :class:`_CachedError`.
+
+    Args:
+        codec: Codec used to decode the envelope
+        payload: Raw payload from Redis
+
+    Returns:
+        Tuple of (value, soft expiry as a Unix timestamp, recompute seconds)
+    """
+    data, record = codec.decode_frame(payload)
+    if record:
+        kind, value, soft_expiry, delta = data
+        if kind == "error":
+            value = _CachedError(value)
+        return value, soft_expiry, delta
+    return data, math.inf, 0.0
+
+
+def _should_refresh(soft_expiry: float, delta: float, beta: float) -> bool:
+    """Decide whether a cached value should be recomputed now.
+
+    Stale values are always refreshed. With ``beta > 0``, fresh values are
+    refreshed early with a probability that rises as expiry approaches and
+    with the recompute cost ``delta`` (XFetch), so refreshes of a hot key
+    spread out instead of all landing at the expiry instant.
+
+    Args:
+        soft_expiry: Unix timestamp after which the value is stale
+        delta: Seconds the value took to compute
+        beta: Early refresh aggressiveness (0 disables, 1 is the usual choice)
+
+    Returns:
+        True if a refresh should be started
+    """
+    now = time.time()
+    if now >= soft_expiry:
+        return True
+    if beta <= 0 or delta <= 0:
+        return False
+    # 1 - random() lies in (0, 1], so log() is defined and <= 0
+    jitter = -delta * beta * math.log(1.0 - random.random())  # noqa: S311
+    return now + jitter >= soft_expiry
+
+
+# =============================================================================
+# Tags
+# =============================================================================
+
+
+def _resolve_tags(
+    tags: Tags, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Sequence[str]:
+    """Resolve static or argument-dependent tags for one call.
+
+    Args:
+        tags: Tag list, callable receiving the call's arguments, or None
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Tags for this call
+    """
+    if tags is None:
+        return ()
+    if callable(tags):
+        return tags(*args, **kwargs)
+    return tags
+
+
+async def _store(
+    redis: Redis,
+    key: str,
+    payload: bytes,
+    ttl: int,
+    tags: Sequence[str] = (),
+    *,
+    chunk_bytes: int = 0,
+) -> None:
+    """Write a payload and register it under its tags in one round-trip.
+
+    Each tag set's expiry is only ever extended (EXPIRE NX, then GT), so a
+    tag outlives every key registered under it. Requires Redis 7.0+ when
+    tags are used.
+
+    Args:
+        redis: Redis connection
+        key: Cache key
+        payload: Encoded value
+        ttl: Time to live in seconds
+        tags: Tags to register the key (and its chunks) under
+        chunk_bytes: Split the payload into chunks of this size (see
+            :class:`EntrySizeLimit`)
+    """
+    if not tags and not chunk_bytes:
+        await redis.setex(key, ttl, payload)
+        return
+
+    async with redis.pipeline(transaction=False) as pipe:
+        keys = _queue_entry(pipe, key, payload, ttl, chunk_bytes)
+        for tag in tags:
+            tag_key = f"{_TAG_KEY_PREFIX}{tag}"
+            pipe.sadd(tag_key, *keys)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+        await pipe.execute()
+
+
+def _queue_entry(
+    pipe: Any, key: str, payload: bytes, ttl: int, chunk_bytes: int = 0
+) -> list[str]:
+    """Queue the writes for one entry on a pipeline.
+
+    Chunks are queued before their manifest, so readers never see a
+    manifest whose chunks have not been written.
+
+    Returns:
+        Every key written: chunk keys, then ``key``
+    """
+    if not chunk_bytes:
+        pipe.setex(key, ttl, payload)
+        return [key]
+    manifest, chunks = _split_payload(key, payload, chunk_bytes)
+    for chunk_key, chunk in chunks.items():
+        pipe.setex(chunk_key, ttl, chunk)
+    pipe.setex(key, ttl, manifest)
+    return [*chunks, key]
+
+
+# =============================================================================
+# Versioned Namespaces
+# =============================================================================
+
+
+async def _namespace_generation(namespace: str) -> int | None:
+    """Get a namespace's current generation, cached locally for a moment.
+
+    Args:
+        namespace: Namespace name
+
+    Returns:
+        Current generation (0 if never invalidated), or None if Redis is
+        unavailable
+    """
+    now = time.monotonic()
+    cached_generation = _namespace_generations.get(namespace)
+    if cached_generation is not None and cached_generation[1] > now:
+        return cached_generation[0]
+
+    try:
+        redis = await get_redis()
+        raw = await redis.get(f"{_NAMESPACE_KEY_PREFIX}{namespace}")
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_namespace_lookup_failed", namespace=namespace)
+        return None
+
+    generation = int(raw) if raw is not None else 0
+    _namespace_generations[namespace] = (generation, now + NAMESPACE_REFRESH_SECONDS)
+    return generation
+
+
+async def invalidate_namespace(namespace: str) -> int | None:
+    """Invalidate every entry in a namespace by bumping its generation.
+
+    O(1): no keys are scanned or deleted. Entries from older generations
+    become unreachable and age out via their TTL. Other processes notice
+    within ``NAMESPACE_REFRESH_SECONDS``.
+
+    Args:
+        namespace: Namespace name
+
+    Returns:
+        The new generation, or None if Redis is unavailable
+
+    Example:
+        >>> @cached(ttl=300, namespace=lambda user_id: f"user:{user_id}")
+        >>> async def get_dashboard(user_id: str) -> dict: ...
+
+        >>> # Drop everything cached for user 123
+        >>> await invalidate_namespace("user:123")
+    """
+    _namespace_generations.pop(namespace, None)
+    try:
+        redis = await get_redis()
+        generation = await redis.incr(f"{_NAMESPACE_KEY_PREFIX}{namespace}")
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(
+            e, "cache_namespace_invalidation_failed", level="error", namespace=namespace
+        )
+        return None
 
-from redis.asyncio import Redis, from_url
-from redis.exceptions import RedisError
+    logger.info(
+        "cache_namespace_invalidated", namespace=namespace, generation=generation
+    )
+    return generation
 
-if TYPE_CHECKING:
-    from collections.abc import Awaitable
 
-logger = logging.getLogger(__name__)
+# =============================================================================
+# Negative Caching
+# =============================================================================
+
 
-T = TypeVar("T")
+@dataclass(frozen=True)
+class _CachedError:
+    """A cached exception, as stored by :func:`_encode_error`.
 
-# Global Redis connection pool
-_redis_pool: Redis | None = None
+    Stored in an "error" envelope (see :func:`_encode_envelope`) and kept in
+    this wrapper in process, so no value a function returns is mistaken
+    for a cached exception.
+    """
+
+    data: dict[str, Any]
+
+
+def _encode_error(
+    exc: BaseException, allowed: tuple[type[BaseException], ...]
+) -> _CachedError:
+    """Represent a cacheable exception as a plain, serializable value."""
+    exc_type = type(exc)
+    base = next(base for base in allowed if isinstance(exc, base))
+    args = [
+        arg if isinstance(arg, (str, int, float, bool, type(None))) else str(arg)
+        for arg in exc.args
+    ]
+    data = {
+        "type": f"{exc_type.__module__}:{exc_type.__qualname__}",
+        "base": f"{base.__module__}:{base.__qualname__}",
+        "args": args,
+    }
+    return _CachedError(data)
+
+
+def _error_types(
+    allowed: tuple[type[BaseException], ...],
+) -> dict[str, type[BaseException]]:
+    """Map the names :func:`_encode_error` stores to the configured types."""
+    return {f"{exc.__module__}:{exc.__qualname__}": exc for exc in allowed}
+
+
+def _decode_error(
+    error: _CachedError, types: Mapping[str, type[BaseException]]
+) -> BaseException:
+    """Rebuild an exception stored by :func:`_encode_error`.
+
+    The stored type is only looked up among the configured exception types
+    (see :func:`_error_types`), never imported, so a forged cache entry
+    cannot load modules. A subclass that is not configured itself is
+    rebuilt as the configured base it was cached under.
+    """
+    data = error.data if isinstance(error.data, dict) else {}
+    exc_type = (
+        types.get(data.get("type"))
+        or types.get(data.get("base"))
+        or next(iter(types.values()))
+    )
+    args = data.get("args")
+    # Bypass __init__ so custom signatures can't fail; args are restored
+    return exc_type.__new__(exc_type, *(args if isinstance(args, list) else ()))
 
 
 # =============================================================================
-# Connection Management
+# Caching Decorators
 # =============================================================================
 
 
-async def get_redis() -> Redis:
-    """Get Redis connection from pool.
+@dataclass(frozen=True)
+class _CachePolicy:
+    """Options of one :func:`cached` function, resolved when it is decorated."""
+
+    func: Callable[..., Awaitable[Any]]
+    build_key: Callable[..., str]
+    metric_prefix: str
+    ttl: int
+    miss_ttl: int
+    l1_ttl: int
+    stale_ttl: int
+    early_refresh_beta: float
+    single_flight: bool
+    lock_ttl: float | None
+    codec: CacheCodec | None
+    tags: Tags
+    namespace: Namespace
+    cache_none: bool
+    is_negative: Callable[[Any], bool] | None
+    negative_exceptions: tuple[type[BaseException], ...]
+    error_types: dict[str, type[BaseException]]
+    max_entry_bytes: int | None
+    oversize_policy: OversizePolicy | None
+
+    @property
+    def swr(self) -> bool:
+        """Whether entries are stored in stale-while-revalidate envelopes."""
+        return self.stale_ttl > 0 or self.early_refresh_beta > 0
+
+    def negative(self, value: Any) -> bool:
+        """Whether a result is cached for ``miss_ttl`` rather than ``ttl``."""
+        return (
+            value is None
+            or (self.is_negative is not None and self.is_negative(value))
+            or isinstance(value, _CachedError)
+        )
 
-    Returns:
-        Redis connection
+    def size_limit(self) -> EntrySizeLimit:
+        """Entry size limit, resolved per call so configure_entry_size_limit applies."""
+        if self.max_entry_bytes is None and self.oversize_policy is None:
+            return _size_limit
+        return replace(
+            _size_limit,
+            max_bytes=(
+                _size_limit.max_bytes
+                if self.max_entry_bytes is None
+                else self.max_entry_bytes
+            ),
+            policy=self.oversize_policy or _size_limit.policy,
+        )
 
-    Example:
-        >>> redis = await get_redis()
-        >>> await redis.set("key", "value", ex=60)
-        >>> value = await redis.get("key")
-    """
-    global _redis_pool
 
-    if _redis_pool is None:
-        # Get Redis URL from environment
-        import os
+@dataclass
+class _CachedCall:
+    """One call to a :func:`cached` function that missed the L1 tier."""
+
+    policy: _CachePolicy
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    key: str
+    codec: CacheCodec
+    redis: Redis
+    # Read before Redis so an invalidation racing the fill is detected
+    l1_generation: int
 
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
-        _redis_pool = from_url(
-            redis_url,
-            encoding="utf-8",
-            decode_responses=True,
-            max_connections=50,  # Connection pool size
-            socket_keepalive=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
+async def _cached_call(
+    policy: _CachePolicy, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    """Serve one call to a :func:`cached` function.
+
+    Looks the key up in L1, then Redis, and computes it on a miss (once per
+    key in this process with ``single_flight``). Redis errors degrade to
+    calling the function directly.
+    """
+    prefix = policy.metric_prefix
+    key = await _call_key(policy, args, kwargs)
+    if key is None:
+        # Without the namespace generation we could serve invalidated data
+        _metrics.inc("errors", prefix)
+        return await policy.func(*args, **kwargs)
+
+    # L1: in-process lookup, no network or decoding
+    if policy.l1_ttl:
+        local_value = _local_cache.get(key)
+        if local_value is not _MISSING:
+            logger.debug("cache_hit", key=key, tier="local")
+            _metrics.inc("hits", prefix, "local")
+            return _resolve(policy, local_value)
+
+    l1_generation = _local_cache.generation
+    try:
+        call = _CachedCall(
+            policy,
+            args,
+            kwargs,
+            key,
+            # Resolved per call so configure_codec() applies to existing functions
+            policy.codec or _codec,
+            await get_redis(),
+            l1_generation,
         )
+        result = await _lookup(call)
+        if result is _MISSING:
+            logger.debug("cache_miss", key=key)
+            _metrics.inc("misses", prefix)
+            if policy.single_flight:
+                result = await _single_flight(key, functools.partial(_load, call))
+            else:
+                result = await _load(call)
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        # If Redis is unavailable, gracefully degrade (call function directly)
+        _log_redis_error(e, "cache_error", key=key)
+        _metrics.inc("errors", prefix)
+        return await policy.func(*args, **kwargs)
+    return _resolve(policy, result)
 
-        logger.info("redis_connection_initialized", url=redis_url)
 
-    return _redis_pool
+async def _call_key(
+    policy: _CachePolicy, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> str | None:
+    """Build a call's cache key, including its namespace generation.
+
+    Returns:
+        The key, or None if the namespace generation is unavailable
+    """
+    key = policy.build_key(*args, **kwargs)
+    namespace = policy.namespace
+    if not namespace:
+        return key
+    entry_namespace = namespace(*args, **kwargs) if callable(namespace) else namespace
+    generation = await _namespace_generation(entry_namespace)
+    if generation is None:
+        return None
+    return f"{entry_namespace}:v{generation}:{key}"
 
 
-async def close_redis() -> None:
-    """Close Redis connection pool.
+def _resolve(policy: _CachePolicy, value: Any) -> Any:
+    """Return a cached value, re-raising exceptions cached as negative results."""
+    if isinstance(value, _CachedError):
+        raise _decode_error(value, policy.error_types)
+    return value
 
-    Call this on application shutdown.
+
+def _decode_entry(call: _CachedCall, payload: bytes) -> tuple[Any, float, float]:
+    """Decode a stored entry, recording deserialize time.
+
+    Returns:
+        Tuple of (value, soft expiry, recompute seconds); see
+        :func:`_decode_envelope`
     """
-    global _redis_pool
+    start = time.perf_counter()
+    entry = _decode_envelope(call.codec, payload)
+    _metrics.observe(
+        "deserialize_seconds", call.policy.metric_prefix, time.perf_counter() - start
+    )
+    return entry
 
-    if _redis_pool is not None:
-        await _redis_pool.close()
-        _redis_pool = None
-        logger.info("redis_connection_closed")
 
+async def _lookup(call: _CachedCall) -> Any:
+    """Read a call's entry from Redis.
 
-# =============================================================================
-# Caching Decorators
-# =============================================================================
+    Starts a background refresh when a stale-while-revalidate entry is due
+    and fills L1 with entries that are not about to be replaced.
+
+    Returns:
+        The cached value, or ``_MISSING`` on a miss. Entries that cannot be
+        decoded (unknown or disallowed format) are misses, so they are
+        recomputed and overwritten
+    """
+    policy = call.policy
+    reader = await get_redis(read_only=True)
+    payload = await _get_payload(reader, call.key)
+    if payload is None:
+        return _MISSING
+    try:
+        value, soft_expiry, delta = _decode_entry(call, payload)
+    except ValueError as e:
+        logger.warning("cache_decode_failed", key=call.key, error=str(e))
+        return _MISSING
+    if isinstance(value, _CachedError) and not policy.error_types:
+        # Cached before negative_exceptions was removed
+        return _MISSING
+
+    logger.debug("cache_hit", key=call.key)
+    _metrics.inc("hits", policy.metric_prefix, "redis")
+    refreshing = policy.swr and _should_refresh(
+        soft_expiry, delta, policy.early_refresh_beta
+    )
+    if refreshing:
+        _refresh_in_background(call.key, functools.partial(_load, call))
+    # Don't pin a value that is about to be replaced into L1
+    elif policy.l1_ttl:
+        l1_ttl = policy.l1_ttl
+        if policy.negative(value):
+            l1_ttl = min(l1_ttl, policy.miss_ttl)
+        _local_cache.set(
+            call.key, value, l1_ttl, len(payload), if_generation=call.l1_generation
+        )
+    return value
+
+
+async def _load(call: _CachedCall) -> Any:
+    """Compute a missing entry, under the cross-process lock if configured."""
+    if call.policy.lock_ttl:
+        return await _recompute_with_lock(
+            call.redis,
+            call.key,
+            functools.partial(_compute, call),
+            call.policy.lock_ttl,
+            decode=lambda payload: _decode_entry(call, payload)[0],
+        )
+    return await _compute(call)
+
+
+async def _compute(call: _CachedCall) -> Any:
+    """Run the function and store its result (or listed exception)."""
+    policy = call.policy
+    start = time.monotonic()
+    try:
+        result = await policy.func(*call.args, **call.kwargs)
+    except policy.negative_exceptions as exc:
+        delta = time.monotonic() - start
+        _metrics.observe("compute_seconds", policy.metric_prefix, delta)
+        # Failing to cache the error must not mask it
+        with contextlib.suppress(RedisError):
+            error = _encode_error(exc, policy.negative_exceptions)
+            await _store_result(call, error, delta)
+        raise
+    delta = time.monotonic() - start
+    _metrics.observe("compute_seconds", policy.metric_prefix, delta)
+
+    if result is not None or policy.cache_none:
+        await _store_result(call, result, delta)
+    return result
+
+
+def _encode_result(call: _CachedCall, value: Any, ttl: int, delta: float) -> bytes:
+    """Encode a result, recording serialize time and payload size."""
+    prefix = call.policy.metric_prefix
+    start = time.perf_counter()
+    if call.policy.swr or isinstance(value, _CachedError):
+        payload = _encode_envelope(call.codec, value, ttl, delta)
+    else:
+        payload = call.codec.encode(value)
+    _metrics.observe("serialize_seconds", prefix, time.perf_counter() - start)
+    _metrics.observe("payload_bytes", prefix, len(payload))
+    return payload
+
+
+async def _store_result(call: _CachedCall, value: Any, delta: float) -> None:
+    """Store a computed result in Redis and, if enabled, L1.
+
+    A value that cannot be encoded is logged and counted as an error, not
+    raised: the caller still gets the value, it just isn't cached.
+    """
+    policy = call.policy
+    ttl = policy.miss_ttl if policy.negative(value) else policy.ttl
+    try:
+        payload = _encode_result(call, value, ttl, delta)
+        fitted, chunk_bytes = _fit_payload(
+            payload, call.key, policy.metric_prefix, policy.size_limit()
+        )
+    except Exception as e:  # noqa: BLE001 - an unstorable value is a cache miss
+        logger.warning("cache_encode_failed", key=call.key, error=str(e))
+        _metrics.inc("errors", policy.metric_prefix)
+        return
+    if fitted is None:
+        return
+
+    await _store(
+        call.redis,
+        call.key,
+        fitted,
+        ttl + policy.stale_ttl if policy.swr else ttl,
+        _resolve_tags(policy.tags, call.args, call.kwargs),
+        chunk_bytes=chunk_bytes,
+    )
+    if policy.l1_ttl:
+        # Keep the round-tripped form so L1 and Redis hits agree
+        _local_cache.set(
+            call.key,
+            _decode_entry(call, fitted)[0],
+            min(policy.l1_ttl, ttl),
+            len(fitted),
+            if_generation=call.l1_generation,
+        )
 
 
 def cached(
     ttl: int = 3600,
     key_prefix: str = "",
     key_builder: Callable[..., str] | None = None,
+    *,
+    local_ttl: int | None = None,
+    single_flight: bool = True,
+    lock_ttl: float | None = None,
+    stale_ttl: int = 0,
+    early_refresh_beta: float = 0.0,
+    codec: CacheCodec | None = None,
+    tags: Tags = None,
+    namespace: Namespace = None,
+    key_digest_size: int = DEFAULT_DIGEST_SIZE,
+    ignore_self: bool = False,
+    cache_none: bool = True,
+    negative_ttl: int | None = None,
+    is_negative: Callable[[Any], bool] | None = None,
+    negative_exceptions: tuple[type[BaseException], ...] = (),
+    max_entry_bytes: int | None = None,
+    oversize_policy: OversizePolicy | None = None,
 ) -> Callable:
     """Cache async function results in Redis.
 
+    ``None`` is a cached result like any other (the codec stores it as an
+    explicit null), so "not found" lookups are not recomputed on every
+    call. Negative results, i.e. ``None``, results matching ``is_negative``
+    and exceptions listed in ``negative_exceptions``, can be given a
+    shorter ``negative_ttl`` so they expire before the data shows up.
+
     Args:
         ttl: Time to live in seconds (default: 1 hour)
         key_prefix: Prefix for cache keys (default: function name)
-        key_builder: Custom key building function
+        key_builder: Custom key building function (default: a canonical
+            encoding of the arguments, normalized against the signature and
+            hashed with BLAKE2b; see core.cache_keys)
+        local_ttl: Enable the in-process L1 tier with this TTL in seconds,
+            capped at ``ttl``. L1 entries are only invalidated in this
+            process, so other processes may serve a value up to
+            ``local_ttl`` seconds stale (default: disabled)
+        single_flight: Coalesce concurrent misses for the same key in this
+            process so the function runs once and all callers share the
+            result (default: enabled)
+        lock_ttl: Also coalesce across processes: on a miss, only the
+            worker holding a Redis lock with this expiry (seconds) recomputes
+            while the others wait for its result (default: disabled)
+        stale_ttl: Stale-while-revalidate window in seconds. ``ttl`` becomes
+            the soft TTL and the entry is kept in Redis for ``ttl + stale_ttl``;
+            within that window the stale value is returned immediately while
+            a background task refreshes it (default: disabled)
+        early_refresh_beta: Probabilistically refresh fresh entries shortly
+            before the soft TTL, weighted by how long the function takes to
+            compute (XFetch). 1.0 is a good default (default: disabled)
+        codec: Codec for this function's entries (default: the global codec
+            set with :func:`configure_codec`)
+        tags: Tags to register entries under for :func:`invalidate_tags`;
+            either a list or a callable receiving the function's arguments
+        namespace: Versioned namespace for entries, either a name or a
+            callable receiving the function's arguments. Keys become
+            ``{namespace}:v{generation}:{key}`` and the whole namespace can
+            be dropped in O(1) with :func:`invalidate_namespace`
+        key_digest_size: Width in bytes of the default key hash
+            (default: 16, i.e. 128 bits)
+        ignore_self: Leave a leading ``self``/``cls`` argument out of the
+            default key so cached methods share entries across instances
+            (default: the instance is part of the key, via its
+            ``__cache_key__`` when defined)
+        cache_none: Cache ``None`` results (default: enabled)
+        negative_ttl: TTL in seconds for negative results and cached
+            exceptions (default: ``ttl``)
+        is_negative: Predicate marking other results as negative, e.g.
+            ``lambda rows: not rows`` (``None`` always is)
+        negative_exceptions: Exception types to cache for ``negative_ttl``
+            and re-raise on hits, e.g. ``(UserNotFound,)``. The exception is
+            rebuilt from its type and ``args``; tracebacks are not kept, and
+            subclasses not listed here are re-raised as the listed type
+        max_entry_bytes: Size limit for this function's encoded entries
+            (default: the global limit, see :func:`configure_entry_size_limit`)
+        oversize_policy: "skip", "compress" or "chunk" for entries over the
+            limit (default: the global policy)
 
     Returns:
         Decorated function
@@ -131,60 +2144,134 @@ def cached(
 
         >>> # Subsequent calls within 5 minutes: cache hit, instant response
         >>> user = await get_user("123")
+
+        >>> # Hot key: serve from process memory for up to 10 seconds
+        >>> @cached(ttl=300, key_prefix="config", local_ttl=10)
+        >>> async def get_feature_flags() -> dict: ...
+
+        >>> # Expensive report: one recompute across the whole fleet
+        >>> @cached(ttl=600, key_prefix="report", lock_ttl=30)
+        >>> async def build_report(day: str) -> dict: ...
+
+        >>> # Never block on recompute: serve up to 1 minute stale
+        >>> @cached(ttl=300, key_prefix="popular", stale_ttl=60, early_refresh_beta=1)
+        >>> async def get_popular_items() -> list: ...
+
+        >>> # Invalidate every cached view of one user with invalidate_tags
+        >>> @cached(ttl=300, key_prefix="orders", tags=lambda uid: [f"user:{uid}"])
+        >>> async def get_orders(uid: str) -> list: ...
+
+        >>> # Or drop everything for the user at once with invalidate_namespace
+        >>> @cached(ttl=300, key_prefix="orders", namespace=lambda uid: f"user:{uid}")
+        >>> async def get_order_totals(uid: str) -> dict: ...
+
+        >>> # Remember misses for 30 seconds instead of hitting the database
+        >>> @cached(ttl=3600, negative_ttl=30, negative_exceptions=(UserNotFound,))
+        >>> async def get_profile(user_id: str) -> dict: ...
+
+        >>> # Multi-megabyte export: split across keys rather than one huge value
+        >>> @cached(ttl=600, max_entry_bytes=1024 * 1024, oversize_policy="chunk")
+        >>> async def export_ledger(day: str) -> list[dict]: ...
+
+    See :func:`cached_sync` for synchronous functions.
     """
+    error_types = _error_types(negative_exceptions)
 
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        policy = _CachePolicy(
+            func=func,
+            build_key=key_builder
+            or make_key_builder(
+                func, key_prefix, digest_size=key_digest_size, ignore_self=ignore_self
+            ),
+            metric_prefix=key_prefix or func.__name__,
+            ttl=ttl,
+            miss_ttl=ttl if negative_ttl is None else negative_ttl,
+            l1_ttl=min(local_ttl, ttl) if local_ttl else 0,
+            stale_ttl=stale_ttl,
+            early_refresh_beta=early_refresh_beta,
+            single_flight=single_flight,
+            lock_ttl=lock_ttl,
+            codec=codec,
+            tags=tags,
+            namespace=namespace,
+            cache_none=cache_none,
+            is_negative=is_negative,
+            negative_exceptions=negative_exceptions,
+            error_types=error_types,
+            max_entry_bytes=max_entry_bytes,
+            oversize_policy=oversize_policy,
+        )
+
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
-            # Build cache key
-            if key_builder:
-                cache_key = key_builder(*args, **kwargs)
-            else:
-                prefix = key_prefix or func.__name__
-                # Create unique key from function arguments
-                key_data = f"{args}:{sorted(kwargs.items())}"
-                key_hash = hashlib.md5(key_data.encode(), usedforsecurity=False).hexdigest()[:8]
-                cache_key = f"{prefix}:{key_hash}"
+            return await _cached_call(policy, args, kwargs)
 
-            try:
-                redis = await get_redis()
-
-                # Try to get from cache
-                cached_value = await redis.get(cache_key)
-                if cached_value is not None:
-                    logger.debug("cache_hit", key=cache_key)
-                    return json.loads(cached_value)
-
-                # Cache miss - call original function
-                logger.debug("cache_miss", key=cache_key)
-                result = await func(*args, **kwargs)
-
-                # Store in cache
-                await redis.setex(
-                    cache_key,
-                    ttl,
-                    json.dumps(result, default=str),
-                )
+        return wrapper
 
-                return result
+    return decorator
 
-            except RedisError as e:
-                # If Redis is unavailable, gracefully degrade (call function directly)
-                logger.warning("cache_error", error=str(e), key=cache_key)
-                return await func(*args, **kwargs)
 
-        return wrapper
+def cached_sync(executor: Executor | None = None, **options: Any) -> Callable:
+    """Cache sync function results, computing misses in a worker thread.
+
+    The decorated function becomes a coroutine function: hits are served
+    like :func:`cached` and, on a miss, the function runs in ``executor`` so
+    the event loop keeps serving requests. Keys, codecs, metrics and every
+    other option behave exactly as in :func:`cached` (the metrics prefix
+    defaults to the function name).
+
+    Threads keep the loop responsive but still share the GIL; pure-Python
+    CPU-bound work does not run any faster in them.
+
+    Args:
+        executor: Executor for misses (default: the loop's default thread
+            pool, as used by ``asyncio.to_thread``)
+        **options: Any :func:`cached` argument (``ttl``, ``key_prefix``, ...)
+
+    Returns:
+        Decorator turning ``def f(...) -> T`` into ``async def f(...) -> T``
+
+    Example:
+        >>> @cached_sync(ttl=600, key_prefix="fees")
+        >>> def total_fees(account_id: str, year: int) -> Decimal:
+        ...     return sum(calculate_percentage(...) for ... in ...)
+
+        >>> fees = await total_fees("acc-1", 2024)
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def offloaded(*args: Any, **kwargs: Any) -> T:
+            loop = asyncio.get_running_loop()
+            # Keep contextvars (e.g. structlog's bound request context)
+            call = functools.partial(
+                contextvars.copy_context().run, func, *args, **kwargs
+            )
+            return await loop.run_in_executor(executor, call)
+
+        return cached(**options)(offloaded)
 
     return decorator
 
 
-def cache_invalidate(key_pattern: str) -> Callable:
-    """Decorator to invalidate cache keys matching a pattern.
+def cache_invalidate(
+    key_pattern: str | None = None,
+    tags: Tags = None,
+    namespace: Namespace = None,
+) -> Callable:
+    """Decorator to invalidate cache keys matching a pattern, tags or namespace.
 
-    Useful for cache invalidation on data updates.
+    Useful for cache invalidation on data updates. Prefer ``tags``: pattern
+    invalidation has to SCAN the whole keyspace, while tag invalidation only
+    touches the keys registered under the tag.
 
     Args:
         key_pattern: Redis key pattern (supports * wildcard)
+        tags: Tags to invalidate; either a list or a callable receiving the
+            function's arguments
+        namespace: Namespace to invalidate (O(1)); either a name or a
+            callable receiving the function's arguments
 
     Example:
         >>> @cache_invalidate("user:*")
@@ -192,6 +2279,9 @@ def cache_invalidate(key_pattern: str) -> Callable:
         ...     # Update user in database
         ...     await db.update_user(user_id, data)
         ...     # Cache keys matching "user:*" are automatically deleted
+
+        >>> @cache_invalidate(tags=lambda user_id, data: [f"user:{user_id}"])
+        >>> async def rename_user(user_id: str, data: dict): ...
     """
 
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
@@ -202,9 +2292,18 @@ def cache_invalidate(key_pattern: str) -> Callable:
 
             # Invalidate cache
             try:
-                await invalidate_pattern(key_pattern)
+                if key_pattern:
+                    await invalidate_pattern(key_pattern)
+                entry_tags = _resolve_tags(tags, args, kwargs)
+                if entry_tags:
+                    await invalidate_tags(*entry_tags)
+                if namespace:
+                    await invalidate_namespace(
+                        namespace(*args, **kwargs) if callable(namespace) else namespace
+                    )
             except RedisError as e:
-                logger.warning("cache_invalidation_failed", pattern=key_pattern, error=str(e))
+                _circuit_breaker.record_error(e)
+                _log_redis_error(e, "cache_invalidation_failed", pattern=key_pattern)
 
             return result
 
@@ -227,39 +2326,78 @@ async def get_cached(key: str, default: Any = None) -> Any:
 
     Returns:
         Cached value or default
+
+    Note:
+        While client tracking is active (see :func:`enable_client_tracking`)
+        values are also kept in the L1 cache and served from process memory
+        until Redis reports the key changed.
     """
+    prefix = _key_prefix(key)
+    if _tracking_local_ttl:
+        local_value = _local_cache.get(key)
+        if local_value is not _MISSING:
+            _metrics.inc("hits", prefix, "local")
+            return local_value
+    l1_generation = _local_cache.generation
+
     try:
-        redis = await get_redis()
-        value = await redis.get(key)
+        redis = await get_redis(read_only=True)
+        value = await _get_payload(redis, key)
 
         if value is None:
+            _metrics.inc("misses", prefix)
             return default
 
-        return json.loads(value)
+        _metrics.inc("hits", prefix, "redis")
+        result = _decode_observed(_codec, value, prefix)
+        if _tracking_local_ttl:
+            _local_cache.set(
+                key,
+                result,
+                _tracking_local_ttl,
+                len(value),
+                if_generation=l1_generation,
+            )
+        return result
 
     except RedisError as e:
-        logger.warning("cache_get_failed", key=key, error=str(e))
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_get_failed", key=key)
+        _metrics.inc("errors", prefix)
         return default
 
 
-async def set_cached(key: str, value: Any, ttl: int = 3600) -> bool:
+async def set_cached(
+    key: str, value: Any, ttl: int = 3600, tags: Sequence[str] = ()
+) -> bool:
     """Set value in cache.
 
     Args:
         key: Cache key
         value: Value to cache
         ttl: Time to live in seconds
+        tags: Tags to register the key under for :func:`invalidate_tags`
 
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise (including values skipped for
+        exceeding the entry size limit)
     """
+    _local_cache.delete(key)
     try:
         redis = await get_redis()
-        await redis.setex(key, ttl, json.dumps(value, default=str))
+        prefix = _key_prefix(key)
+        payload, chunk_bytes = _fit_payload(
+            _encode_observed(_codec, value, prefix), key, prefix, _size_limit
+        )
+        if payload is None:
+            return False
+        await _store(redis, key, payload, ttl, tags, chunk_bytes=chunk_bytes)
         return True
 
     except RedisError as e:
-        logger.warning("cache_set_failed", key=key, error=str(e))
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_set_failed", key=key)
+        _metrics.inc("errors", _key_prefix(key))
         return False
 
 
@@ -272,24 +2410,44 @@ async def delete_cached(key: str) -> bool:
     Returns:
         True if key was deleted, False otherwise
     """
+    _local_cache.delete(key)
     try:
         redis = await get_redis()
         deleted = await redis.delete(key)
         return deleted > 0
 
     except RedisError as e:
-        logger.warning("cache_delete_failed", key=key, error=str(e))
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_delete_failed", key=key)
         return False
 
 
-async def invalidate_pattern(pattern: str) -> int:
+async def invalidate_pattern(
+    pattern: str,
+    batch_size: int = 500,
+    max_concurrency: int = 4,
+    on_progress: Callable[[int, int], Any] | None = None,
+) -> int:
     """Invalidate all cache keys matching a pattern.
 
+    Keys are streamed from SCAN and removed with UNLINK in batches of
+    ``batch_size``, with up to ``max_concurrency`` batches in flight while
+    the scan continues. Memory stays bounded by roughly
+    ``(max_concurrency + 1) * batch_size`` keys however many match, and
+    Redis never receives one huge command (UNLINK also frees values in the
+    background).
+
+    SCAN still walks the whole keyspace; prefer :func:`invalidate_tags` or
+    :func:`invalidate_namespace` for routine invalidation.
+
     Args:
         pattern: Redis key pattern (supports * wildcard)
+        batch_size: Keys per UNLINK (also the SCAN COUNT hint)
+        max_concurrency: UNLINK batches in flight at once
+        on_progress: Called with ``(scanned, deleted)`` after each batch
 
     Returns:
-        Number of keys deleted
+        Number of keys deleted (up to the failure, if Redis errors midway)
 
     Example:
         >>> # Delete all user caches
@@ -297,28 +2455,322 @@ async def invalidate_pattern(pattern: str) -> int:
 
         >>> # Delete specific user cache
         >>> await invalidate_pattern("user:123:*")
+
+        >>> # Millions of keys, with progress logging
+        >>> await invalidate_pattern(
+        ...     "legacy:*",
+        ...     batch_size=1000,
+        ...     on_progress=lambda scanned, deleted: print(scanned, deleted),
+        ... )
+    """
+    _local_cache.delete_pattern(pattern)
+    scanned = 0
+    deleted = 0
+    slots = asyncio.Semaphore(max_concurrency)
+    in_flight: set[asyncio.Task[None]] = set()
+
+    async def unlink(redis: Redis, batch: list[bytes]) -> None:
+        nonlocal deleted
+        try:
+            # Not `deleted += await ...`: that reads `deleted` before awaiting
+            count = await redis.unlink(*batch)
+        finally:
+            slots.release()
+        deleted += count
+        if on_progress is not None:
+            on_progress(scanned, deleted)
+
+    async def submit(redis: Redis, batch: list[bytes]) -> None:
+        await slots.acquire()
+        # Surface a failed batch now rather than after the whole scan
+        for task in [task for task in in_flight if task.done()]:
+            in_flight.discard(task)
+            task.result()
+        task = asyncio.create_task(unlink(redis, batch))
+        in_flight.add(task)
+
+    try:
+        redis = await get_redis()
+        batch: list[bytes] = []
+        async for key in redis.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            scanned += 1
+            if len(batch) >= batch_size:
+                await submit(redis, batch)
+                batch = []
+        if batch:
+            await submit(redis, batch)
+        await asyncio.gather(*in_flight)
+
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(
+            e,
+            "cache_invalidation_failed",
+            level="error",
+            pattern=pattern,
+            deleted=deleted,
+        )
+        return deleted
+
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        # Drop L1 entries refilled from Redis before their keys were unlinked
+        _local_cache.delete_pattern(pattern)
+
+    logger.info("cache_invalidated", pattern=pattern, count=deleted)
+    return deleted
+
+
+async def invalidate_tags(*tags: str, chunk_size: int = 500) -> int:
+    """Invalidate all cache keys registered under any of the given tags.
+
+    Cost is proportional to the number of keys in the tags, not the size of
+    the keyspace. Members are read with SSCAN and removed with UNLINK in
+    chunks, so neither Redis nor this coroutine handles one huge command.
+
+    Args:
+        *tags: Tags to invalidate
+        chunk_size: Keys per SSCAN/UNLINK batch
+
+    Returns:
+        Number of cache keys deleted
+
+    Example:
+        >>> await invalidate_tags("user:123")
+    """
+    deleted = 0
+    try:
+        redis = await get_redis()
+        for tag in tags:
+            tag_key = f"{_TAG_KEY_PREFIX}{tag}"
+            chunk: list[bytes] = []
+            async for member in redis.sscan_iter(tag_key, count=chunk_size):
+                chunk.append(member)
+                if len(chunk) >= chunk_size:
+                    deleted += await _unlink_chunk(redis, chunk)
+                    chunk = []
+            if chunk:
+                deleted += await _unlink_chunk(redis, chunk)
+            await redis.unlink(tag_key)
+
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_tag_invalidation_failed", level="error", tags=tags)
+        return deleted
+
+    logger.info("cache_tags_invalidated", tags=tags, count=deleted)
+    return deleted
+
+
+async def _unlink_chunk(redis: Redis, keys: list[bytes]) -> int:
+    """UNLINK a chunk of keys from Redis and the local L1 tier.
+
+    Args:
+        redis: Redis connection
+        keys: Keys to remove
+
+    Returns:
+        Number of keys that existed in Redis
+    """
+    for key in keys:
+        _local_cache.delete(key.decode() if isinstance(key, bytes) else key)
+    return await redis.unlink(*keys)
+
+
+# =============================================================================
+# Batch Operations
+# =============================================================================
+
+
+async def get_many(keys: Sequence[str]) -> dict[str, Any]:
+    """Get several values from cache in one round-trip (MGET).
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Mapping of key to value for the keys that were found; missing keys
+        are omitted
+
+    Example:
+        >>> found = await get_many(["user:1", "user:2", "user:3"])
+        >>> missing = [k for k in keys if k not in found]
+    """
+    if not keys:
+        return {}
+
+    try:
+        redis = await get_redis(read_only=True)
+        if isinstance(redis, RedisCluster):
+            # Keys usually span hash slots; MGET per node instead of CROSSSLOT
+            values = await redis.mget_nonatomic(keys)
+        else:
+            values = await redis.mget(keys)
+        values = [
+            value if value is None else await _join_chunks(redis, key, value)
+            for key, value in zip(keys, values, strict=True)
+        ]
+
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_get_many_failed", count=len(keys))
+        return {}
+
+    found = {}
+    for key, value in zip(keys, values, strict=True):
+        prefix = _key_prefix(key)
+        if value is None:
+            _metrics.inc("misses", prefix)
+        else:
+            _metrics.inc("hits", prefix, "redis")
+            found[key] = _decode_observed(_codec, value, prefix)
+    return found
+
+
+async def set_many(mapping: Mapping[str, Any], ttl: int = 3600) -> bool:
+    """Set several values in cache in one pipelined round-trip.
+
+    Args:
+        mapping: Mapping of cache key to value
+        ttl: Time to live in seconds, applied to every key
+
+    Returns:
+        True if successful, False otherwise. Values over the entry size
+        limit may be skipped (see :func:`configure_entry_size_limit`)
     """
+    if not mapping:
+        return True
+
+    for key in mapping:
+        _local_cache.delete(key)
     try:
         redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                prefix = _key_prefix(key)
+                payload, chunk_bytes = _fit_payload(
+                    _encode_observed(_codec, value, prefix), key, prefix, _size_limit
+                )
+                if payload is not None:
+                    _queue_entry(pipe, key, payload, ttl, chunk_bytes)
+            await pipe.execute()
+        return True
 
-        # Find all matching keys
-        keys = []
-        async for key in redis.scan_iter(match=pattern, count=100):
-            keys.append(key)
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_set_many_failed", count=len(mapping))
+        return False
+
+
+async def delete_many(keys: Sequence[str]) -> int:
+    """Delete several values from cache in one round-trip.
 
-        # Delete in batches
-        if keys:
-            deleted = await redis.delete(*keys)
-            logger.info("cache_invalidated", pattern=pattern, count=deleted)
-            return deleted
+    Args:
+        keys: Cache keys
 
+    Returns:
+        Number of keys deleted
+    """
+    if not keys:
         return 0
 
+    for key in keys:
+        _local_cache.delete(key)
+    try:
+        redis = await get_redis()
+        return await redis.delete(*keys)
+
     except RedisError as e:
-        logger.error("cache_invalidation_failed", pattern=pattern, error=str(e))
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_delete_many_failed", count=len(keys))
         return 0
 
 
+def cached_batch(
+    ttl: int = 3600,
+    key_prefix: str = "",
+    key_builder: Callable[[Any], str] | None = None,
+) -> Callable:
+    """Cache results of a function that loads many items by id.
+
+    The decorated function takes a list of ids as its first argument and
+    returns a dict of id to value. Cached ids are fetched with one MGET;
+    the function is called once with only the missing ids, and its results
+    are stored with one pipelined write. Ids the function does not return
+    are not cached.
+
+    Other arguments are passed through unchanged but are not part of the
+    cache key; use ``key_builder`` if they affect the result.
+
+    Args:
+        ttl: Time to live in seconds (default: 1 hour)
+        key_prefix: Prefix for cache keys (default: function name)
+        key_builder: Custom function mapping an id to its cache key
+
+    Returns:
+        Decorated function
+
+    Example:
+        >>> @cached_batch(ttl=300, key_prefix="user")
+        >>> async def get_users(user_ids: list[str]) -> dict[str, dict]:
+        ...     rows = await db.get_users(user_ids)
+        ...     return {row["id"]: row for row in rows}
+
+        >>> # One MGET; the database only sees ids that were not cached
+        >>> users = await get_users(["1", "2", "3"])
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[dict[Any, T]]],
+    ) -> Callable[..., Awaitable[dict[Any, T]]]:
+        prefix = key_prefix or func.__name__
+
+        def build_key(item_id: Any) -> str:
+            if key_builder:
+                return key_builder(item_id)
+            return f"{prefix}:{item_id}"
+
+        @functools.wraps(func)
+        async def wrapper(
+            ids: Sequence[Any], *args: Any, **kwargs: Any
+        ) -> dict[Any, T]:
+            # dict.fromkeys de-duplicates while keeping the caller's order
+            keys = {item_id: build_key(item_id) for item_id in dict.fromkeys(ids)}
+            found = await get_many(list(keys.values()))
+
+            results: dict[Any, T] = {}
+            missing: list[Any] = []
+            for item_id, key in keys.items():
+                if key in found:
+                    results[item_id] = found[key]
+                else:
+                    missing.append(item_id)
+
+            logger.debug(
+                "cache_batch", hits=len(results), misses=len(missing), prefix=prefix
+            )
+            if missing:
+                loaded = await func(missing, *args, **kwargs)
+                await set_many(
+                    {
+                        keys[item_id]: value
+                        for item_id, value in loaded.items()
+                        if item_id in keys
+                    },
+                    ttl=ttl,
+                )
+                results.update(loaded)
+
+            return {item_id: results[item_id] for item_id in keys if item_id in results}
+
+        return wrapper
+
+    return decorator
+
+
 # =============================================================================
 # Cache Warming
 # =============================================================================
@@ -332,7 +2784,9 @@ async def warm_cache(
 ) -> bool:
     """Warm cache by pre-loading data.
 
-    Useful for frequently accessed data that's expensive to compute.
+    Useful for frequently accessed data that's expensive to compute. The
+    write uses ``SET NX``, so a value stored by another process (or a
+    request) while ``value_fn`` ran is never overwritten.
 
     Args:
         key: Cache key
@@ -342,6 +2796,7 @@ async def warm_cache(
 
     Returns:
         True if cache was warmed, False if already exists (and not forced)
+        or the value was skipped for exceeding the entry size limit
 
     Example:
         >>> async def get_popular_items():
@@ -355,24 +2810,275 @@ async def warm_cache(
         ... )
     """
     try:
-        redis = await get_redis()
+        return await _warm_key(key, value_fn, ttl, force)
 
-        # Check if key exists and not forcing refresh
-        if not force and await redis.exists(key):
-            logger.debug("cache_already_warm", key=key)
-            return False
+    except RedisError as e:
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_warming_failed", level="error", key=key)
+        return False
 
-        # Get value and cache it
-        value = await value_fn()
-        await redis.setex(key, ttl, json.dumps(value, default=str))
 
-        logger.info("cache_warmed", key=key, ttl=ttl)
-        return True
+async def _warm_key(
+    key: str, value_fn: Callable[[], Awaitable[Any]], ttl: int, force: bool
+) -> bool:
+    """Load and store one key; Redis errors propagate to the caller."""
+    redis = await get_redis()
 
-    except RedisError as e:
-        logger.error("cache_warming_failed", key=key, error=str(e))
+    # Cheap pre-check so a warm key doesn't pay for value_fn
+    if not force and await redis.exists(key):
+        logger.debug("cache_already_warm", key=key)
         return False
 
+    value = await value_fn()
+    payload, chunk_bytes = _fit_payload(
+        _codec.encode(value), key, _key_prefix(key), _size_limit
+    )
+    if payload is None:
+        return False
+    _local_cache.delete(key)
+    if chunk_bytes:
+        # Chunks go first; if the NX write below loses they simply expire
+        payload, chunks = _split_payload(key, payload, chunk_bytes)
+        async with redis.pipeline(transaction=False) as pipe:
+            for chunk_key, chunk in chunks.items():
+                pipe.setex(chunk_key, ttl, chunk)
+            await pipe.execute()
+    if force:
+        await redis.set(key, payload, ex=ttl)
+    elif not await redis.set(key, payload, ex=ttl, nx=True):
+        logger.debug("cache_already_warm", key=key)
+        return False
+
+    logger.info("cache_warmed", key=key, ttl=ttl)
+    return True
+
+
+@dataclass
+class WarmupEntry:
+    """A key registered for warm-up, with the loader that produces it."""
+
+    key: str
+    loader: Callable[[], Awaitable[Any]]
+    ttl: int = 3600
+    priority: int = 0
+    force: bool = False
+
+
+@dataclass
+class WarmupResult:
+    """Outcome of warming one key.
+
+    ``status`` is "warmed", "skipped" (already cached), "failed",
+    "timeout" (ran past the budget) or "not_started" (budget spent first).
+    """
+
+    key: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class WarmupReport:
+    """Per-key results and total duration of one warm-up run."""
+
+    results: list[WarmupResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        """Count results with the given status."""
+        return sum(result.status == status for result in self.results)
+
+    def slowest(self, limit: int = 5) -> list[WarmupResult]:
+        """Get the keys that took longest to warm."""
+        return sorted(self.results, key=lambda result: -result.seconds)[:limit]
+
+
+class WarmupRegistry:
+    """Keys to pre-load at startup or on a schedule.
+
+    Entries run highest ``priority`` first, at most ``concurrency`` at a
+    time, each stored with ``SET NX`` (see :func:`warm_cache`). A run can
+    be given a time budget, e.g. the startup probe's, after which nothing
+    new starts and loaders still running are cancelled; their keys are
+    simply loaded on first use instead.
+
+    Example:
+        >>> registry = get_warmup_registry()
+        >>> @registry.warmer("popular_items", ttl=3600, priority=10)
+        ... async def load_popular_items() -> list:
+        ...     return await db.get_popular_items(limit=100)
+
+        >>> report = await registry.run(concurrency=8, budget=20)
+        >>> report.count("failed"), report.slowest(3)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._entries: dict[str, WarmupEntry] = {}
+
+    def __len__(self) -> int:
+        """Return the number of registered keys."""
+        return len(self._entries)
+
+    def register(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        priority: int = 0,
+        force: bool = False,
+    ) -> None:
+        """Register (or replace) a key to warm.
+
+        Args:
+            key: Cache key
+            loader: Async function producing the value
+            ttl: Time to live in seconds
+            priority: Higher values are warmed first
+            force: Overwrite the key even if it is already cached
+        """
+        self._entries[key] = WarmupEntry(key, loader, ttl, priority, force)
+
+    def warmer(
+        self, key: str, ttl: int = 3600, priority: int = 0, force: bool = False
+    ) -> Callable[[Callable[[], Awaitable[T]]], Callable[[], Awaitable[T]]]:
+        """Decorator registering a zero-argument async function as a loader.
+
+        Args:
+            key: Cache key
+            ttl: Time to live in seconds
+            priority: Higher values are warmed first
+            force: Overwrite the key even if it is already cached
+
+        Returns:
+            Decorator returning the function unchanged
+        """
+
+        def decorator(func: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+            self.register(key, func, ttl=ttl, priority=priority, force=force)
+            return func
+
+        return decorator
+
+    def unregister(self, key: str) -> bool:
+        """Remove a key from the registry.
+
+        Returns:
+            True if the key was registered
+        """
+        return self._entries.pop(key, None) is not None
+
+    async def run(
+        self,
+        concurrency: int = 8,
+        budget: float | None = None,
+        force: bool | None = None,
+    ) -> WarmupReport:
+        """Warm every registered key.
+
+        Args:
+            concurrency: Loaders running at once
+            budget: Seconds the whole run may take (default: unlimited)
+            force: Override every entry's ``force`` (e.g. True for periodic
+                refreshes of keys that have not expired yet)
+
+        Returns:
+            Report with the outcome and duration of every key
+        """
+        start = time.monotonic()
+        deadline = start + budget if budget is not None else math.inf
+        queue = deque(sorted(self._entries.values(), key=lambda entry: -entry.priority))
+        report = WarmupReport()
+
+        async def worker() -> None:
+            while queue:
+                entry = queue.popleft()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    report.results.append(WarmupResult(entry.key, "not_started"))
+                    continue
+                report.results.append(await self._warm_entry(entry, remaining, force))
+
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+        report.seconds = time.monotonic() - start
+        logger.info(
+            "cache_warmup_complete",
+            seconds=round(report.seconds, 3),
+            warmed=report.count("warmed"),
+            skipped=report.count("skipped"),
+            failed=report.count("failed") + report.count("timeout"),
+            not_started=report.count("not_started"),
+        )
+        return report
+
+    def schedule(
+        self,
+        interval: float,
+        concurrency: int = 8,
+        force: bool | None = True,
+    ) -> asyncio.Task[None]:
+        """Re-run the warm-up every ``interval`` seconds in the background.
+
+        Args:
+            interval: Seconds between the end of one run and the next
+            concurrency: Loaders running at once
+            force: Passed to :meth:`run`; refreshes keys before they expire
+                by default
+
+        Returns:
+            The background task; cancel it to stop the schedule
+        """
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.run(concurrency=concurrency, budget=interval, force=force)
+
+        return asyncio.create_task(loop())
+
+    async def _warm_entry(
+        self, entry: WarmupEntry, remaining: float, force: bool | None
+    ) -> WarmupResult:
+        start = time.monotonic()
+        try:
+            warmed = await asyncio.wait_for(
+                _warm_key(
+                    entry.key,
+                    entry.loader,
+                    entry.ttl,
+                    entry.force if force is None else force,
+                ),
+                timeout=remaining,
+            )
+            status, error = ("warmed" if warmed else "skipped"), None
+        except TimeoutError:
+            status, error = "timeout", None
+        except RedisError as e:
+            _circuit_breaker.record_error(e)
+            status, error = "failed", str(e)
+        except Exception as e:  # noqa: BLE001 - one bad loader must not stop the run
+            status, error = "failed", f"{type(e).__name__}: {e}"
+
+        seconds = time.monotonic() - start
+        if error is not None:
+            logger.warning("cache_warmup_key_failed", key=entry.key, error=error)
+        return WarmupResult(entry.key, status, seconds, error)
+
+
+# Global registry run by open_cache()/init_cache() at startup
+_warmup_registry = WarmupRegistry()
+
+
+def get_warmup_registry() -> WarmupRegistry:
+    """Get the process-wide warm-up registry.
+
+    Returns:
+        The shared WarmupRegistry instance
+    """
+    return _warmup_registry
+
 
 # =============================================================================
 # FastAPI Integration
@@ -382,19 +3088,12 @@ async def warm_cache(
 # In your FastAPI app:
 
 from fastapi import FastAPI
-from template_sample.core.cache import get_redis, close_redis
+from template_sample.core.cache import init_cache
 
 app = FastAPI()
 
-@app.on_event("startup")
-async def startup_event():
-    # Initialize Redis connection pool
-    await get_redis()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    # Close Redis connection pool
-    await close_redis()
+# Create and pre-warm the Redis pool on startup, close it on shutdown
+init_cache(app)
 
 # Use caching in endpoints
 from template_sample.core.cache import cached
@@ -409,7 +3108,7 @@ async def get_user(user_id: str):
     return await get_user_data(user_id)
 
 # Cache invalidation on updates
-from template_sample.core.cache import invalidate_pattern
+from template_sample.core.cache import invalidate_pattern, invalidate_tags
 
 @app.put("/api/users/{user_id}")
 async def update_user(user_id: str, data: dict):
@@ -419,6 +3118,17 @@ async def update_user(user_id: str, data: dict):
     await invalidate_pattern(f"api:users:*{user_id}*")
 
     return {"status": "updated"}
+
+# Cheaper: tag entries when caching, then invalidate only those keys
+@cached(ttl=300, key_prefix="api:orders", tags=lambda user_id: [f"user:{user_id}"])
+async def get_user_orders(user_id: str) -> list:
+    return await db.get_orders(user_id)
+
+@app.delete("/api/users/{user_id}/orders")
+async def clear_orders(user_id: str):
+    await db.clear_orders(user_id)
+    await invalidate_tags(f"user:{user_id}")
+    return {"status": "cleared"}
 """
 
 
@@ -431,8 +3141,15 @@ async def get_cache_stats() -> dict[str, Any]:
     """Get cache statistics.
 
     Returns:
-        Dictionary with cache statistics
+        Dictionary with cache statistics. The ``local`` entry holds the
+        in-process L1 counters and circuit breaker state, and ``prefixes``
+        the per-prefix counters from :func:`get_cache_metrics`; both are
+        available even if Redis is down.
     """
+    local_stats = _local_cache.stats()
+    local_stats["client_tracking"] = is_client_tracking_active()
+    local_stats["circuit"] = _circuit_breaker.stats()
+    prefix_stats = _metrics.snapshot()
     try:
         redis = await get_redis()
         info = await redis.info("stats")
@@ -447,8 +3164,11 @@ async def get_cache_stats() -> dict[str, Any]:
             * 100,
             "memory_used": info.get("used_memory_human", "N/A"),
             "connected_clients": info.get("connected_clients", 0),
+            "local": local_stats,
+            "prefixes": prefix_stats,
         }
 
     except RedisError as e:
-        logger.error("cache_stats_failed", error=str(e))
-        return {"error": str(e)}
+        _circuit_breaker.record_error(e)
+        _log_redis_error(e, "cache_stats_failed", level="error")
+        return {"error": str(e), "local": local_stats, "prefixes": prefix_stats}
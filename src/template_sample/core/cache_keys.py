@@ -0,0 +1,198 @@
+"""Stable, collision-resistant cache keys for function calls.
+
+Keys are built from a canonical encoding of the call's arguments rather than
+their ``repr()``:
+
+- Arguments are normalized against the function signature, so ``f(1)``,
+  ``f(1, limit=10)`` and ``f(x=1)`` share a key when ``limit`` defaults to 10.
+- Values are encoded as sorted-key JSON (orjson when installed), which is
+  deterministic across processes and much faster than ``repr()`` for large
+  containers. Types JSON lacks are tagged so ``Decimal("1")`` and ``"1"``
+  differ.
+- The encoding is hashed with BLAKE2b at a configurable width (128 bits by
+  default), so collisions are negligible at any realistic key volume.
+
+Objects can control their own key by defining ``__cache_key__()``; anything
+without a canonical encoding falls back to ``repr()``, which is only stable
+if the type's repr is.
+
+Example:
+    >>> from template_sample.core.cache_keys import make_key_builder
+    >>> async def get_orders(user_id: str, limit: int = 10) -> list: ...
+    >>> build_key = make_key_builder(get_orders, prefix="orders")
+    >>> build_key("123") == build_key(user_id="123", limit=10)
+    True
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import hashlib
+import inspect
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Default hash width: 16 bytes = 128 bits = 32 hex characters
+DEFAULT_DIGEST_SIZE = 16
+
+_SIMPLE_KINDS = (
+    inspect.Parameter.POSITIONAL_ONLY,
+    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+    inspect.Parameter.KEYWORD_ONLY,
+)
+
+
+def _default(value: Any) -> Any:
+    """Encode values JSON has no native representation for.
+
+    Non-JSON types are wrapped as ``[tag, payload]`` so they cannot collide
+    with a plain list or string holding the same text.
+    """
+    if isinstance(value, type):
+        # A class argument: its __cache_key__ or model_dump is unbound
+        return ["type", f"{value.__module__}.{value.__qualname__}"]
+    cache_key = getattr(value, "__cache_key__", None)
+    if cache_key is not None:
+        return ["key", cache_key()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    if isinstance(value, (set, frozenset)):
+        return ["set", sorted(canonical_bytes(item).decode() for item in value)]
+    if isinstance(value, bytes):
+        return ["bytes", value.hex()]
+    if isinstance(value, (datetime, date, time)):
+        return ["dt", value.isoformat()]
+    # orjson encodes these natively as their plain value; match it here
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value):
+        return ["dc", type(value).__qualname__, dataclasses.asdict(value)]
+    model_dump = getattr(value, "model_dump", None)
+    if model_dump is not None:
+        return ["model", type(value).__qualname__, model_dump(mode="json")]
+    return ["repr", repr(value)]
+
+
+def canonical_bytes(value: Any) -> bytes:
+    """Encode a value deterministically for hashing.
+
+    Args:
+        value: Value to encode
+
+    Returns:
+        Canonical byte encoding (sorted-key JSON), or a tagged ``repr()``
+        when neither encoder can handle the value (e.g. tuple dict keys)
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                default=_default,
+                option=orjson.OPT_SORT_KEYS
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            # e.g. dict keys orjson cannot stringify; use the stdlib encoder
+            pass
+    try:
+        return json.dumps(
+            value, default=_default, sort_keys=True, separators=(",", ":")
+        ).encode()
+    except (TypeError, ValueError):
+        # Non-string dict keys, mixed-type keys or circular references
+        return json.dumps(["repr", repr(value)], separators=(",", ":")).encode()
+
+
+def hash_key(data: bytes, digest_size: int = DEFAULT_DIGEST_SIZE) -> str:
+    """Hash canonical bytes into a hex key component.
+
+    Args:
+        data: Canonical encoding
+        digest_size: Hash width in bytes (1-64)
+
+    Returns:
+        Hex digest of ``2 * digest_size`` characters
+    """
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
+
+
+def make_key_builder(
+    func: Callable[..., Any],
+    prefix: str = "",
+    digest_size: int = DEFAULT_DIGEST_SIZE,
+    ignore_self: bool = False,
+) -> Callable[..., str]:
+    """Create a key builder for calls to ``func``.
+
+    The signature is inspected once here, so building a key per call is
+    cheap. Simple signatures (no ``*args``/``**kwargs``) are normalized
+    without ``inspect.Signature.bind``.
+
+    Args:
+        func: Function whose calls are keyed
+        prefix: Key prefix (default: function name)
+        digest_size: Hash width in bytes (default: 16, i.e. 128 bits)
+        ignore_self: Leave a leading ``self``/``cls`` argument out of the
+            key, so a cached method is shared across instances. Only set it
+            when the result never depends on the instance; by default the
+            instance is keyed like any argument (give its class a
+            ``__cache_key__`` method so the key is stable across processes)
+
+    Returns:
+        Callable taking the call's ``*args, **kwargs`` and returning
+        ``"{prefix}:{hash}"``
+    """
+    prefix = prefix or func.__name__
+    signature = inspect.signature(func)
+    params = list(signature.parameters.values())
+    skip = 1 if ignore_self and params and params[0].name in {"self", "cls"} else 0
+
+    names = [param.name for param in params]
+    defaults = [param.default for param in params]
+    simple = all(param.kind in _SIMPLE_KINDS for param in params)
+    positional_limit = sum(
+        param.kind is not inspect.Parameter.KEYWORD_ONLY for param in params
+    )
+
+    def normalize_with_bind(args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[Any]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return list(bound.arguments.values())[skip:]
+
+    def normalize(args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[Any]:
+        if not simple or len(args) > positional_limit:
+            return normalize_with_bind(args, kwargs)
+        remaining = names[len(args) :]
+        if kwargs and not kwargs.keys() <= set(remaining):
+            return normalize_with_bind(args, kwargs)
+
+        values = list(args)
+        for name, default in zip(remaining, defaults[len(args) :], strict=True):
+            value = kwargs.get(name, default)
+            if value is inspect.Parameter.empty:
+                # Missing argument: let bind raise the usual TypeError
+                return normalize_with_bind(args, kwargs)
+            values.append(value)
+        return values[skip:]
+
+    def build_key(*args: Any, **kwargs: Any) -> str:
+        data = canonical_bytes(normalize(args, kwargs))
+        return f"{prefix}:{hash_key(data, digest_size)}"
+
+    return build_key
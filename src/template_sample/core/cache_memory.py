@@ -0,0 +1,775 @@
+"""In-memory cache backend with a redis-py compatible API.
+
+``core.cache`` talks to Redis through a small set of ``redis.asyncio.Redis``
+commands (GET/SET/MGET, pipelined SETEX/SADD/EXPIRE, SCAN, UNLINK, INCR,
+...). :class:`MemoryRedis` implements that same subset over a process-local
+:class:`MemoryStore`, so ``cached``, ``invalidate_pattern`` and the rest of
+the cache API run unchanged with no Redis server: in tests, on single-node
+deployments, or to benchmark the cache logic without network noise.
+
+Select it with ``TEMPLATE_SAMPLE_REDIS_MODE=memory`` (or ``fakeredis`` for a
+full Redis emulation when the ``fakeredis`` package is installed).
+
+The store keeps:
+
+- entries in an ``OrderedDict`` in LRU order, evicting the least recently
+  used key once ``max_entries`` or ``max_bytes`` is exceeded;
+- expiry times in a min-heap, so expired keys are reclaimed in
+  ``O(log n)`` each without scanning (and checked lazily on every read);
+- keys in a sorted index, so SCAN with a pattern like ``user:42:*`` only
+  visits keys under its literal prefix.
+
+``max_bytes`` bounds the store's actual memory use: besides the key and
+value bytes, each entry is charged a fixed estimate of its bookkeeping
+(object headers, LRU, index and expiry slots).
+
+Unlike Redis the data lives and dies with the process, and nothing is
+shared between workers: use it where one process owns the cache.
+
+Example:
+    >>> from template_sample.core.cache_memory import MemoryRedis
+    >>> client = MemoryRedis(MemoryStore(max_entries=10_000))
+    >>> await client.set("user:1", b"Ada", ex=60)
+    True
+    >>> await client.get("user:1")
+    b'Ada'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import heapq
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from redis.exceptions import DataError, ResponseError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator
+
+# Scripts MemoryRedis.eval() can run: source -> handler(store, keys, args)
+ScriptHandler = Callable[["MemoryStore", list[bytes], list[bytes]], Any]
+_scripts: dict[str, ScriptHandler] = {}
+
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+# Characters that end the literal prefix of a glob pattern
+_GLOB_SPECIAL = frozenset(b"*?[\\")
+
+# Memory per entry beyond its key and value bytes, measured with
+# tracemalloc on 64-bit CPython: object headers plus the LRU dict and key
+# index slots; a TTL adds its dict entry and heap tuple, a set member its
+# object header and hash table slot
+_ENTRY_OVERHEAD = 150
+_EXPIRY_OVERHEAD = 120
+_MEMBER_OVERHEAD = 140
+
+
+def register_script(source: str, handler: ScriptHandler) -> None:
+    """Teach :meth:`MemoryRedis.eval` to run a Lua script.
+
+    There is no Lua interpreter; each script ``core.cache`` sends is paired
+    with an equivalent Python function. Commands run on the event loop
+    thread, so the handler is as atomic as the script is in Redis.
+
+    Args:
+        source: Exact script text passed to ``eval``
+        handler: Function receiving the store, KEYS and ARGV as bytes
+    """
+    _scripts[source] = handler
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a key or value the way redis-py does."""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value).encode()
+    msg = f"Invalid input of type: '{type(value).__name__}'"
+    raise DataError(msg)
+
+
+def _literal_prefix(pattern: bytes) -> bytes:
+    """Get the part of a glob pattern before its first special character."""
+    for index, char in enumerate(pattern):
+        if char in _GLOB_SPECIAL:
+            return pattern[:index]
+    return pattern
+
+
+def _matches(key: bytes, pattern: bytes | None) -> bool:
+    # latin-1 maps bytes to code points one-to-one
+    return pattern is None or fnmatch.fnmatchcase(
+        key.decode("latin-1"), pattern.decode("latin-1")
+    )
+
+
+# =============================================================================
+# Key Index
+# =============================================================================
+
+
+def _prefix_end(prefix: bytes) -> bytes | None:
+    """Get the smallest key sorting after every key that starts with prefix.
+
+    Returns:
+        The bound, or None if there is none (empty or all-``0xff`` prefix)
+    """
+    stripped = prefix.rstrip(b"\xff")
+    if not stripped:
+        return None
+    return stripped[:-1] + bytes((stripped[-1] + 1,))
+
+
+class KeyIndex:
+    """Sorted set of byte-string keys, searchable by prefix.
+
+    Keys sharing a prefix are adjacent in sorted order, so the keys under a
+    prefix form one run located by binary search. The keys are held in
+    sorted sublists of at most ``2 * load`` keys (a blocked sorted list):
+    an insert or removal bisects the sublist maxima and then shifts at most
+    ``2 * load`` slots of one sublist, however many keys are indexed.
+
+    Example:
+        >>> index = KeyIndex()
+        >>> index.add(b"user:1")
+        >>> index.add(b"order:1")
+        >>> list(index.iter_prefix(b"user:"))
+        [b'user:1']
+    """
+
+    def __init__(self, load: int = 1000) -> None:
+        """Initialize an empty index.
+
+        Args:
+            load: Sublist size; a sublist is split in half once it holds
+                twice as many keys
+        """
+        self._load = load
+        self._lists: list[list[bytes]] = []
+        # Largest key of each sublist, for bisecting to the right one
+        self._maxes: list[bytes] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys held."""
+        return self._len
+
+    def add(self, key: bytes) -> None:
+        """Insert a key (no-op if present)."""
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            # Larger than every key: append to the last sublist
+            pos -= 1
+            keys = self._lists[pos]
+            keys.append(key)
+            self._maxes[pos] = key
+        else:
+            keys = self._lists[pos]
+            index = bisect_left(keys, key)
+            if keys[index] == key:
+                return
+            keys.insert(index, key)
+        self._len += 1
+
+        if len(keys) > 2 * self._load:
+            tail = keys[self._load :]
+            del keys[self._load :]
+            self._lists.insert(pos + 1, tail)
+            self._maxes[pos] = keys[-1]
+            self._maxes.insert(pos + 1, tail[-1])
+
+    def discard(self, key: bytes) -> None:
+        """Remove a key if present."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return
+        keys = self._lists[pos]
+        index = bisect_left(keys, key)
+        if keys[index] != key:
+            return
+        del keys[index]
+        self._len -= 1
+        if not keys:
+            del self._lists[pos]
+            del self._maxes[pos]
+        elif index == len(keys):
+            self._maxes[pos] = keys[-1]
+
+    def iter_prefix(self, prefix: bytes = b"") -> Iterator[bytes]:
+        """Iterate over the keys starting with ``prefix``, in sorted order.
+
+        The matching keys are copied first, so the index may be modified
+        while the iterator is in use.
+        """
+        end = _prefix_end(prefix)
+        first = bisect_left(self._maxes, prefix)
+        matched: list[bytes] = []
+        for pos in range(first, len(self._lists)):
+            keys = self._lists[pos]
+            start = bisect_left(keys, prefix) if pos == first else 0
+            stop = len(keys) if end is None else bisect_left(keys, end)
+            matched.extend(keys[start:stop])
+            if stop < len(keys):
+                break
+        return iter(matched)
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self._lists.clear()
+        self._maxes.clear()
+        self._len = 0
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+
+class MemoryStore:
+    """Bounded key-value store with TTLs, LRU eviction and prefix scans.
+
+    Values are ``bytes`` (strings) or ``set[bytes]`` (sets), mirroring the
+    two Redis types the cache uses. All methods are synchronous and cheap;
+    :class:`MemoryRedis` wraps them in the async redis-py API.
+
+    Example:
+        >>> store = MemoryStore(max_entries=2)
+        >>> store.set(b"a", b"1", ttl=30)
+        True
+        >>> store.set(b"b", b"2")
+        True
+        >>> store.get(b"a")  # a is now most recently used
+        b'1'
+        >>> store.set(b"c", b"3")  # evicts b
+        True
+        >>> sorted(store.scan(b"*"))
+        [b'a', b'c']
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty store.
+
+        Args:
+            max_entries: Maximum number of keys (default: unbounded)
+            max_bytes: Maximum total size of keys and values (default:
+                unbounded)
+            clock: Monotonic clock used for expiry (injectable for tests)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # key -> value, least recently used first
+        self._data: OrderedDict[bytes, bytes | set[bytes]] = OrderedDict()
+        # key -> absolute expiry; the heap may hold stale (expiry, key) pairs
+        self._expires: dict[bytes, float] = {}
+        self._heap: list[tuple[float, bytes]] = []
+        self._keys = KeyIndex()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys, including expired ones not yet purged."""
+        return len(self._data)
+
+    @property
+    def used_bytes(self) -> int:
+        """Approximate memory held by keys, values and their bookkeeping."""
+        return self._bytes
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(self, key: bytes) -> bytes | None:
+        """Get a string value, refreshing its LRU position.
+
+        Raises:
+            ResponseError: If the key holds a set
+        """
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+            return None
+        if isinstance(value, set):
+            raise ResponseError(_WRONGTYPE)
+        self.hits += 1
+        return value
+
+    def members(self, key: bytes) -> set[bytes]:
+        """Get a copy of a set's members (empty if the key is missing).
+
+        Raises:
+            ResponseError: If the key holds a string
+        """
+        value = self._lookup(key)
+        if value is None:
+            return set()
+        if not isinstance(value, set):
+            raise ResponseError(_WRONGTYPE)
+        return set(value)
+
+    def type(self, key: bytes) -> str:
+        """Get a key's Redis type: "string", "set" or "none"."""
+        value = self._lookup(key, touch=False)
+        if value is None:
+            return "none"
+        return "set" if isinstance(value, set) else "string"
+
+    def exists(self, key: bytes) -> bool:
+        """Check whether a key holds an unexpired value."""
+        return self._lookup(key, touch=False) is not None
+
+    def ttl(self, key: bytes) -> float | None:
+        """Get the seconds left before a key expires.
+
+        Returns:
+            Remaining seconds, ``-1.0`` for keys without expiry, or None if
+            the key does not exist
+        """
+        if self._lookup(key, touch=False) is None:
+            return None
+        expires_at = self._expires.get(key)
+        return -1.0 if expires_at is None else max(expires_at - self._clock(), 0.0)
+
+    def scan(self, pattern: bytes | None = None) -> list[bytes]:
+        """List unexpired keys matching a glob pattern.
+
+        Only keys under the pattern's literal prefix are visited, so
+        ``user:42:*`` costs as much as there are ``user:42:`` keys.
+        """
+        self.purge_expired()
+        prefix = _literal_prefix(pattern) if pattern is not None else b""
+        return [key for key in self._keys.iter_prefix(prefix) if _matches(key, pattern)]
+
+    # -- writes --------------------------------------------------------------
+
+    def set(
+        self,
+        key: bytes,
+        value: bytes,
+        ttl: float | None = None,
+        *,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> bool:
+        """Store a string value.
+
+        Args:
+            key: Key
+            value: Value
+            ttl: Seconds until expiry (default: never)
+            nx: Only set if the key does not exist
+            xx: Only set if the key exists
+
+        Returns:
+            False if ``nx``/``xx`` prevented the write
+        """
+        exists = self._lookup(key, touch=False) is not None
+        if (nx and exists) or (xx and not exists):
+            return False
+        self._write(key, value)
+        self._set_expiry(key, ttl)
+        self._enforce_limits()
+        return True
+
+    def add_members(self, key: bytes, members: Iterable[bytes]) -> int:
+        """Add members to a set, creating it if needed.
+
+        Returns:
+            Number of members that were not already present
+
+        Raises:
+            ResponseError: If the key holds a string
+        """
+        current = self._lookup(key)
+        if current is None:
+            current = set()
+            self._write(key, current)
+        elif not isinstance(current, set):
+            raise ResponseError(_WRONGTYPE)
+        added = 0
+        for member in members:
+            if member not in current:
+                current.add(member)
+                self._bytes += len(member) + _MEMBER_OVERHEAD
+                added += 1
+        self._enforce_limits()
+        return added
+
+    def incr(self, key: bytes, amount: int = 1) -> int:
+        """Increment an integer value, starting from 0; keeps the TTL.
+
+        Raises:
+            ResponseError: If the value is not an integer
+        """
+        current = self._lookup(key)
+        if isinstance(current, set):
+            raise ResponseError(_WRONGTYPE)
+        try:
+            number = int(current or b"0") + amount
+        except ValueError:
+            msg = "value is not an integer or out of range"
+            raise ResponseError(msg) from None
+        self._write(key, str(number).encode())
+        self._enforce_limits()
+        return number
+
+    def expire(
+        self,
+        key: bytes,
+        ttl: float,
+        *,
+        nx: bool = False,
+        xx: bool = False,
+        gt: bool = False,
+        lt: bool = False,
+    ) -> bool:
+        """Set a key's TTL, with Redis 7 ``EXPIRE`` option semantics.
+
+        Returns:
+            True if the TTL was set
+        """
+        if self._lookup(key, touch=False) is None:
+            return False
+        current = self._expires.get(key)
+        new = self._clock() + ttl
+        if (
+            (nx and current is not None)
+            or (xx and current is None)
+            # No expiry counts as an infinite TTL
+            or (gt and (current is None or new <= current))
+            or (lt and current is not None and new >= current)
+        ):
+            return False
+        if ttl <= 0:
+            self.delete(key)
+        else:
+            self._set_expiry(key, ttl)
+        return True
+
+    def delete(self, key: bytes) -> bool:
+        """Remove a key.
+
+        Returns:
+            True if the key existed
+        """
+        if self._lookup(key, touch=False) is None:
+            return False
+        self._remove(key)
+        return True
+
+    def flush(self) -> None:
+        """Remove every key."""
+        self._data.clear()
+        self._expires.clear()
+        self._heap.clear()
+        self._keys.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Remove every key whose TTL has passed.
+
+        Returns:
+            Number of keys removed
+        """
+        now = self._clock()
+        purged = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            # Skip entries superseded by a later SET/EXPIRE or a delete
+            if self._expires.get(key) == expires_at:
+                self._remove(key)
+                self.expirations += 1
+                purged += 1
+        return purged
+
+    # -- internals -----------------------------------------------------------
+
+    def _lookup(self, key: bytes, *, touch: bool = True) -> bytes | set[bytes] | None:
+        value = self._data.get(key)
+        if value is None:
+            return None
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        if touch:
+            self._data.move_to_end(key)
+        return value
+
+    def _write(self, key: bytes, value: bytes | set[bytes]) -> None:
+        previous = self._data.get(key)
+        if previous is None:
+            self._keys.add(key)
+            self._bytes += len(key) + _ENTRY_OVERHEAD
+        else:
+            self._bytes -= _size(previous)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._bytes += _size(value)
+
+    def _set_expiry(self, key: bytes, ttl: float | None) -> None:
+        if ttl is None:
+            if self._expires.pop(key, None) is not None:
+                self._bytes -= _EXPIRY_OVERHEAD
+            return
+        expires_at = self._clock() + ttl
+        if key not in self._expires:
+            self._bytes += _EXPIRY_OVERHEAD
+        self._expires[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+        # Rewrites leave superseded heap entries behind; rebuild when they
+        # outnumber the live ones
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(when, name) for name, when in self._expires.items()]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: bytes) -> None:
+        value = self._data.pop(key)
+        if self._expires.pop(key, None) is not None:
+            self._bytes -= _EXPIRY_OVERHEAD
+        self._keys.discard(key)
+        self._bytes -= len(key) + _ENTRY_OVERHEAD + _size(value)
+
+    def _enforce_limits(self) -> None:
+        self.purge_expired()
+        # Never evict the entry that was just written
+        while len(self._data) > 1 and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+
+def _size(value: bytes | set[bytes]) -> int:
+    if isinstance(value, set):
+        return sum(map(len, value)) + _MEMBER_OVERHEAD * len(value)
+    return len(value)
+
+
+# =============================================================================
+# redis-py Adapter
+# =============================================================================
+
+
+class MemoryRedis:
+    """``redis.asyncio.Redis`` stand-in backed by a :class:`MemoryStore`.
+
+    Implements the commands ``core.cache`` uses, with redis-py's argument
+    names and return types (``bytes`` values, ``None`` for misses, counts
+    from DEL/UNLINK/EXISTS). Pub/Sub, client tracking and arbitrary Lua are
+    not available; scripts must be registered with :func:`register_script`.
+    """
+
+    def __init__(self, store: MemoryStore | None = None) -> None:
+        """Initialize the client.
+
+        Args:
+            store: Backing store (default: an unbounded one). Clients
+                sharing a store see the same data.
+        """
+        self.store = store or MemoryStore()
+
+    async def ping(self) -> bool:
+        """Always succeeds."""
+        return True
+
+    async def aclose(self) -> None:
+        """No-op; the data is kept for clients sharing the store."""
+
+    async def get(self, name: Any) -> bytes | None:
+        """GET."""
+        return self.store.get(_encode(name))
+
+    async def mget(self, keys: Any, *args: Any) -> list[bytes | None]:
+        """MGET; accepts a list of keys or keys as arguments."""
+        names = [keys, *args] if isinstance(keys, (str, bytes)) else [*keys, *args]
+        return [self.store.get(_encode(name)) for name in names]
+
+    async def set(
+        self,
+        name: Any,
+        value: Any,
+        ex: float | None = None,
+        px: float | None = None,
+        *,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> bool | None:
+        """SET with EX/PX/NX/XX; returns None when NX/XX prevent the write."""
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        stored = self.store.set(_encode(name), _encode(value), ttl, nx=nx, xx=xx)
+        return True if stored else None
+
+    async def setex(self, name: Any, time: float, value: Any) -> bool:
+        """SETEX."""
+        return self.store.set(_encode(name), _encode(value), time)
+
+    async def incr(self, name: Any, amount: int = 1) -> int:
+        """INCRBY."""
+        return self.store.incr(_encode(name), amount)
+
+    async def expire(
+        self,
+        name: Any,
+        time: float,
+        *,
+        nx: bool = False,
+        xx: bool = False,
+        gt: bool = False,
+        lt: bool = False,
+    ) -> bool:
+        """EXPIRE with NX/XX/GT/LT."""
+        return self.store.expire(_encode(name), time, nx=nx, xx=xx, gt=gt, lt=lt)
+
+    async def ttl(self, name: Any) -> int:
+        """TTL: seconds left, -1 without expiry, -2 if missing."""
+        remaining = self.store.ttl(_encode(name))
+        if remaining is None:
+            return -2
+        return -1 if remaining < 0 else round(remaining)
+
+    async def exists(self, *names: Any) -> int:
+        """EXISTS; counts repeated keys repeatedly, like Redis."""
+        return sum(self.store.exists(_encode(name)) for name in names)
+
+    async def delete(self, *names: Any) -> int:
+        """DEL."""
+        return sum(self.store.delete(_encode(name)) for name in names)
+
+    async def unlink(self, *names: Any) -> int:
+        """UNLINK (same as DEL; there is no background reclamation)."""
+        return await self.delete(*names)
+
+    async def sadd(self, name: Any, *values: Any) -> int:
+        """SADD."""
+        return self.store.add_members(_encode(name), map(_encode, values))
+
+    async def smembers(self, name: Any) -> set[bytes]:
+        """SMEMBERS."""
+        return self.store.members(_encode(name))
+
+    async def scan_iter(
+        self, match: Any = None, count: int | None = None, _type: str | None = None
+    ) -> AsyncIterator[bytes]:
+        """SCAN over keys matching ``match``.
+
+        Matching keys are collected up front, so keys written during the
+        iteration may be missed, as with SCAN. The loop is yielded to every
+        ``count`` keys so long scans don't starve other tasks.
+        """
+        keys = self.store.scan(_encode(match) if match is not None else None)
+        for index, key in enumerate(keys, 1):
+            if _type is not None and _type != self.store.type(key):
+                continue
+            yield key
+            if count and index % count == 0:
+                await asyncio.sleep(0)
+
+    async def sscan_iter(
+        self, name: Any, match: Any = None, count: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """SSCAN over a set's members."""
+        pattern = _encode(match) if match is not None else None
+        for index, member in enumerate(self.store.members(_encode(name)), 1):
+            if _matches(member, pattern):
+                yield member
+            if count and index % count == 0:
+                await asyncio.sleep(0)
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        """EVAL a script registered with :func:`register_script`.
+
+        Raises:
+            ResponseError: If the script has no registered handler
+        """
+        handler = _scripts.get(script)
+        if handler is None:
+            msg = "NOSCRIPT script not supported by the in-memory backend"
+            raise ResponseError(msg)
+        encoded = [_encode(value) for value in keys_and_args]
+        return handler(self.store, encoded[:numkeys], encoded[numkeys:])
+
+    async def flushdb(self) -> bool:
+        """FLUSHDB."""
+        self.store.flush()
+        return True
+
+    async def info(self, section: str | None = None) -> dict[str, Any]:  # noqa: ARG002
+        """INFO-style counters for the store (``section`` is ignored)."""
+        used = self.store.used_bytes
+        return {
+            "keyspace_hits": self.store.hits,
+            "keyspace_misses": self.store.misses,
+            "evicted_keys": self.store.evictions,
+            "expired_keys": self.store.expirations,
+            "used_memory": used,
+            "used_memory_human": f"{used / (1024 * 1024):.2f}M",
+            "connected_clients": 1,
+            "keys": len(self.store),
+        }
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:  # noqa: ARG002
+        """Start a pipeline; commands run in order on ``execute()``."""
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    """Command buffer with the redis-py pipeline interface.
+
+    Every command runs without interleaving once ``execute()`` is called,
+    so pipelines are effectively transactions.
+    """
+
+    def __init__(self, client: MemoryRedis) -> None:
+        """Initialize an empty pipeline for ``client``."""
+        self._client = client
+        self._commands: list[tuple[Callable[..., Any], tuple[Any, ...], dict]] = []
+
+    async def __aenter__(self) -> MemoryPipeline:
+        """Enter the pipeline context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Discard commands that were not executed."""
+        self._commands.clear()
+
+    def __getattr__(self, name: str) -> Callable[..., MemoryPipeline]:
+        """Queue a client command instead of running it."""
+        command = getattr(self._client, name)
+
+        def queue(*args: Any, **kwargs: Any) -> MemoryPipeline:
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        """Run the queued commands.
+
+        Returns:
+            Each command's result, in order
+        """
+        commands, self._commands = self._commands, []
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
@@ -0,0 +1,284 @@
+"""In-process cache metrics with Prometheus text export.
+
+Redis's ``keyspace_hits``/``keyspace_misses`` cover every client of the
+instance. The counters and histograms here are recorded by ``core.cache``
+itself and labelled by key prefix (the ``cached()`` prefix, or the first
+``:``-separated segment of a raw key), so each cached function can be
+tracked on its own.
+
+Recording is a dict lookup plus an integer add (and a bisect for
+histograms), with no locking; metrics for a prefix are only created the
+first time it is seen.
+
+Exported series (``cache`` namespace by default):
+
+- ``cache_hits_total{prefix, tier}``: hits served by ``local`` (L1) or ``redis``
+- ``cache_misses_total{prefix}``: lookups that found nothing
+- ``cache_errors_total{prefix}``: Redis errors that fell back to the function
+- ``cache_oversized_total{prefix, action}``: entries over the size limit that
+  were ``skipped``, ``compressed`` or ``chunked``
+- ``cache_compute_seconds{prefix}``: time spent in the wrapped function on a miss
+- ``cache_serialize_seconds{prefix}`` / ``cache_deserialize_seconds{prefix}``
+- ``cache_payload_bytes{prefix}``: encoded size of stored entries
+- ``cache_circuit_state``: Redis circuit breaker (0 closed, 1 half-open, 2 open)
+
+Example:
+    >>> from fastapi import Response
+    >>> from template_sample.core.cache import get_cache_metrics
+    >>> @app.get("/metrics")
+    >>> async def metrics() -> Response:
+    ...     return Response(
+    ...         get_cache_metrics().render_prometheus(),
+    ...         media_type="text/plain; version=0.0.4",
+    ...     )
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Latency buckets in seconds (0.1 ms to 10 s)
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Payload size buckets in bytes (64 B to 4 MiB)
+DEFAULT_SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (help text, label names)
+_COUNTERS = {
+    "hits": ("Cache hits by key prefix and tier", ("prefix", "tier")),
+    "misses": ("Cache misses by key prefix", ("prefix",)),
+    "errors": ("Redis errors that bypassed the cache", ("prefix",)),
+    "oversized": ("Entries over the size limit by action", ("prefix", "action")),
+}
+
+# name -> help text (unlabelled, process-wide values)
+_GAUGES = {
+    "circuit_state": "Redis circuit breaker state (0=closed, 1=half-open, 2=open)",
+}
+
+# name -> (help text, buckets)
+_HISTOGRAMS = {
+    "compute_seconds": (
+        "Time spent computing values on a cache miss",
+        DEFAULT_LATENCY_BUCKETS,
+    ),
+    "serialize_seconds": ("Time spent encoding cache entries", DEFAULT_LATENCY_BUCKETS),
+    "deserialize_seconds": (
+        "Time spent decoding cache entries",
+        DEFAULT_LATENCY_BUCKETS,
+    ),
+    "payload_bytes": ("Encoded size of stored cache entries", DEFAULT_SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus ``le`` semantics."""
+
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds; an implicit ``+Inf`` bucket follows
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        """Get cumulative bucket counts, ending with the ``+Inf`` bucket."""
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class CacheMetrics:
+    """Per-prefix cache counters and histograms.
+
+    Example:
+        >>> metrics = CacheMetrics()
+        >>> metrics.inc("hits", "user", tier="redis")
+        >>> metrics.observe("compute_seconds", "user", 0.012)
+        >>> metrics.snapshot()["user"]["hits"]
+        {'redis': 1}
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            enabled: Record anything at all; when False every call is a no-op
+        """
+        self.enabled = enabled
+        # (name, prefix, tier) -> count
+        self._counters: dict[tuple[str, str, str], int] = {}
+        # (name, prefix) -> histogram
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        # name -> value
+        self._gauges: dict[str, float] = {}
+
+    def inc(self, name: str, prefix: str, tier: str = "", amount: int = 1) -> None:
+        """Increment a counter.
+
+        Args:
+            name: One of the counter names listed in the module docstring
+            prefix: Key prefix label
+            tier: Second label, if the counter has one: "local" or "redis"
+                for hits, the action taken for oversized
+            amount: Increment
+        """
+        if not self.enabled:
+            return
+        key = (name, prefix, tier)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, prefix: str, value: float) -> None:
+        """Record a histogram observation.
+
+        Args:
+            name: One of the histogram names listed in the module docstring
+            prefix: Key prefix label
+            value: Observed value (seconds or bytes)
+
+        Raises:
+            KeyError: If name is not a known histogram
+        """
+        if not self.enabled:
+            return
+        histogram = self._histograms.get((name, prefix))
+        if histogram is None:
+            histogram = Histogram(_HISTOGRAMS[name][1])
+            self._histograms[name, prefix] = histogram
+        histogram.observe(value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a process-wide gauge.
+
+        Args:
+            name: One of the gauge names listed in the module docstring
+            value: Current value
+        """
+        if self.enabled:
+            self._gauges[name] = value
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        self._counters.clear()
+        self._histograms.clear()
+        self._gauges.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Summarize recorded values per prefix.
+
+        Returns:
+            ``{prefix: {"hits": {tier: n}, "misses": n, "errors": n,
+            "oversized": {action: n}, "<histogram>": {"count": n, "sum": x}}}``
+            for every prefix seen
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for (name, prefix, tier), value in self._counters.items():
+            entry = result.setdefault(prefix, {})
+            if len(_COUNTERS[name][1]) > 1:
+                entry.setdefault(name, {})[tier] = value
+            else:
+                entry[name] = value
+        for (name, prefix), histogram in self._histograms.items():
+            result.setdefault(prefix, {})[name] = {
+                "count": histogram.count,
+                "sum": histogram.sum,
+            }
+        return result
+
+    def render_prometheus(self, namespace: str = "cache") -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            namespace: Metric name prefix
+
+        Returns:
+            Exposition text (``text/plain; version=0.0.4``)
+        """
+        lines: list[str] = []
+        for name, (help_text, label_names) in _COUNTERS.items():
+            metric = f"{namespace}_{name}_total"
+            lines.extend((f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"))
+            for (counter, prefix, tier), value in sorted(self._counters.items()):
+                if counter != name:
+                    continue
+                labels = dict(zip(label_names, (prefix, tier), strict=False))
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        for name, help_text in _GAUGES.items():
+            if name not in self._gauges:
+                continue
+            metric = f"{namespace}_{name}"
+            lines.extend(
+                (
+                    f"# HELP {metric} {help_text}",
+                    f"# TYPE {metric} gauge",
+                    f"{metric} {_format_value(self._gauges[name])}",
+                )
+            )
+
+        for name, (help_text, _) in _HISTOGRAMS.items():
+            metric = f"{namespace}_{name}"
+            lines.extend((f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"))
+            for (histogram_name, prefix), histogram in sorted(
+                self._histograms.items(), key=lambda item: item[0]
+            ):
+                if histogram_name != name:
+                    continue
+                bounds = [*map(_format_value, histogram.buckets), "+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative(), strict=True):
+                    labels = _format_labels({"prefix": prefix, "le": bound})
+                    lines.append(f"{metric}_bucket{labels} {count}")
+                labels = _format_labels({"prefix": prefix})
+                lines.extend(
+                    (
+                        f"{metric}_sum{labels} {_format_value(histogram.sum)}",
+                        f"{metric}_count{labels} {histogram.count}",
+                    )
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
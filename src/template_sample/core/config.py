@@ -6,6 +6,7 @@ Pydantic-settings handles the parsing and validation.
 
 from typing import Literal
 
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,18 +18,123 @@ class Settings(BaseSettings):
         log_level: The logging level for the application.
         json_logs: Flag to enable or disable JSON formatted logs.
         include_timestamp: Flag to include timestamps in logs.
+        redis_url: Redis URL for the cache (also read from ``REDIS_URL``).
+            In Sentinel mode only its credentials and database are used.
+        redis_mode: Topology: a single primary, Redis Cluster, or Sentinel;
+            or no server at all: ``memory`` (process-local store, see
+            ``core.cache_memory``) or ``fakeredis`` (requires fakeredis).
+        redis_max_connections: Connection pool size (per node in Cluster mode;
+            also read from ``CACHE_MAX_CONNECTIONS``).
+        redis_min_connections: Connections opened at startup by ``init_cache``
+            so the first requests don't pay connection setup.
+        redis_pool_blocking: Wait for a free connection when the pool is
+            exhausted instead of failing immediately (standalone mode).
+        redis_pool_timeout: Seconds to wait for a free connection when blocking.
+        redis_socket_timeout: Seconds to wait for a command response.
+        redis_connect_timeout: Seconds to wait when opening a connection.
+        redis_health_check_interval: PING connections idle for this many seconds
+            before reusing them (0 disables).
+        redis_read_from_replicas: Send cache reads to replicas: the
+            ``redis_replica_urls`` in standalone mode, replica nodes in Cluster
+            mode, or the service's replicas in Sentinel mode.
+        redis_replica_urls: Read replica URLs for standalone mode (JSON list).
+        redis_sentinels: Sentinel addresses as ``host:port`` (JSON list).
+        redis_sentinel_service: Sentinel service (primary group) name.
+        redis_client_tracking: Enable client-side caching at startup (see
+            ``core.cache.enable_client_tracking``; also read from
+            ``REDIS_CLIENT_TRACKING``).
+        redis_client_tracking_prefixes: Key prefixes to track in broadcast
+            mode, e.g. ``["user:", "product:"]`` (JSON list; also read from
+            ``REDIS_CLIENT_TRACKING_PREFIXES``). Empty tracks the keys read.
+        redis_breaker_failure_threshold: Connection/timeout errors within
+            ``redis_breaker_failure_window`` seconds that open the cache circuit
+            breaker, after which Redis is skipped (0 disables the breaker).
+        redis_breaker_failure_window: Window for counting failures, in seconds.
+        redis_breaker_reset_timeout: Seconds the breaker stays open before a
+            probe is allowed through.
+        redis_breaker_probe_timeout: Seconds to wait for the probe PING.
+        cache_warmup_concurrency: Warm-up loaders run at once at startup.
+        cache_warmup_budget: Seconds the startup warm-up may take, e.g. less
+            than the startup probe allows (0 means no limit).
+        cache_memory_max_entries: Key limit of the ``memory`` backend before
+            least recently used keys are evicted.
+        cache_memory_max_bytes: Size limit of the ``memory`` backend in
+            bytes: keys, values and an estimate of their bookkeeping.
+        cache_max_entry_bytes: Largest encoded cache entry stored as-is
+            (0 disables the limit).
+        cache_oversize_policy: What to do with larger entries: ``skip``
+            caching them, ``compress`` them, or ``chunk`` them across keys.
+        cache_chunk_bytes: Chunk size for the ``chunk`` policy.
+        cache_oversize_compression: Compressor for the ``compress`` policy.
     """
 
     model_config = SettingsConfigDict(
         env_prefix="template_sample_",
         case_sensitive=False,
         extra="ignore",
+        populate_by_name=True,
     )
 
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
     json_logs: bool = False
     include_timestamp: bool = True
 
+    redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        validation_alias=AliasChoices("template_sample_redis_url", "redis_url"),
+    )
+    redis_mode: Literal["standalone", "cluster", "sentinel", "memory", "fakeredis"] = (
+        "standalone"
+    )
+    redis_max_connections: int = Field(
+        default=50,
+        ge=1,
+        validation_alias=AliasChoices(
+            "template_sample_redis_max_connections", "cache_max_connections"
+        ),
+    )
+    redis_min_connections: int = Field(default=5, ge=0)
+    redis_pool_blocking: bool = False
+    redis_pool_timeout: float = Field(default=5.0, gt=0)
+    redis_socket_timeout: float = Field(default=5.0, gt=0)
+    redis_connect_timeout: float = Field(default=5.0, gt=0)
+    redis_health_check_interval: int = Field(default=30, ge=0)
+    redis_read_from_replicas: bool = False
+    redis_replica_urls: list[str] = Field(default_factory=list)
+    redis_sentinels: list[str] = Field(default_factory=list)
+    redis_sentinel_service: str = "mymaster"
+    redis_client_tracking: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "template_sample_redis_client_tracking", "redis_client_tracking"
+        ),
+    )
+    redis_client_tracking_prefixes: list[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices(
+            "template_sample_redis_client_tracking_prefixes",
+            "redis_client_tracking_prefixes",
+        ),
+    )
+    redis_breaker_failure_threshold: int = Field(default=5, ge=0)
+    redis_breaker_failure_window: float = Field(default=10.0, gt=0)
+    redis_breaker_reset_timeout: float = Field(default=5.0, gt=0)
+    redis_breaker_probe_timeout: float = Field(default=0.5, gt=0)
+    cache_warmup_concurrency: int = Field(default=8, ge=1)
+    cache_warmup_budget: float = Field(default=0.0, ge=0)
+    cache_memory_max_entries: int = Field(default=100_000, ge=1)
+    cache_memory_max_bytes: int = Field(default=256 * 1024 * 1024, ge=1)
+    cache_max_entry_bytes: int = Field(default=0, ge=0)
+    cache_oversize_policy: Literal["skip", "compress", "chunk"] = "skip"
+    cache_chunk_bytes: int = Field(default=512 * 1024, ge=1024)
+    cache_oversize_compression: Literal["zlib", "zstd", "lz4"] = "zlib"
+    job_queue_routing: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "template_sample_job_queue_routing", "job_queue_routing"
+        ),
+    )
+
 
 # A single, global instance of the settings
 settings = Settings()
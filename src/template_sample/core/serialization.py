@@ -0,0 +1,535 @@
+"""Pluggable value serialization for the Redis cache.
+
+Cache payloads are framed with a single header byte so the encoding of every
+entry is self-describing:
+
+    bit 7     always set (never the first byte of plain ASCII JSON)
+    bit 6     record flag: the value is the cache's own bookkeeping (e.g. a
+              stale-while-revalidate envelope), not a user value
+    bits 3-5  serializer id (json, pickle, msgpack, ...)
+    bits 0-2  compressor id (none, zlib, zstd, lz4)
+
+Decoding dispatches on the header rather than on the configured codec, so a
+fleet can switch formats (or turn compression on) without flushing Redis:
+old entries stay readable until they expire. Payloads without a header are
+read as plain JSON, which is what the cache wrote before framing existed.
+
+A codec only decodes its own serializer plus ``allowed_formats`` (json and
+msgpack by default). Pickle is never accepted unless it is configured or
+listed explicitly, because anyone able to write to Redis could otherwise
+run code in every process that reads the entry.
+
+Setup:
+    Binary formats and compressors are optional dependencies:
+       uv add msgpack      # MsgpackSerializer
+       uv add orjson       # faster JsonSerializer
+       uv add zstandard    # zstd compression
+       uv add lz4          # lz4 compression
+
+Example:
+    >>> from decimal import Decimal
+    >>> from template_sample.core.serialization import CacheCodec
+    >>> codec = CacheCodec("msgpack", compression="zstd", compress_threshold=1024)
+    >>> payload = codec.encode({"total": Decimal("10.25")})
+    >>> codec.decode(payload)
+    {'total': Decimal('10.25')}
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import pickle  # nosec B403 - only decoded when a codec opts in to pickle
+import uuid
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - exercised only without lz4
+    lz4_frame = None
+
+# Header layout (see module docstring)
+_HEADER_FLAG = 0x80
+_RECORD_FLAG = 0x40
+_SERIALIZER_SHIFT = 3
+_SERIALIZER_MASK = 0x07
+_COMPRESSOR_MASK = 0x07
+
+# Serializers a codec decodes besides its own (see CacheCodec)
+DEFAULT_ALLOWED_FORMATS = frozenset({"json", "msgpack"})
+
+
+class Serializer(Protocol):
+    """Converts cache values to and from bytes."""
+
+    format_id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value."""
+        ...
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize a value."""
+        ...
+
+
+class Compressor(Protocol):
+    """Compresses serialized cache payloads."""
+
+    format_id: int
+    name: str
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a payload."""
+        ...
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a payload."""
+        ...
+
+
+# =============================================================================
+# Serializers
+# =============================================================================
+
+
+class JsonSerializer:
+    """JSON serializer, using orjson when it is installed.
+
+    Matches the cache's historical behaviour: values JSON cannot represent
+    (Decimal, UUID, sets of them, ...) are stored as strings. Use a binary
+    serializer when values must round-trip with their types intact.
+
+    Values orjson rejects, such as integers wider than 64 bits, fall back to
+    the standard library encoder. Its payloads start with a space, which
+    orjson never writes, so they are also decoded by the standard library
+    (orjson would read the wide integers back as floats).
+    """
+
+    format_id: ClassVar[int] = 1
+    name: ClassVar[str] = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value to UTF-8 JSON."""
+        if orjson is not None:
+            with contextlib.suppress(TypeError):
+                return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return b" " + json.dumps(value, default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize UTF-8 JSON."""
+        if orjson is not None and not data.startswith(b" "):
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class PickleSerializer:
+    """Pickle protocol 5 serializer.
+
+    Round-trips any picklable Python value exactly. Only use it when Redis
+    is trusted: unpickling a payload written by an attacker runs their code.
+    """
+
+    format_id: ClassVar[int] = 2
+    name: ClassVar[str] = "pickle"
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value with pickle protocol 5."""
+        return pickle.dumps(value, protocol=5)
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize a pickle payload."""
+        return pickle.loads(data)  # noqa: S301  # nosec B301
+
+
+class MsgpackSerializer:
+    """MessagePack serializer with lossless Decimal/datetime/date/UUID support.
+
+    Compact and fast, without pickle's code-execution risk. Tuples are
+    returned as lists.
+    """
+
+    format_id: ClassVar[int] = 3
+    name: ClassVar[str] = "msgpack"
+
+    _EXT_DECIMAL = 1
+    _EXT_DATETIME = 2
+    _EXT_DATE = 3
+    _EXT_UUID = 4
+
+    def __init__(self) -> None:
+        """Import msgpack.
+
+        Raises:
+            ImportError: If msgpack is not installed
+        """
+        if msgpack is None:
+            msg = "msgpack is not installed. Install with: uv add msgpack"
+            raise ImportError(msg)
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value to MessagePack."""
+        return self._msgpack.packb(value, default=self._encode_ext, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize MessagePack."""
+        return self._msgpack.unpackb(
+            data, ext_hook=self._decode_ext, raw=False, strict_map_key=False
+        )
+
+    def _encode_ext(self, value: Any) -> Any:
+        ext = self._msgpack.ExtType
+        # datetime is a subclass of date, so it must be checked first
+        if isinstance(value, Decimal):
+            return ext(self._EXT_DECIMAL, str(value).encode())
+        if isinstance(value, datetime):
+            return ext(self._EXT_DATETIME, value.isoformat().encode())
+        if isinstance(value, date):
+            return ext(self._EXT_DATE, value.isoformat().encode())
+        if isinstance(value, uuid.UUID):
+            return ext(self._EXT_UUID, value.bytes)
+        msg = f"Cannot serialize {type(value).__name__} with msgpack"
+        raise TypeError(msg)
+
+    def _decode_ext(self, code: int, data: bytes) -> Any:
+        if code == self._EXT_DECIMAL:
+            return Decimal(data.decode())
+        if code == self._EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == self._EXT_DATE:
+            return date.fromisoformat(data.decode())
+        if code == self._EXT_UUID:
+            return uuid.UUID(bytes=data)
+        return self._msgpack.ExtType(code, data)
+
+
+# =============================================================================
+# Compressors
+# =============================================================================
+
+
+class ZlibCompressor:
+    """zlib compression (standard library, always available)."""
+
+    format_id: ClassVar[int] = 1
+    name: ClassVar[str] = "zlib"
+
+    def __init__(self, level: int = 6) -> None:
+        """Initialize the compressor.
+
+        Args:
+            level: Compression level (1-9)
+        """
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a payload."""
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a payload."""
+        return zlib.decompress(data)
+
+
+class ZstdCompressor:
+    """Zstandard compression: better ratio and speed than zlib."""
+
+    format_id: ClassVar[int] = 2
+    name: ClassVar[str] = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        """Initialize the compressor.
+
+        Args:
+            level: Compression level (1-22)
+
+        Raises:
+            ImportError: If zstandard is not installed
+        """
+        if zstandard is None:
+            msg = "zstandard is not installed. Install with: uv add zstandard"
+            raise ImportError(msg)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a payload."""
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a payload."""
+        return self._decompressor.decompress(data)
+
+
+class Lz4Compressor:
+    """LZ4 frame compression: fastest option, lower ratio."""
+
+    format_id: ClassVar[int] = 3
+    name: ClassVar[str] = "lz4"
+
+    def __init__(self, level: int = 0) -> None:
+        """Initialize the compressor.
+
+        Args:
+            level: Compression level (0 is the fast default)
+
+        Raises:
+            ImportError: If lz4 is not installed
+        """
+        if lz4_frame is None:
+            msg = "lz4 is not installed. Install with: uv add lz4"
+            raise ImportError(msg)
+        self._lz4 = lz4_frame
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a payload."""
+        return self._lz4.compress(data, compression_level=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a payload."""
+        return self._lz4.decompress(data)
+
+
+# =============================================================================
+# Codec
+# =============================================================================
+
+_SERIALIZER_TYPES: dict[str, type] = {
+    "json": JsonSerializer,
+    "pickle": PickleSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+_COMPRESSOR_TYPES: dict[str, type] = {
+    "zlib": ZlibCompressor,
+    "zstd": ZstdCompressor,
+    "lz4": Lz4Compressor,
+}
+
+# Instances used for decoding, created on first use (ids never change)
+_serializers_by_id: dict[int, Serializer] = {}
+_compressors_by_id: dict[int, Compressor] = {}
+
+
+def _serializer_for_id(format_id: int) -> Serializer:
+    serializer = _serializers_by_id.get(format_id)
+    if serializer is None:
+        for cls in _SERIALIZER_TYPES.values():
+            if cls.format_id == format_id:
+                serializer = _serializers_by_id[format_id] = cls()
+                break
+        else:
+            msg = f"Unknown cache serializer id: {format_id}"
+            raise ValueError(msg)
+    return serializer
+
+
+def _compressor_for_id(format_id: int) -> Compressor:
+    compressor = _compressors_by_id.get(format_id)
+    if compressor is None:
+        for cls in _COMPRESSOR_TYPES.values():
+            if cls.format_id == format_id:
+                compressor = _compressors_by_id[format_id] = cls()
+                break
+        else:
+            msg = f"Unknown cache compressor id: {format_id}"
+            raise ValueError(msg)
+    return compressor
+
+
+class CacheCodec:
+    """Encodes cache values as framed, optionally compressed payloads.
+
+    Payloads are only decoded if they were written by the codec's own
+    serializer or one named in ``allowed_formats``; anything else (notably
+    pickle, unless opted in) raises ValueError without being deserialized.
+
+    Example:
+        >>> codec = CacheCodec("pickle", compression="zlib")
+        >>> codec.decode(codec.encode({"a": (1, 2)}))
+        {'a': (1, 2)}
+    """
+
+    def __init__(
+        self,
+        serializer: Serializer | str = "json",
+        compression: Compressor | str | None = None,
+        compress_threshold: int = 1024,
+        *,
+        allowed_formats: Iterable[str] = DEFAULT_ALLOWED_FORMATS,
+    ) -> None:
+        """Initialize the codec.
+
+        Args:
+            serializer: Serializer instance or name ("json", "pickle", "msgpack")
+            compression: Compressor instance or name ("zlib", "zstd", "lz4"),
+                or None to never compress
+            compress_threshold: Only compress payloads at least this many bytes
+            allowed_formats: Other serializer names whose payloads may be
+                decoded, e.g. while migrating formats (default: json and
+                msgpack). Only list "pickle" if Redis is fully trusted
+
+        Raises:
+            ValueError: If a serializer or compressor name is unknown
+            ImportError: If the selected format's library is not installed
+        """
+        if isinstance(serializer, str):
+            if serializer not in _SERIALIZER_TYPES:
+                msg = f"Unknown cache serializer: {serializer}"
+                raise ValueError(msg)
+            serializer = _SERIALIZER_TYPES[serializer]()
+        allowed_ids = {serializer.format_id}
+        for name in allowed_formats:
+            if name not in _SERIALIZER_TYPES:
+                msg = f"Unknown cache serializer: {name}"
+                raise ValueError(msg)
+            allowed_ids.add(_SERIALIZER_TYPES[name].format_id)
+        if isinstance(compression, str):
+            if compression not in _COMPRESSOR_TYPES:
+                msg = f"Unknown cache compressor: {compression}"
+                raise ValueError(msg)
+            compression = _COMPRESSOR_TYPES[compression]()
+
+        self.serializer: Serializer = serializer
+        self.compressor: Compressor | None = compression
+        self.compress_threshold = compress_threshold
+        self.allowed_ids = frozenset(allowed_ids)
+        # Prefer our own configured instances when decoding our formats
+        _serializers_by_id.setdefault(serializer.format_id, serializer)
+        if compression is not None:
+            _compressors_by_id.setdefault(compression.format_id, compression)
+
+    def encode(self, value: Any, *, record: bool = False) -> bytes:
+        """Serialize, optionally compress, and frame a value.
+
+        Args:
+            value: Value to encode
+            record: Set the header's record flag, marking the value as the
+                cache's own bookkeeping; see :meth:`decode_frame`
+
+        Returns:
+            Header byte followed by the payload
+        """
+        body = self.serializer.dumps(value)
+        compressor_id = 0
+        if self.compressor is not None and len(body) >= self.compress_threshold:
+            compressed = self.compressor.compress(body)
+            # Incompressible payloads are stored as-is
+            if len(compressed) < len(body):
+                body = compressed
+                compressor_id = self.compressor.format_id
+
+        header = (
+            _HEADER_FLAG
+            | (_RECORD_FLAG if record else 0)
+            | (self.serializer.format_id << _SERIALIZER_SHIFT)
+            | compressor_id
+        )
+        return bytes((header,)) + body
+
+    def decode(self, payload: bytes | str) -> Any:
+        """Decode a payload in an allowed format, or unframed legacy JSON.
+
+        Args:
+            payload: Raw value from Redis
+
+        Returns:
+            Decoded value
+
+        Raises:
+            ValueError: If the header names an unknown format or one this
+                codec does not allow
+        """
+        return self.decode_frame(payload)[0]
+
+    def decode_frame(self, payload: bytes | str) -> tuple[Any, bool]:
+        """Decode a payload and report whether it was encoded as a record.
+
+        The record flag lives in the header, outside the value, so no value
+        a cached function returns can be mistaken for a record.
+
+        Args:
+            payload: Raw value from Redis
+
+        Returns:
+            Tuple of (decoded value, record flag)
+
+        Raises:
+            ValueError: If the header names an unknown format or one this
+                codec does not allow
+        """
+        if isinstance(payload, str):
+            return json.loads(payload), False
+        if not payload or not payload[0] & _HEADER_FLAG:
+            return json.loads(payload), False
+
+        header = payload[0]
+        # Checked before decompressing, so rejected payloads cost nothing
+        serializer_id = (header >> _SERIALIZER_SHIFT) & _SERIALIZER_MASK
+        if serializer_id not in self.allowed_ids:
+            msg = f"Cache serializer id {serializer_id} is not allowed by this codec"
+            raise ValueError(msg)
+
+        body = payload[1:]
+        compressor_id = header & _COMPRESSOR_MASK
+        if compressor_id:
+            body = _compressor_for_id(compressor_id).decompress(body)
+        value = _serializer_for_id(serializer_id).loads(body)
+        return value, bool(header & _RECORD_FLAG)
+
+
+def compress_payload(payload: bytes, compression: Compressor | str) -> bytes:
+    """Compress an already encoded payload, keeping its serializer.
+
+    Used to shrink entries after the fact (e.g. only once they exceed a
+    size limit) without decoding and re-serializing the value.
+
+    Args:
+        payload: Payload produced by :meth:`CacheCodec.encode`
+        compression: Compressor instance or name ("zlib", "zstd", "lz4")
+
+    Returns:
+        The compressed payload, or ``payload`` unchanged if it is already
+        compressed, unframed legacy JSON, or does not get any smaller
+
+    Raises:
+        ValueError: If the compressor name is unknown
+        ImportError: If the compressor's library is not installed
+    """
+    if not payload or not payload[0] & _HEADER_FLAG or payload[0] & _COMPRESSOR_MASK:
+        return payload
+    if isinstance(compression, str):
+        if compression not in _COMPRESSOR_TYPES:
+            msg = f"Unknown cache compressor: {compression}"
+            raise ValueError(msg)
+        compression = _compressor_for_id(_COMPRESSOR_TYPES[compression].format_id)
+
+    body = compression.compress(payload[1:])
+    if len(body) + 1 >= len(payload):
+        return payload
+    _compressors_by_id.setdefault(compression.format_id, compression)
+    return bytes((payload[0] | compression.format_id,)) + body
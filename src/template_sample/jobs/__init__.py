@@ -3,8 +3,8 @@
 This package provides background task processing using ARQ (async Redis queue).
 
 Usage:
-    # Start worker
-    arq template_sample.jobs.worker.WorkerSettings
+    # Start a worker for every queue in WorkerSettings.queues
+    python -m template_sample.jobs.worker
 
     # Enqueue tasks from your FastAPI app
     from template_sample.jobs.worker import enqueue_task
@@ -15,6 +15,13 @@ Usage:
         user_id="123",
         data={"action": "export"}
     )
+
+    # Fan out many jobs of one task, one round trip per batch
+    from template_sample.jobs.worker import enqueue_many
+
+    job_ids = await enqueue_many(
+        redis, "send_email_task", ({"recipient": r, ...} for r in recipients)
+    )
 """
 
 from __future__ import annotations
@@ -0,0 +1,292 @@
+"""Micro-batch execution for small, high-volume ARQ tasks.
+
+ARQ runs one coroutine per job. For tiny jobs such as sending one email,
+the fixed cost of the handler (opening a provider connection, an HTTP
+request, logging) dominates the useful work. A task declared with
+``batchable`` is still enqueued and tracked per job, but the jobs a worker
+is running concurrently are collected into batches of up to ``max_size``
+calls (or whatever arrived within ``max_wait_ms`` of the first) and passed
+to one handler call. Each job then returns its own entry of the handler's
+result, so ARQ stores results, retries and reports failures per job.
+
+Jobs waiting for their batch hold a worker slot, so a batch can never be
+larger than the worker's ``max_jobs``; keep ``max_size`` below ``max_jobs``
+so other jobs still get slots while a batch fills.
+
+Example:
+    >>> @batchable(max_size=50, max_wait_ms=20)
+    ... async def send_sms_task(ctx, calls: list[BatchCall]) -> list[dict]:
+    ...     messages = [call.bind("number", "text") for call in calls]
+    ...     return await sms_provider.send_many(messages)
+    >>>
+    >>> # Enqueued one message per job, exactly as an unbatched task
+    >>> await redis.enqueue_job("send_sms_task", "+15550100", "Hi")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from template_sample.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+
+    BatchHandler = Callable[
+        [dict[str, Any], list["BatchCall"]], Awaitable[Sequence[Any]]
+    ]
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchCall:
+    """Arguments and job identity of one invocation in a batch."""
+
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    job_id: str | None = None
+    job_try: int | None = None
+
+    def bind(self, *names: str) -> dict[str, Any]:
+        """Map positional and keyword arguments onto parameter names.
+
+        Args:
+            *names: Parameter names of the per-job signature, in order
+
+        Returns:
+            ``{name: value}`` for every name
+
+        Raises:
+            TypeError: If arguments are missing, unexpected or given twice
+        """
+        if len(self.args) > len(names):
+            msg = f"expected at most {len(names)} arguments, got {len(self.args)}"
+            raise TypeError(msg)
+        bound = dict(zip(names, self.args, strict=False))
+        for name, value in self.kwargs.items():
+            if name not in names:
+                msg = f"unexpected argument {name!r}"
+                raise TypeError(msg)
+            if name in bound:
+                msg = f"argument {name!r} given twice"
+                raise TypeError(msg)
+            bound[name] = value
+        missing = [name for name in names if name not in bound]
+        if missing:
+            msg = f"missing arguments: {', '.join(missing)}"
+            raise TypeError(msg)
+        return bound
+
+
+class MicroBatcher:
+    """Collects concurrent calls and runs them through one batch handler.
+
+    A batch is flushed as soon as it holds ``max_size`` calls, or
+    ``max_wait`` seconds after its first call arrived. Calls whose caller
+    was cancelled before the flush (e.g. a job timeout) are dropped. A
+    caller cancelled after the flush waits for the batch and returns its
+    result instead, since the handler may already have acted on the call
+    and a retried job would repeat it (e.g. send an email twice).
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        *,
+        max_size: int = 100,
+        max_wait: float = 0.05,
+        name: str | None = None,
+    ) -> None:
+        """Initialize an empty batcher.
+
+        Args:
+            handler: ``async (ctx, calls) -> results`` with one result per
+                call, in order; an exception instance as a result fails only
+                that call
+            max_size: Calls per batch
+            max_wait: Seconds to wait for a batch to fill
+            name: Name used in logs (default: the handler's name)
+
+        Raises:
+            ValueError: If max_size is less than 1 or max_wait is negative
+        """
+        if max_size < 1:
+            msg = "max_size must be at least 1"
+            raise ValueError(msg)
+        if max_wait < 0:
+            msg = "max_wait must not be negative"
+            raise ValueError(msg)
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.name = name or getattr(handler, "__name__", "batch")
+        self._pending: list[tuple[BatchCall, asyncio.Future[Any]]] = []
+        self._ctx: dict[str, Any] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        """Get the number of calls waiting for a flush."""
+        return len(self._pending)
+
+    async def submit(self, ctx: dict[str, Any], call: BatchCall) -> Any:
+        """Add a call to the current batch and wait for its result.
+
+        Args:
+            ctx: ARQ job context; the first call's context is passed to the
+                handler for the whole batch
+            call: Arguments of this invocation
+
+        Returns:
+            This call's entry of the handler's results, also when the caller
+            is cancelled after the batch was flushed
+
+        Raises:
+            Exception: The handler's exception, or this call's result when
+                it is an exception instance
+            asyncio.CancelledError: If the caller is cancelled before the
+                flush
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        if not self._pending:
+            self._ctx = ctx
+        self._pending.append((call, future))
+        if len(self._pending) >= self.max_size:
+            self.flush("full")
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush, "timeout")
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if any(queued is future for _, queued in self._pending):
+                future.cancel()
+                raise
+            logger.info("job_batch_cancel_deferred", task=self.name, job_id=call.job_id)
+            return await future
+
+    def flush(self, reason: str = "manual") -> None:
+        """Start running the pending calls as one batch, without waiting.
+
+        Args:
+            reason: Why the batch was flushed, for logs
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # From here on a call is part of the batch, even if its caller is
+        # cancelled before the handler starts
+        live = [(call, future) for call, future in batch if not future.done()]
+        if not live:
+            return
+        task = asyncio.ensure_future(self._run(self._ctx, live, reason))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def drain(self) -> None:
+        """Flush pending calls and wait for every running batch."""
+        self.flush("drain")
+        while self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _run(
+        self,
+        ctx: dict[str, Any],
+        live: list[tuple[BatchCall, asyncio.Future[Any]]],
+        reason: str,
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            results = await self.handler(ctx, [call for call, _ in live])
+        except asyncio.CancelledError:
+            for _, future in live:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001 - re-raised by every job
+            self._fail(live, exc)
+            return
+        if len(results) != len(live):
+            msg = (
+                f"batch handler {self.name} returned {len(results)} results "
+                f"for {len(live)} calls"
+            )
+            self._fail(live, RuntimeError(msg))
+            return
+
+        failed = 0
+        for (_, future), result in zip(live, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                failed += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        logger.debug(
+            "job_batch_completed",
+            task=self.name,
+            size=len(live),
+            failed=failed,
+            reason=reason,
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+    def _fail(
+        self, live: list[tuple[BatchCall, asyncio.Future[Any]]], exc: Exception
+    ) -> None:
+        logger.warning(
+            "job_batch_failed", task=self.name, size=len(live), error=str(exc)
+        )
+        for _, future in live:
+            if not future.done():
+                future.set_exception(exc)
+
+
+def batchable(
+    max_size: int = 100, max_wait_ms: float = 50.0
+) -> Callable[[BatchHandler], Callable[..., Awaitable[Any]]]:
+    """Declare an ARQ task whose concurrent jobs run in micro-batches.
+
+    The decorated batch handler becomes a regular ARQ task with the same
+    name: each job passes its arguments to a shared ``MicroBatcher`` and
+    returns its own result. Register it in ``WorkerSettings.functions`` like
+    any other task; the batcher is available as the task's ``batcher``
+    attribute.
+
+    Args:
+        max_size: Calls per batch
+        max_wait_ms: Milliseconds to wait for a batch to fill
+
+    Returns:
+        Decorator turning ``async (ctx, calls) -> results`` into an ARQ task
+    """
+
+    def decorator(handler: BatchHandler) -> Callable[..., Awaitable[Any]]:
+        batcher = MicroBatcher(
+            handler,
+            max_size=max_size,
+            max_wait=max_wait_ms / 1000,
+            name=handler.__name__,
+        )
+
+        @functools.wraps(handler)
+        async def job(ctx: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+            call = BatchCall(
+                args=args,
+                kwargs=kwargs,
+                job_id=ctx.get("job_id"),
+                job_try=ctx.get("job_try"),
+            )
+            return await batcher.submit(ctx, call)
+
+        job.batcher = batcher  # type: ignore[attr-defined]
+        return job
+
+    return decorator
@@ -0,0 +1,361 @@
+"""Streaming, resumable processing of large newline-delimited files.
+
+Loading an upload with ``f.read()`` needs memory for the whole file. The
+pipeline here keeps memory flat regardless of file size:
+
+- Parse: the file is read in ``chunk_size`` pieces and split into records
+  by generators (``iter_records``, ``iter_batches``), in a thread so the
+  event loop stays free.
+- Transform: each batch goes through a synchronous ``transform``, in a
+  ``ProcessPool`` when one is given so CPU-bound parsing uses other cores.
+- Write: an async ``write`` stores each transformed batch, in file order.
+
+The stages are connected by bounded queues, so a slow writer stalls the
+transforms and the reader instead of letting batches pile up: at most
+about ``2 * queue_size + 3`` batches exist at once. After each written
+batch the byte offset just past it is checkpointed (``OffsetCheckpoint``),
+so a retried job resumes at the first unwritten record rather than at the
+start of the file. Delivery is at-least-once: a batch written just before
+a crash is written again on retry, so ``write`` should be idempotent.
+
+Example:
+    >>> result = await run_file_pipeline(
+    ...     "/uploads/users.csv",
+    ...     transform=parse_rows,  # list[bytes] -> list[User], module-level
+    ...     write=save_users,  # async (users, batch) -> None
+    ...     checkpoint=OffsetCheckpoint(redis, "upload:checkpoint:42"),
+    ...     pool=get_process_pool(),
+    ... )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from template_sample.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator, Iterator
+
+    from redis.asyncio import Redis
+
+    from template_sample.jobs.process_pool import ProcessPool
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def iter_records(
+    path: str | os.PathLike[str],
+    start: int = 0,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    quote: bytes | None = None,
+) -> Iterator[tuple[int, bytes]]:
+    """Read newline-delimited records from a byte offset, chunk by chunk.
+
+    Line endings (LF or CRLF) are stripped and blank lines are
+    skipped. A record may span chunks; only the unfinished record is kept
+    between reads. With ``quote``, a newline between an odd and an even
+    quote character belongs to the record, as in a quoted CSV field, so
+    the yielded offsets never fall inside one.
+
+    Args:
+        path: File to read
+        start: Byte offset of the first record (0, or an offset yielded
+            earlier)
+        chunk_size: Bytes per read
+        quote: Character that quotes fields which may contain newlines,
+            e.g. ``b'"'`` for CSV (default: every newline ends a record)
+
+    Yields:
+        ``(end, record)``, where ``end`` is the byte offset just past the
+        record: resuming from it starts at the next record
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        # Pieces of the unfinished record, and whether it ends in quotes
+        parts: list[bytes] = []
+        quoted = False
+        while chunk := f.read(chunk_size):
+            *lines, tail = chunk.split(b"\n")
+            for line in lines:
+                parts.append(line)
+                if quote and line.count(quote) % 2:
+                    quoted = not quoted
+                if quoted:
+                    parts.append(b"\n")
+                    continue
+                raw = b"".join(parts)
+                parts = []
+                offset += len(raw) + 1
+                if record := raw.rstrip(b"\r"):
+                    yield offset, record
+            parts.append(tail)
+            if quote and tail.count(quote) % 2:
+                quoted = not quoted
+        raw = b"".join(parts)
+        if record := raw.rstrip(b"\r"):
+            yield offset + len(raw), record
+
+
+@dataclass(frozen=True)
+class RecordBatch:
+    """Consecutive records and the byte range they were read from."""
+
+    start: int
+    end: int
+    records: list[bytes]
+
+
+def iter_batches(
+    path: str | os.PathLike[str],
+    start: int = 0,
+    *,
+    batch_size: int = 1000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    quote: bytes | None = None,
+) -> Iterator[RecordBatch]:
+    """Group ``iter_records`` into batches of up to ``batch_size`` records.
+
+    Args:
+        path: File to read
+        start: Byte offset of the first record
+        batch_size: Records per batch
+        chunk_size: Bytes per read
+        quote: Character that quotes fields which may contain newlines
+
+    Yields:
+        Batches in file order
+    """
+    records: list[bytes] = []
+    batch_start = end = start
+    with contextlib.closing(
+        iter_records(path, start, chunk_size=chunk_size, quote=quote)
+    ) as lines:
+        for end, record in lines:
+            records.append(record)
+            if len(records) >= batch_size:
+                yield RecordBatch(batch_start, end, records)
+                records = []
+                batch_start = end
+    if records:
+        yield RecordBatch(batch_start, end, records)
+
+
+class OffsetCheckpoint:
+    """Progress of one file in Redis: resume offset and records done.
+
+    The file size is stored alongside; if the file at the path has a
+    different size when loading, the checkpoint is ignored.
+    """
+
+    def __init__(self, redis: Redis, key: str, *, ttl: int = 86400) -> None:
+        """Bind the checkpoint to a key.
+
+        Args:
+            redis: Redis connection (e.g. the ARQ pool in ``ctx["redis"]``)
+            key: Hash key for this file, e.g. ``upload:checkpoint:<file id>``
+            ttl: Seconds to keep an abandoned checkpoint
+        """
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+
+    async def load(self, size: int) -> tuple[int, int]:
+        """Get where to resume.
+
+        Args:
+            size: Current size of the file in bytes
+
+        Returns:
+            ``(offset, records)`` already processed, ``(0, 0)`` if none
+        """
+        saved = {
+            (name.decode() if isinstance(name, bytes) else name): int(value)
+            for name, value in (await self.redis.hgetall(self.key)).items()
+        }
+        if not saved:
+            return 0, 0
+        if saved.get("size") != size or saved.get("offset", 0) > size:
+            logger.warning(
+                "file_checkpoint_ignored", key=self.key, saved=saved, size=size
+            )
+            return 0, 0
+        return saved.get("offset", 0), saved.get("records", 0)
+
+    async def save(self, offset: int, records: int, size: int) -> None:
+        """Record that everything before ``offset`` has been written."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                self.key, mapping={"offset": offset, "records": records, "size": size}
+            )
+            pipe.expire(self.key, self.ttl)
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        """Forget the progress, once the file is done."""
+        await self.redis.delete(self.key)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one ``run_file_pipeline`` call."""
+
+    # Records written in total, including before a resume
+    records: int
+    # Batches written by this run
+    batches: int
+    # Offset this run started from (0 unless resumed)
+    resumed_from: int
+    # Offset just past the last record written
+    end: int
+
+
+async def run_file_pipeline(
+    path: str | os.PathLike[str],
+    transform: Callable[[list[bytes]], T],
+    write: Callable[[T, RecordBatch], Awaitable[None]],
+    *,
+    checkpoint: OffsetCheckpoint | None = None,
+    pool: ProcessPool | None = None,
+    batch_size: int = 1000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    quote: bytes | None = None,
+    queue_size: int = 4,
+) -> PipelineResult:
+    """Stream a file through parse, transform and write stages.
+
+    Args:
+        path: Newline-delimited file to process
+        transform: ``(records) -> result`` for one batch of raw records; must
+            be a module-level function when ``pool`` is given
+        write: ``async (result, batch) -> None``, called in file order
+        checkpoint: Where to load and save progress (default: none, always
+            start at the beginning)
+        pool: Process pool to run ``transform`` in (default: run it on the
+            event loop, for cheap transforms)
+        batch_size: Records per batch
+        chunk_size: Bytes per read
+        quote: Character that quotes fields which may contain newlines,
+            e.g. ``b'"'`` for CSV (see ``iter_records``)
+        queue_size: Batches buffered between stages, and batches
+            transformed concurrently
+
+    Returns:
+        Records and batches written, and the offsets covered
+
+    Raises:
+        Exception: The first error from any stage; the other stages are
+            cancelled and the checkpoint keeps the last written offset
+    """
+    size = (await asyncio.to_thread(os.stat, path)).st_size
+    start, records = await checkpoint.load(size) if checkpoint else (0, 0)
+    if start:
+        logger.info("file_pipeline_resuming", path=str(path), offset=start)
+
+    parsed: asyncio.Queue[RecordBatch | None] = asyncio.Queue(queue_size)
+    # (batch, its running transform), in file order
+    transformed: asyncio.Queue[tuple[RecordBatch, asyncio.Future[T]] | None] = (
+        asyncio.Queue(queue_size)
+    )
+    result = PipelineResult(records=records, batches=0, resumed_from=start, end=start)
+
+    async def run_transform(batch: RecordBatch) -> T:
+        if pool is None:
+            return transform(batch.records)
+        return await pool.run(transform, batch.records)
+
+    async def parse_stage() -> None:
+        batches = iter_batches(
+            path, start, batch_size=batch_size, chunk_size=chunk_size, quote=quote
+        )
+        await _read_batches(batches, parsed)
+
+    async def transform_stage() -> None:
+        while (batch := await parsed.get()) is not None:
+            # Queued as a running task, so up to queue_size batches are
+            # transformed concurrently while the writer keeps file order
+            task = asyncio.ensure_future(run_transform(batch))
+            try:
+                await transformed.put((batch, task))
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+        await transformed.put(None)
+
+    async def write_stage() -> None:
+        while (item := await transformed.get()) is not None:
+            batch, transformed_batch = item
+            await write(await transformed_batch, batch)
+            result.records += len(batch.records)
+            result.batches += 1
+            result.end = batch.end
+            if checkpoint:
+                await checkpoint.save(batch.end, result.records, size)
+
+    stages = [
+        asyncio.ensure_future(stage())
+        for stage in (parse_stage, transform_stage, write_stage)
+    ]
+    try:
+        done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        for stage in done:
+            stage.result()
+    finally:
+        await _cancel(stages, transformed)
+
+    if checkpoint:
+        await checkpoint.clear()
+    logger.info(
+        "file_pipeline_completed",
+        path=str(path),
+        records=result.records,
+        batches=result.batches,
+        resumed_from=start,
+    )
+    return result
+
+
+async def _read_batches(
+    batches: Generator[RecordBatch, None, None],
+    queue: asyncio.Queue[RecordBatch | None],
+) -> None:
+    """Queue batches read in a thread, then ``None``; always close the reader."""
+    read: asyncio.Future[RecordBatch | None] | None = None
+    try:
+        while True:
+            # Shielded, since cancelling can't stop the thread: the
+            # generator is closed (and the file with it) once it returns
+            read = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+            if (batch := await asyncio.shield(read)) is None:
+                break
+            await queue.put(batch)
+        await queue.put(None)
+    finally:
+        if read is not None and not read.done():
+            await asyncio.wait([read])
+        batches.close()
+
+
+async def _cancel(
+    stages: list[asyncio.Future[None]], queue: asyncio.Queue[Any]
+) -> None:
+    """Stop unfinished stages and transforms still queued for the writer."""
+    pending = [stage for stage in stages if not stage.done()]
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not None:
+            pending.append(item[1])
+    for future in pending:
+        future.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,293 @@
+"""Process-pool offload for CPU-bound job functions.
+
+ARQ runs every job on one event loop, so a handler that parses or
+transforms data for a few seconds stalls all other jobs in the worker. The
+``ProcessPool`` here runs such work in a ``ProcessPoolExecutor`` instead:
+
+- Warm workers: ``warm()`` starts every child process and imports the
+  ``preload`` modules up front, so the first jobs don't pay for spawning
+  and imports.
+- Recycling: with ``max_tasks_per_child`` each child is replaced after that
+  many tasks, bounding leaks in native or third-party parsing code
+  (Python 3.11+; ignored with a warning on 3.10).
+- Shared startup context: ``initializer(context, *initargs)`` runs once in
+  every child and fills the dict returned by ``get_process_context()``,
+  e.g. with loaded configuration or models.
+- A child that dies (segfault, OOM kill) breaks a ``ProcessPoolExecutor``
+  for good; the pool replaces the executor and the failed job is retried
+  by ARQ like any other error.
+
+Functions must be picklable by reference (defined at module level), and so
+must their arguments and results. The ARQ ``ctx`` is never sent: it holds
+connections that cannot cross processes.
+
+Example:
+    >>> @run_in_process
+    ... def resize_image(path: str, width: int) -> str:
+    ...     return thumbnail(path, width)  # CPU-bound, runs in a child
+    >>>
+    >>> class WorkerSettings:
+    ...     functions = [resize_image]  # an ARQ task: (ctx, path, width)
+    >>>
+    >>> # Or offload part of an async task
+    >>> digest = await get_process_pool().run(hash_file, path)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from template_sample.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+    from multiprocessing.synchronize import Barrier
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Context filled by the initializer, in each child process
+_process_context: dict[str, Any] = {}
+
+# Rendezvous for warm-up tasks, in each child process
+_warm_barrier: Barrier | None = None
+
+# "module:qualname" -> function, for functions decorated with run_in_process
+_registry: dict[str, Callable[..., Any]] = {}
+
+
+def get_process_context() -> dict[str, Any]:
+    """Get the context the pool initializer set up in this child process."""
+    return _process_context
+
+
+def _init_child(
+    barrier: Barrier,
+    preload: Sequence[str],
+    initializer: Callable[..., None] | None,
+    initargs: tuple[Any, ...],
+) -> None:
+    """Prepare a child process: import modules and run the initializer."""
+    global _warm_barrier
+    _warm_barrier = barrier
+    _process_context["pid"] = os.getpid()
+    for module in preload:
+        importlib.import_module(module)
+    if initializer is not None:
+        initializer(_process_context, *initargs)
+
+
+def _warm_up(timeout: float) -> int:
+    # Block until every child holds a warm-up task, so that each one runs
+    # in a different process instead of the first child taking them all
+    if _warm_barrier is not None:
+        with contextlib.suppress(threading.BrokenBarrierError):
+            _warm_barrier.wait(timeout)
+    return os.getpid()
+
+
+def _call_registered(
+    module: str, key: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    """Run a run_in_process function by name, importing its module if needed."""
+    if key not in _registry:
+        importlib.import_module(module)
+    return _registry[key](*args, **kwargs)
+
+
+class ProcessPool:
+    """A lazily started ``ProcessPoolExecutor`` for CPU-bound job code."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        max_tasks_per_child: int | None = None,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple[Any, ...] = (),
+        preload: Sequence[str] = (),
+        start_method: str = "spawn",
+    ) -> None:
+        """Configure the pool; no process starts until it is used.
+
+        Args:
+            max_workers: Child processes (default: ``os.cpu_count()``)
+            max_tasks_per_child: Replace a child after this many tasks
+                (default: never); Python 3.11+
+            initializer: ``(context, *initargs) -> None`` run once per child
+                to fill ``get_process_context()``; must be picklable
+            initargs: Extra arguments for the initializer
+            preload: Modules imported by each child at startup
+            start_method: multiprocessing start method; "spawn" avoids
+                forking a process that runs an event loop and threads
+
+        Raises:
+            ValueError: If max_workers or max_tasks_per_child is less than 1
+        """
+        if max_workers is not None and max_workers < 1:
+            msg = "max_workers must be at least 1"
+            raise ValueError(msg)
+        if max_tasks_per_child is not None and max_tasks_per_child < 1:
+            msg = "max_tasks_per_child must be at least 1"
+            raise ValueError(msg)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self.initializer = initializer
+        self.initargs = initargs
+        self.preload = tuple(preload)
+        self.start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._barrier: Barrier | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Get the executor, creating it on first use."""
+        if self._executor is None:
+            options: dict[str, Any] = {}
+            if self.max_tasks_per_child is not None:
+                if sys.version_info >= (3, 11):  # noqa: UP036 - 3.10 is supported
+                    options["max_tasks_per_child"] = self.max_tasks_per_child
+                else:
+                    logger.warning(
+                        "process_pool_recycling_unsupported",
+                        max_tasks_per_child=self.max_tasks_per_child,
+                    )
+            context = multiprocessing.get_context(self.start_method)
+            self._barrier = context.Barrier(self.max_workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_child,
+                initargs=(self._barrier, self.preload, self.initializer, self.initargs),
+                **options,
+            )
+        return self._executor
+
+    async def warm(self, join_timeout: float = 60.0) -> int:
+        """Start every child process and run its initializer now.
+
+        Meant for worker startup: each child holds its warm-up task until all
+        of them have one, so while a child is busy with a long job the others
+        idle for up to ``join_timeout``.
+
+        Args:
+            join_timeout: Seconds to wait for all children
+
+        Returns:
+            Number of distinct child processes that answered
+        """
+        executor = self.executor
+        if self._barrier is not None and self._barrier.broken:
+            self._barrier.reset()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _warm_up, join_timeout)
+                for _ in range(self.max_workers)
+            )
+        )
+        logger.info("process_pool_warmed", processes=len(set(pids)))
+        return len(set(pids))
+
+    async def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Run a function in a child process and wait for its result.
+
+        Args:
+            fn: Module-level function
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's result
+
+        Raises:
+            BrokenProcessPool: If a child died while running; the executor
+                is replaced, so a retry runs on fresh processes
+        """
+        executor = self.executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, functools.partial(fn, *args, **kwargs)
+            )
+        except BrokenProcessPool:
+            logger.exception("process_pool_broken", function=fn.__name__)
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the child processes, cancelling work that has not started.
+
+        Args:
+            wait: Block until running work finishes and children exit
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_process_pool: ProcessPool | None = None
+
+
+def get_process_pool() -> ProcessPool:
+    """Get the process-wide pool, creating a default one if needed."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPool()
+    return _process_pool
+
+
+def configure_process_pool(**options: Any) -> ProcessPool:
+    """Replace the process-wide pool, shutting the previous one down.
+
+    Args:
+        **options: ``ProcessPool`` arguments
+
+    Returns:
+        The new pool
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False)
+    _process_pool = ProcessPool(**options)
+    return _process_pool
+
+
+def run_in_process(fn: Callable[P, R]) -> Callable[..., Awaitable[R]]:
+    """Turn a synchronous, CPU-bound function into an ARQ task run in the pool.
+
+    The task keeps the function's name and takes ``(ctx, *args, **kwargs)``;
+    ``ctx`` stays in the worker and the function receives the rest. The
+    function is looked up by name in the child, so it must be defined at
+    module level.
+
+    Args:
+        fn: Function to run in the process pool
+
+    Returns:
+        Async ARQ task function
+    """
+    key = f"{fn.__module__}:{fn.__qualname__}"
+    _registry[key] = fn
+
+    @functools.wraps(fn)
+    async def job(_ctx: dict[str, Any], *args: Any, **kwargs: Any) -> R:
+        return await get_process_pool().run(
+            _call_registered, fn.__module__, key, args, kwargs
+        )
+
+    return job
@@ -0,0 +1,555 @@
+"""Named priority queues with weighted fair scheduling for ARQ.
+
+An ARQ worker consumes a single queue, so one flood of slow jobs delays
+everything behind it. ``MultiQueueWorker`` runs one ARQ worker per named
+queue inside one process and makes them share ``max_jobs`` slots through a
+``WeightedSemaphore``: while slots are free any queue may take one, and
+when queues compete, freed slots go to the waiting queues by smooth
+weighted round-robin (a queue of weight 6 gets six slots for every one a
+queue of weight 1 gets). A queue can also be capped at ``max_jobs`` of the
+shared slots, so a backlog there never occupies the whole worker.
+
+Tasks are routed to a queue at enqueue time (``_queue_name``), e.g. with
+``WorkerSettings.task_queues`` and ``jobs.worker.queue_for`` once
+``settings.job_queue_routing`` is enabled. Every queue's worker registers
+all functions, so any job can run on any queue.
+
+Per queue, ``QueueMetrics`` records the depth (ZCARD, sampled
+periodically) and the wait between a job becoming due and starting.
+
+Example:
+    >>> class WorkerSettings:
+    ...     functions = [send_email_task, process_file_upload]
+    ...     queues = [
+    ...         QueueSpec("arq:queue:high", weight=6),
+    ...         QueueSpec("arq:queue"),
+    ...         QueueSpec("arq:queue:bulk", max_jobs=10),
+    ...     ]
+    ...     max_jobs = 50
+    >>> run_queues(WorkerSettings)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from arq.connections import create_pool
+from arq.worker import Worker, get_kwargs
+
+from template_sample.core.cache_metrics import Histogram
+from template_sample.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+    from types import TracebackType
+
+    from arq.connections import ArqRedis
+
+logger = get_logger(__name__)
+
+# Queue wait buckets in seconds (10 ms to 1 h)
+DEFAULT_WAIT_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+    3600.0,
+)
+
+
+@dataclass(frozen=True)
+class QueueSpec:
+    """A named queue and its share of the worker's job slots."""
+
+    name: str
+    weight: int = 1
+    # Most slots this queue may hold at once (None: no cap)
+    max_jobs: int | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the weight and cap.
+
+        Raises:
+            ValueError: If weight or max_jobs is less than 1
+        """
+        if self.weight < 1:
+            msg = f"queue {self.name!r}: weight must be at least 1"
+            raise ValueError(msg)
+        if self.max_jobs is not None and self.max_jobs < 1:
+            msg = f"queue {self.name!r}: max_jobs must be at least 1"
+            raise ValueError(msg)
+
+
+class WeightedSemaphore:
+    """Job slots shared by several queues, granted by weighted round-robin.
+
+    Each queue gets a view (``for_queue``) with the ``asyncio.Semaphore``
+    interface ARQ's worker uses for ``Worker.sem``. ARQ has no hook for
+    limiting job slots, so ``MultiQueueWorker`` replaces that attribute;
+    arq is pinned to the versions this was checked against.
+    """
+
+    def __init__(self, slots: int, queues: Sequence[QueueSpec]) -> None:
+        """Initialize with every slot free.
+
+        Args:
+            slots: Total concurrent jobs across all queues
+            queues: Queues sharing the slots; earlier queues win ties
+
+        Raises:
+            ValueError: If slots is less than 1 or no queues are given
+        """
+        if slots < 1:
+            msg = "slots must be at least 1"
+            raise ValueError(msg)
+        if not queues:
+            msg = "at least one queue is required"
+            raise ValueError(msg)
+        self.slots = slots
+        self._specs = {spec.name: spec for spec in queues}
+        self._free = slots
+        self._held = dict.fromkeys(self._specs, 0)
+        self._current = dict.fromkeys(self._specs, 0)
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {
+            name: deque() for name in self._specs
+        }
+
+    @property
+    def available(self) -> int:
+        """Get the number of free slots."""
+        return self._free
+
+    def held(self, queue: str) -> int:
+        """Get the number of slots a queue holds."""
+        return self._held[queue]
+
+    def for_queue(self, queue: str) -> QueueSlots:
+        """Get the semaphore view for one queue.
+
+        Raises:
+            KeyError: If the queue was not given to the constructor
+        """
+        if queue not in self._specs:
+            raise KeyError(queue)
+        return QueueSlots(self, queue)
+
+    async def acquire(self, queue: str) -> bool:
+        """Take a slot for a queue, waiting for its turn if none is free.
+
+        Returns:
+            True, like ``asyncio.Semaphore.acquire``
+        """
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[queue].append(future)
+        self._grant()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self.release(queue)
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters[queue].remove(future)
+            raise
+        return True
+
+    def release(self, queue: str) -> None:
+        """Return a queue's slot and grant free slots to waiting queues.
+
+        Raises:
+            ValueError: If the queue holds no slot
+        """
+        if self._held[queue] < 1:
+            msg = f"queue {queue!r} released more slots than it acquired"
+            raise ValueError(msg)
+        self._held[queue] -= 1
+        self._free += 1
+        self._grant()
+
+    def _can_take(self, queue: str) -> bool:
+        cap = self._specs[queue].max_jobs
+        return self._free > 0 and (cap is None or self._held[queue] < cap)
+
+    def _take(self, queue: str) -> None:
+        self._free -= 1
+        self._held[queue] += 1
+
+    def _grant(self) -> None:
+        while self._free > 0:
+            queue = self._next_queue()
+            if queue is None:
+                return
+            future = self._waiters[queue].popleft()
+            if future.done():
+                # Cancelled while waiting, not yet removed by its task
+                continue
+            self._take(queue)
+            future.set_result(None)
+
+    def _next_queue(self) -> str | None:
+        """Pick the next waiting queue by smooth weighted round-robin."""
+        candidates = [
+            name
+            for name, waiters in self._waiters.items()
+            if waiters and self._can_take(name)
+        ]
+        if not candidates:
+            return None
+        total = 0
+        for name in candidates:
+            self._current[name] += self._specs[name].weight
+            total += self._specs[name].weight
+        chosen = max(candidates, key=self._current.__getitem__)
+        self._current[chosen] -= total
+        return chosen
+
+
+class QueueSlots:
+    """One queue's view of a ``WeightedSemaphore``."""
+
+    def __init__(self, semaphore: WeightedSemaphore, queue: str) -> None:
+        """Bind the view to its queue."""
+        self.semaphore = semaphore
+        self.queue = queue
+
+    def locked(self) -> bool:
+        """Check whether acquire would have to wait."""
+        return not self.semaphore._can_take(self.queue)  # noqa: SLF001
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting for this queue's turn if needed."""
+        return await self.semaphore.acquire(self.queue)
+
+    def release(self) -> None:
+        """Return a slot."""
+        self.semaphore.release(self.queue)
+
+    async def __aenter__(self) -> None:
+        """Take a slot for the block."""
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Return the slot."""
+        self.release()
+
+
+class QueueMetrics:
+    """Per-queue depth, wait time and started-job counts.
+
+    Example:
+        >>> metrics = QueueMetrics()
+        >>> metrics.observe_wait("arq:queue", 0.25)
+        >>> metrics.snapshot()["arq:queue"]["started"]
+        1
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._depth: dict[str, int] = {}
+        self._wait: dict[str, Histogram] = {}
+
+    def set_depth(self, queue: str, depth: int) -> None:
+        """Record the number of jobs in a queue."""
+        self._depth[queue] = depth
+
+    def observe_wait(self, queue: str, seconds: float) -> None:
+        """Record how long a job waited between becoming due and starting."""
+        histogram = self._wait.get(queue)
+        if histogram is None:
+            histogram = self._wait[queue] = Histogram(DEFAULT_WAIT_BUCKETS)
+        histogram.observe(max(seconds, 0.0))
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        self._depth.clear()
+        self._wait.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Summarize recorded values per queue.
+
+        Returns:
+            ``{queue: {"depth": n, "started": n, "wait_seconds_sum": x}}``
+            for every queue seen
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for queue, depth in self._depth.items():
+            result.setdefault(queue, {})["depth"] = depth
+        for queue, histogram in self._wait.items():
+            entry = result.setdefault(queue, {})
+            entry["started"] = histogram.count
+            entry["wait_seconds_sum"] = histogram.sum
+        return result
+
+    def render_prometheus(self, namespace: str = "jobs") -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            namespace: Metric name prefix
+
+        Returns:
+            Exposition text (``text/plain; version=0.0.4``)
+        """
+        depth = f"{namespace}_queue_depth"
+        wait = f"{namespace}_queue_wait_seconds"
+        lines = [
+            f"# HELP {depth} Jobs in the queue, including deferred and running",
+            f"# TYPE {depth} gauge",
+        ]
+        lines += [
+            f'{depth}{{queue="{queue}"}} {value}'
+            for queue, value in sorted(self._depth.items())
+        ]
+        lines += [
+            f"# HELP {wait} Time from a job becoming due to it starting",
+            f"# TYPE {wait} histogram",
+        ]
+        for queue, histogram in sorted(self._wait.items()):
+            bounds = [*map(str, histogram.buckets), "+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative(), strict=True):
+                lines.append(f'{wait}_bucket{{queue="{queue}",le="{bound}"}} {count}')
+            lines += [
+                f'{wait}_sum{{queue="{queue}"}} {histogram.sum!r}',
+                f'{wait}_count{{queue="{queue}"}} {histogram.count}',
+            ]
+        return "\n".join(lines) + "\n"
+
+
+_queue_metrics = QueueMetrics()
+
+
+def get_queue_metrics() -> QueueMetrics:
+    """Get the process-wide queue metrics."""
+    return _queue_metrics
+
+
+async def sample_queue_depths(
+    redis: ArqRedis, queues: Sequence[str], metrics: QueueMetrics | None = None
+) -> dict[str, int]:
+    """Read the depth of each queue in one round trip and record it.
+
+    Args:
+        redis: ARQ Redis connection
+        queues: Queue names
+        metrics: Where to record (default: the process-wide metrics)
+
+    Returns:
+        ``{queue: depth}``
+    """
+    metrics = metrics or _queue_metrics
+    async with redis.pipeline(transaction=False) as pipe:
+        for queue in queues:
+            pipe.zcard(queue)
+        depths = dict(zip(queues, await pipe.execute(), strict=True))
+    for queue, depth in depths.items():
+        metrics.set_depth(queue, depth)
+    return depths
+
+
+class MultiQueueWorker:
+    """Runs one ARQ worker per queue in a single process with shared slots.
+
+    Settings are read like ARQ's ``create_worker``, plus ``queues`` (a list
+    of ``QueueSpec``) and ``queue_metrics_interval`` (seconds between depth
+    samples). ``max_jobs`` is the total across queues. Cron jobs are only
+    scheduled by the first queue's worker, and ``on_startup``/``on_shutdown``
+    run once for the process with a context shared by every queue.
+    """
+
+    def __init__(
+        self,
+        settings_cls: Any,
+        *,
+        redis_pool: ArqRedis | None = None,
+        metrics: QueueMetrics | None = None,
+    ) -> None:
+        """Read the settings; workers are created by ``start``.
+
+        Args:
+            settings_cls: WorkerSettings class (or dict)
+            redis_pool: Connection to use instead of ``redis_settings``
+            metrics: Where to record queue metrics (default: process-wide)
+
+        Raises:
+            ValueError: If the settings define no queues or duplicate names
+        """
+        self.settings = settings_cls
+        self.queues: list[QueueSpec] = list(_setting(settings_cls, "queues", []))
+        if not self.queues:
+            msg = "settings must define at least one QueueSpec in 'queues'"
+            raise ValueError(msg)
+        if len({spec.name for spec in self.queues}) != len(self.queues):
+            msg = "queue names must be unique"
+            raise ValueError(msg)
+        self.max_jobs = int(_setting(settings_cls, "max_jobs", 10))
+        self.metrics_interval = float(
+            _setting(settings_cls, "queue_metrics_interval", 10.0)
+        )
+        self.metrics = metrics or _queue_metrics
+        self.semaphore = WeightedSemaphore(self.max_jobs, self.queues)
+        self.ctx: dict[str, Any] = {}
+        self.workers: list[Worker] = []
+        self._pool = redis_pool
+
+    @property
+    def pool(self) -> ArqRedis:
+        """Get the Redis connection shared by the workers.
+
+        Raises:
+            RuntimeError: If the worker has not been started
+        """
+        if self._pool is None:
+            msg = "MultiQueueWorker is not started"
+            raise RuntimeError(msg)
+        return self._pool
+
+    async def start(self) -> None:
+        """Connect, run ``on_startup`` and create one worker per queue.
+
+        Raises:
+            RuntimeError: If the installed arq no longer limits jobs through
+                ``Worker.sem``
+        """
+        if self._pool is None:
+            self._pool = await create_pool(
+                _setting(self.settings, "redis_settings", None),
+                job_serializer=_setting(self.settings, "job_serializer", None),
+                job_deserializer=_setting(self.settings, "job_deserializer", None),
+                default_queue_name=self.queues[0].name,
+            )
+        self.ctx["redis"] = self._pool
+        on_startup = _setting(self.settings, "on_startup", None)
+        if on_startup:
+            await on_startup(self.ctx)
+
+        kwargs = get_kwargs(self.settings)
+        for key in (
+            "on_startup",
+            "on_shutdown",
+            "redis_settings",
+            "queue_name",
+            "health_check_key",
+        ):
+            kwargs.pop(key, None)
+        cron_jobs = kwargs.pop("cron_jobs", None)
+        on_job_start = kwargs.pop("on_job_start", None)
+        self.workers = []
+        for index, spec in enumerate(self.queues):
+            worker = Worker(
+                **kwargs,
+                queue_name=spec.name,
+                redis_pool=self._pool,
+                cron_jobs=cron_jobs if index == 0 else None,
+                on_job_start=self._job_start_hook(spec.name, on_job_start),
+                handle_signals=False,
+                ctx=self.ctx,
+            )
+            if not isinstance(getattr(worker, "sem", None), asyncio.Semaphore):
+                msg = "arq.Worker has no 'sem' semaphore to share job slots through"
+                raise RuntimeError(msg)  # noqa: TRY004 - unsupported arq version
+            worker.sem = self.semaphore.for_queue(spec.name)  # type: ignore[assignment]
+            self.workers.append(worker)
+        logger.info(
+            "multi_queue_worker_started",
+            queues={spec.name: spec.weight for spec in self.queues},
+            max_jobs=self.max_jobs,
+        )
+
+    async def main(self) -> None:
+        """Start, poll every queue and sample depths until cancelled."""
+        await self.start()
+        try:
+            await asyncio.gather(
+                *(worker.main() for worker in self.workers),
+                self._sample_depths_forever(),
+            )
+        finally:
+            await self.close()
+
+    def run(self) -> None:
+        """Run until SIGINT or SIGTERM, like ``arq.Worker.run``."""
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self.main())
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+        try:
+            with contextlib.suppress(asyncio.CancelledError):
+                loop.run_until_complete(task)
+        finally:
+            loop.close()
+
+    async def close(self) -> None:
+        """Cancel running jobs, run ``on_shutdown`` and disconnect."""
+        if self._pool is None:
+            return
+        tasks = [task for worker in self.workers for task in worker.tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._pool.delete(*(worker.health_check_key for worker in self.workers))
+        on_shutdown = _setting(self.settings, "on_shutdown", None)
+        if on_shutdown:
+            await on_shutdown(self.ctx)
+        await self._pool.aclose()
+        self._pool = None
+        logger.info("multi_queue_worker_stopped")
+
+    def _job_start_hook(
+        self,
+        queue: str,
+        chained: Callable[[dict[str, Any]], Awaitable[None]] | None,
+    ) -> Callable[[dict[str, Any]], Awaitable[None]]:
+        async def on_job_start(ctx: dict[str, Any]) -> None:
+            # score is when the job became due: enqueue time, or its deferral
+            self.metrics.observe_wait(queue, time.time() - ctx["score"] / 1000)
+            if chained:
+                await chained(ctx)
+
+        return on_job_start
+
+    async def _sample_depths_forever(self) -> None:
+        names = [spec.name for spec in self.queues]
+        while True:
+            try:
+                await sample_queue_depths(self.pool, names, self.metrics)
+            except Exception as e:  # noqa: BLE001 - metrics must not stop the worker
+                logger.warning("queue_depth_sample_failed", error=str(e))
+            await asyncio.sleep(self.metrics_interval)
+
+
+def run_queues(settings_cls: Any) -> MultiQueueWorker:
+    """Run a ``MultiQueueWorker`` for the settings until interrupted.
+
+    Args:
+        settings_cls: WorkerSettings class with ``queues``
+
+    Returns:
+        The stopped worker
+    """
+    worker = MultiQueueWorker(settings_cls)
+    worker.run()
+    return worker
+
+
+def _setting(settings_cls: Any, name: str, default: Any) -> Any:
+    if isinstance(settings_cls, dict):
+        return settings_cls.get(name, default)
+    return getattr(settings_cls, name, default)
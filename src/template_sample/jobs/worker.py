@@ -9,6 +9,7 @@ Features:
 - Scheduled/cron jobs
 - Job result storage
 - Worker pooling
+- Named priority queues with weighted fair scheduling (see jobs.queues)
 
 Alternative: For heavier workloads or complex workflows, see Celery patterns at the
 bottom of this file.
@@ -23,24 +24,52 @@ Setup:
     3. Configure in .env:
        REDIS_URL=redis://localhost:6379/0
 
-    4. Run worker:
-       arq template_sample.jobs.worker.WorkerSettings
+    4. Run worker (all queues in WorkerSettings.queues):
+       python -m template_sample.jobs.worker
+
+       ``arq template_sample.jobs.worker.WorkerSettings`` still works, but
+       only consumes the default queue, so leave JOB_QUEUE_ROUTING off
+       (the default) when running workers that way.
 """
 
 from __future__ import annotations
 
 import asyncio
-import logging
-from datetime import datetime
+import csv
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import islice
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 from arq import cron
 from arq.connections import RedisSettings
+from arq.constants import default_queue_name, job_key_prefix, result_key_prefix
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms, to_ms
+
+from template_sample.core.config import settings
+from template_sample.jobs.batching import BatchCall, batchable
+from template_sample.jobs.file_pipeline import (
+    OffsetCheckpoint,
+    RecordBatch,
+    run_file_pipeline,
+)
+from template_sample.jobs.process_pool import configure_process_pool, get_process_pool
+from template_sample.jobs.queues import QueueSpec, run_queues
+from template_sample.utils.logging import get_logger
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
     from arq.connections import ArqRedis
+    from redis.commands.core import AsyncScript
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# Queues, besides arq's default "arq:queue"
+HIGH_PRIORITY_QUEUE = "arq:queue:high"
+BULK_QUEUE = "arq:queue:bulk"
 
 
 # =============================================================================
@@ -48,7 +77,9 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
-async def example_background_task(ctx: dict[str, Any], user_id: str, data: dict) -> dict:
+async def example_background_task(
+    ctx: dict[str, Any], user_id: str, data: dict
+) -> dict:
     """Example background task.
 
     Args:
@@ -77,36 +108,47 @@ async def example_background_task(ctx: dict[str, Any], user_id: str, data: dict)
     }
 
 
-async def send_email_task(
-    ctx: dict[str, Any],
-    recipient: str,
-    subject: str,
-    body: str,
-) -> dict:
-    """Send email asynchronously.
+@batchable(max_size=8, max_wait_ms=20)
+async def send_email_task(ctx: dict[str, Any], calls: list[BatchCall]) -> list[dict]:
+    """Send emails asynchronously, in micro-batches.
+
+    Enqueued one email per job, with ``recipient``, ``subject`` and ``body``
+    arguments; concurrent jobs are sent through one provider call.
 
     Args:
-        ctx: ARQ context
-        recipient: Email recipient
-        subject: Email subject
-        body: Email body
+        ctx: ARQ context of the first job in the batch
+        calls: Queued emails
 
     Returns:
-        Send status
+        Send status per email, in order
     """
-    logger.info("sending_email", recipient=recipient, subject=subject)
+    emails = [call.bind("recipient", "subject", "body") for call in calls]
+    logger.info("sending_emails", count=len(emails))
 
-    # TODO: Integrate with your email provider
+    # TODO: Integrate with your email provider's bulk API
     # Example with SendGrid, AWS SES, etc.
-    # await send_email_via_provider(recipient, subject, body)
+    # await send_emails_via_provider(emails)
 
     await asyncio.sleep(1)  # Simulate email sending
 
-    return {
-        "status": "sent",
-        "recipient": recipient,
-        "sent_at": datetime.utcnow().isoformat(),
-    }
+    sent_at = datetime.utcnow().isoformat()
+    return [
+        {"status": "sent", "recipient": email["recipient"], "sent_at": sent_at}
+        for email in emails
+    ]
+
+
+def parse_rows(lines: list[bytes]) -> list[list[str]]:
+    """Parse a batch of CSV records; runs in the worker's process pool.
+
+    Args:
+        lines: Raw records of the upload, without line endings; quoted
+            fields may contain newlines
+
+    Returns:
+        One list of fields per record
+    """
+    return list(csv.reader(line.decode("utf-8") for line in lines))
 
 
 async def process_file_upload(
@@ -116,6 +158,18 @@ async def process_file_upload(
 ) -> dict:
     """Process uploaded file in background.
 
+    The file is streamed in batches through ``run_file_pipeline``: CSV
+    records (quoted fields may span lines) are parsed in the process pool
+    and stored in order, and progress is checkpointed in Redis so a retry
+    resumes where the failed attempt stopped. Memory use does not depend on
+    the file size.
+
+    Rows are stored by ``ctx["upload_writer"]``, an
+    ``async (file_id, rows, batch) -> None`` set up in ``startup``. It must
+    be idempotent, since a batch is stored again if the job fails before
+    its checkpoint is saved. Without a writer the file is only parsed: the
+    status is ``"parsed"`` and no records are reported as stored.
+
     Args:
         ctx: ARQ context
         file_id: File identifier
@@ -125,20 +179,36 @@ async def process_file_upload(
         Processing result
     """
     logger.info("processing_file", file_id=file_id, path=file_path)
+    writer = ctx.get("upload_writer")
+    if writer is None:
+        logger.warning("file_upload_writer_missing", file_id=file_id)
 
-    try:
-        # Example: Read and process file
-        # with open(file_path, 'rb') as f:
-        #     data = f.read()
-        #     # Process data...
+    async def store_rows(rows: list[list[str]], batch: RecordBatch) -> None:
+        if writer is not None:
+            await writer(file_id, rows, batch)
+        logger.debug("file_batch_stored", file_id=file_id, end=batch.end)
 
-        await asyncio.sleep(3)  # Simulate processing
+    checkpoint = None
+    if "redis" in ctx:
+        checkpoint = OffsetCheckpoint(ctx["redis"], f"upload:checkpoint:{file_id}")
+
+    try:
+        result = await run_file_pipeline(
+            file_path,
+            parse_rows,
+            store_rows,
+            checkpoint=checkpoint,
+            pool=get_process_pool(),
+            quote=b'"',
+        )
 
         return {
-            "status": "completed",
+            "status": "completed" if writer is not None else "parsed",
             "file_id": file_id,
             "processed_at": datetime.utcnow().isoformat(),
-            "records_processed": 1000,
+            "records_processed": result.records,
+            "records_stored": result.records if writer is not None else 0,
+            "resumed_from_offset": result.resumed_from,
         }
 
     except Exception as e:
@@ -186,9 +256,22 @@ async def startup(ctx: dict[str, Any]) -> None:
     """
     logger.info("arq_worker_starting")
 
+    # Pool for CPU-bound job code; its processes start on first use, or now
+    # when warming is configured
+    ctx["process_pool"] = configure_process_pool(
+        max_workers=WorkerSettings.process_pool_workers,
+        max_tasks_per_child=WorkerSettings.process_pool_max_tasks_per_child,
+        preload=("template_sample.jobs.worker",),
+    )
+    if WorkerSettings.process_pool_warm:
+        await ctx["process_pool"].warm()
+
     # Example: Initialize database connection
     # ctx['db'] = await create_db_connection()
 
+    # Example: Store upload rows (see process_file_upload)
+    # ctx['upload_writer'] = functools.partial(upsert_upload_rows, ctx['db'])
+
     # Example: Load configuration
     # ctx['config'] = load_config()
 
@@ -204,6 +287,9 @@ async def shutdown(ctx: dict[str, Any]) -> None:
     """
     logger.info("arq_worker_shutting_down")
 
+    if "process_pool" in ctx:
+        await asyncio.to_thread(ctx["process_pool"].shutdown)
+
     # Example: Close database connection
     # if 'db' in ctx:
     #     await ctx['db'].close()
@@ -237,11 +323,36 @@ class WorkerSettings:
         "redis://localhost:6379/0"  # Override with REDIS_URL env var
     )
 
+    # Queues consumed by one process (python -m template_sample.jobs.worker).
+    # Under contention, freed job slots go to waiting queues in proportion
+    # to their weight; bulk jobs never hold more than 4 of the slots.
+    queues = [
+        QueueSpec(HIGH_PRIORITY_QUEUE, weight=6),
+        QueueSpec(default_queue_name, weight=3),
+        QueueSpec(BULK_QUEUE, weight=1, max_jobs=4),
+    ]
+
+    # Queue per task function (default: arq's default queue); only used with
+    # JOB_QUEUE_ROUTING=true, since a plain arq worker never sees these queues
+    task_queues = {
+        "send_email_task": HIGH_PRIORITY_QUEUE,
+        "process_file_upload": BULK_QUEUE,
+    }
+
+    queue_metrics_interval = 10  # Sample queue depths every 10 seconds
+
     # Worker configuration
-    max_jobs = 10  # Maximum concurrent jobs
+    # Maximum concurrent jobs across all queues; batched tasks wait for their
+    # batch in a slot, so keep this above the largest batchable max_size
+    max_jobs = 10
     job_timeout = 300  # Job timeout in seconds (5 minutes)
     keep_result = 3600  # Keep job results for 1 hour
 
+    # Process pool for CPU-bound job code (see jobs.process_pool)
+    process_pool_workers = 2  # Child processes per worker (None: one per CPU)
+    process_pool_warm = False  # Start the children at startup, not on first use
+    process_pool_max_tasks_per_child = 500  # Recycle children after N tasks
+
     # Retry configuration
     max_tries = 3  # Maximum retry attempts
     retry_jobs = True  # Enable automatic retries
@@ -259,19 +370,35 @@ class WorkerSettings:
 # =============================================================================
 
 
+def queue_for(task_name: str) -> str:
+    """Get the queue a task is routed to.
+
+    Args:
+        task_name: Name of the task function
+
+    Returns:
+        Queue name from ``WorkerSettings.task_queues`` when
+        ``settings.job_queue_routing`` is enabled, otherwise arq's default
+    """
+    if not settings.job_queue_routing:
+        return default_queue_name
+    return WorkerSettings.task_queues.get(task_name, default_queue_name)
+
+
 async def enqueue_task(
     redis: ArqRedis,
     task_name: str,
     *args: Any,
     **kwargs: Any,
 ) -> str:
-    """Enqueue a background task.
+    """Enqueue a background task on its queue (see ``queue_for``).
 
     Args:
         redis: ARQ Redis connection
         task_name: Name of the task function
         *args: Task arguments
-        **kwargs: Task keyword arguments
+        **kwargs: Task keyword arguments; arq's ``_queue_name`` overrides
+            the task's queue
 
     Returns:
         Job ID
@@ -280,17 +407,158 @@ async def enqueue_task(
         >>> from arq import create_pool
         >>> redis = await create_pool(RedisSettings())
         >>> job_id = await enqueue_task(
-        ...     redis,
-        ...     "example_background_task",
-        ...     "user_123",
-        ...     {"action": "export"}
+        ...     redis, "example_background_task", "user_123", {"action": "export"}
         ... )
     """
+    kwargs.setdefault("_queue_name", queue_for(task_name))
     job = await redis.enqueue_job(task_name, *args, **kwargs)
     logger.info("task_enqueued", task=task_name, job_id=job.job_id)
     return job.job_id
 
 
+# Enqueues one batch atomically: a job is skipped if its job or result key
+# already exists, exactly like ArqRedis.enqueue_job.
+# KEYS: job key, result key per job. ARGV: queue, then id, score, ttl (ms),
+# payload per job. Returns the ids that were added.
+_ENQUEUE_BATCH_SCRIPT = """
+local added = {}
+for i = 1, (#KEYS - 1) / 2 do
+    local job_key, result_key = KEYS[2 * i], KEYS[2 * i + 1]
+    local arg = 1 + (i - 1) * 4
+    if redis.call("exists", job_key, result_key) == 0 then
+        redis.call("psetex", job_key, ARGV[arg + 2], ARGV[arg + 3])
+        redis.call("zadd", KEYS[1], ARGV[arg + 1], ARGV[arg])
+        added[#added + 1] = ARGV[arg]
+    end
+end
+return added
+"""
+
+# Registered on first use; runs by EVALSHA on any connection
+_enqueue_batch: AsyncScript | None = None
+
+
+def _enqueue_batch_script(redis: ArqRedis) -> AsyncScript:
+    global _enqueue_batch
+    if _enqueue_batch is None:
+        _enqueue_batch = redis.register_script(_ENQUEUE_BATCH_SCRIPT)
+    return _enqueue_batch
+
+
+async def enqueue_many(
+    redis: ArqRedis,
+    task_name: str,
+    calls: Iterable[Mapping[str, Any] | tuple[Any, ...]],
+    *,
+    job_id: Callable[[tuple[Any, ...], dict[str, Any]], str | None] | None = None,
+    batch_size: int = 1000,
+    queue_name: str | None = None,
+    defer_by: float | timedelta | None = None,
+    expires: float | timedelta | None = None,
+) -> list[str | None]:
+    """Enqueue many invocations of one task with a round trip per batch.
+
+    ``redis.enqueue_job`` costs a WATCH/MULTI exchange per job. Here each
+    batch of jobs is serialized locally and submitted with a single Lua
+    script, which keeps arq's uniqueness rule: a job whose id already has a
+    queued job or a stored result is not enqueued again.
+
+    Args:
+        redis: ARQ Redis connection
+        task_name: Name of the task function
+        calls: Arguments per job, a mapping of keyword arguments or a tuple
+            of positional arguments; consumed lazily, one batch at a time
+        job_id: Build a deduplication id from ``(args, kwargs)``; ``None``
+            from the callable (or no callable) means a random id
+        batch_size: Jobs per round trip
+        queue_name: Queue to add the jobs to (default: ``queue_for(task_name)``)
+        defer_by: Delay before the jobs may run, in seconds
+        expires: Do not start the jobs after this long, in seconds
+            (default: 24 hours plus ``defer_by``, as in arq)
+
+    Returns:
+        Job ids in the order of ``calls``; ``None`` where the job was skipped
+        because its id was already enqueued, by an earlier call or earlier
+        in ``calls``
+
+    Raises:
+        TypeError: If an entry of ``calls`` is neither a mapping nor a tuple
+        ValueError: If batch_size is less than 1
+
+    Example:
+        >>> job_ids = await enqueue_many(
+        ...     redis,
+        ...     "send_email_task",
+        ...     ({"recipient": r, "subject": "Hi", "body": "..."} for r in users),
+        ...     job_id=lambda args, kwargs: f"welcome:{kwargs['recipient']}",
+        ... )
+    """
+    if batch_size < 1:
+        msg = "batch_size must be at least 1"
+        raise ValueError(msg)
+
+    queue = queue_name or queue_for(task_name)
+    defer_ms = to_ms(defer_by) or 0
+    expires_ms = to_ms(expires) or defer_ms + redis.expires_extra_ms
+    job_ids: list[str | None] = []
+    seen: set[str] = set()
+    enqueued = batches = 0
+
+    iterator = iter(calls)
+    while batch := list(islice(iterator, batch_size)):
+        enqueue_time = timestamp_ms()
+        keys: list[str] = [queue]
+        argv: list[str | int | bytes] = []
+        batch_ids: list[str | None] = []
+        for call in batch:
+            if isinstance(call, Mapping):
+                args, kwargs = (), dict(call)
+            elif isinstance(call, tuple):
+                args, kwargs = call, {}
+            else:
+                msg = (
+                    "enqueue_many calls must be mappings or tuples, "
+                    f"not {type(call).__name__}"
+                )
+                raise TypeError(msg)
+            job = (job_id(args, kwargs) if job_id else None) or uuid4().hex
+            if job in seen:
+                batch_ids.append(None)
+                continue
+            seen.add(job)
+            batch_ids.append(job)
+            payload = serialize_job(
+                task_name,
+                args,
+                kwargs,
+                None,
+                enqueue_time,
+                serializer=redis.job_serializer,
+            )
+            keys += (job_key_prefix + job, result_key_prefix + job)
+            argv += (job, enqueue_time + defer_ms, expires_ms, payload)
+
+        added: set[str] = set()
+        if argv:
+            script = _enqueue_batch_script(redis)
+            result = await script(keys=keys, args=argv, client=redis)
+            added = {
+                item.decode() if isinstance(item, bytes) else item for item in result
+            }
+        job_ids += [job if job in added else None for job in batch_ids]
+        enqueued += len(added)
+        batches += 1
+
+    logger.info(
+        "tasks_enqueued",
+        task=task_name,
+        requested=len(job_ids),
+        enqueued=enqueued,
+        batches=batches,
+    )
+    return job_ids
+
+
 # =============================================================================
 # FastAPI Integration Example
 # =============================================================================
@@ -415,3 +683,7 @@ celery_app.conf.beat_schedule = {
 # Run beat scheduler:
 # celery -A template_sample.jobs.celery_worker beat --loglevel=info
 """
+
+
+if __name__ == "__main__":
+    run_queues(WorkerSettings)
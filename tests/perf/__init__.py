@@ -0,0 +1,8 @@
+"""Performance benchmarks for Template Sample.
+
+Benchmarks use pytest-benchmark and run in the ``perf`` nox session
+(``nox -s perf``), which saves their results as JSON under ``.benchmarks/``
+for comparison between runs.
+
+Mark tests with @pytest.mark.perf decorator for organization.
+"""
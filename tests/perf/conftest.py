@@ -0,0 +1,72 @@
+"""Fixtures for the benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+
+def _install_backend(monkeypatch: pytest.MonkeyPatch, mode: str) -> Any:
+    """Point core.cache at a fresh in-process client and reset its state."""
+    from template_sample.core import cache
+    from template_sample.core.config import Settings
+
+    # Pool exhaustion isn't what these benchmarks measure: a non-blocking
+    # pool smaller than the number of concurrent callers fails the excess
+    # GETs with "Too many connections"
+    config = Settings(redis_mode=mode, redis_max_connections=10_000)
+    client, _ = cache.create_redis_clients(config)
+    monkeypatch.setattr(cache, "_redis_pool", client)
+    monkeypatch.setattr(cache, "_redis_replicas", [])
+    monkeypatch.setattr(cache, "_local_cache", cache.LocalCache())
+    monkeypatch.setattr(cache, "_namespace_generations", {})
+    monkeypatch.setattr(cache, "_tracking_task", None)
+    monkeypatch.setattr(cache, "_tracking_local_ttl", 0)
+    monkeypatch.setattr(cache, "_circuit_breaker", cache.CircuitBreaker())
+    monkeypatch.setattr(cache, "_metrics", cache.CacheMetrics())
+    return client
+
+
+@pytest.fixture(scope="module")
+def run() -> Iterator[Callable[[Awaitable[Any]], Any]]:
+    """Run a coroutine to completion on a loop shared by the module.
+
+    pytest-benchmark times synchronous callables, so each benchmarked
+    coroutine is driven by ``run``; reusing one loop keeps loop creation
+    out of the measurements.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(params=["memory", "fakeredis"])
+def cache_backend(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Any:
+    """Install an in-process Redis stand-in for core.cache.
+
+    Parametrized over the memory backend (cache logic alone) and fakeredis
+    (adds RESP encoding and a full command emulation).
+
+    Returns:
+        The client used by the cache module
+    """
+    if request.param == "fakeredis":
+        pytest.importorskip("fakeredis")
+    return _install_backend(monkeypatch, request.param)
+
+
+@pytest.fixture
+def memory_backend(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Install the memory backend, for benchmarks of the cache logic alone.
+
+    Returns:
+        The client used by the cache module
+    """
+    return _install_backend(monkeypatch, "memory")
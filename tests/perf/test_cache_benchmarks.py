@@ -0,0 +1,166 @@
+"""Benchmarks for template_sample.core.cache.
+
+Redis is replaced by an in-process stand-in (see conftest.py), so results
+measure the cache logic, key building and serialization rather than the
+network. Run with ``nox -s perf`` and compare saved runs with
+``nox -s perf -- --benchmark-compare``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from typing import Any, ClassVar
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("redis")
+
+from template_sample.core import cache
+from template_sample.core.cache_keys import make_key_builder
+from template_sample.core.serialization import CacheCodec
+
+
+def _records(count: int) -> list[dict[str, Any]]:
+    """Build a JSON-friendly payload of ``count`` small records."""
+    return [
+        {"id": i, "name": f"user-{i}", "balance": i * 1.5, "tags": ["a", "b"]}
+        for i in range(count)
+    ]
+
+
+class TestCachedLatency:
+    """Benchmark cached() hits and misses."""
+
+    @pytest.mark.perf
+    def test_redis_hit(self, benchmark: Any, run: Any, cache_backend: Any) -> None:
+        """Time a hit served from the Redis tier."""
+
+        @cache.cached(ttl=300, key_prefix="user")
+        async def get_user(user_id: int) -> dict[str, Any]:
+            return _records(1)[0]
+
+        run(get_user(1))
+
+        assert benchmark(lambda: run(get_user(1)))["id"] == 0
+
+    @pytest.mark.perf
+    def test_local_hit(self, benchmark: Any, run: Any, cache_backend: Any) -> None:
+        """Time a hit served from the in-process L1 tier."""
+
+        @cache.cached(ttl=300, key_prefix="user", local_ttl=60)
+        async def get_user(user_id: int) -> dict[str, Any]:
+            return _records(1)[0]
+
+        run(get_user(1))
+
+        assert benchmark(lambda: run(get_user(1)))["id"] == 0
+
+    @pytest.mark.perf
+    def test_miss(self, benchmark: Any, run: Any, cache_backend: Any) -> None:
+        """Time a miss: lookup, compute (trivial here) and store."""
+        user_ids = itertools.count()
+
+        @cache.cached(ttl=300, key_prefix="user")
+        async def get_user(user_id: int) -> dict[str, Any]:
+            return _records(1)[0]
+
+        assert benchmark(lambda: run(get_user(next(user_ids))))["id"] == 0
+
+
+class TestKeyBuilding:
+    """Benchmark the default canonical key builder."""
+
+    ARGUMENTS: ClassVar[dict[str, tuple[tuple[Any, ...], dict[str, Any]]]] = {
+        "scalars": ((42, "eur"), {}),
+        "kwargs": ((), {f"field_{i}": i for i in range(20)}),
+        "nested": ((_records(100),), {}),
+    }
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("shape", list(ARGUMENTS))
+    def test_build_key(self, benchmark: Any, shape: str) -> None:
+        """Time building one key for a given argument shape."""
+
+        def lookup(*args: Any, **kwargs: Any) -> None: ...
+
+        build_key = make_key_builder(lookup, "lookup")
+        args, kwargs = self.ARGUMENTS[shape]
+
+        assert benchmark(build_key, *args, **kwargs).startswith("lookup:")
+
+
+class TestSerialization:
+    """Benchmark codec round-trips by payload size."""
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("serializer", ["json", "pickle"])
+    @pytest.mark.parametrize("records", [1, 100, 10_000])
+    def test_round_trip(self, benchmark: Any, serializer: str, records: int) -> None:
+        """Time encoding and decoding one value."""
+        codec = CacheCodec(serializer)
+        value = _records(records)
+        benchmark.extra_info["payload_bytes"] = len(codec.encode(value))
+
+        assert benchmark(lambda: codec.decode(codec.encode(value))) == value
+
+
+class TestPatternInvalidation:
+    """Benchmark invalidate_pattern against keyspace size."""
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("keyspace", [1_000, 10_000, 100_000])
+    def test_invalidate_pattern(
+        self, benchmark: Any, run: Any, memory_backend: Any, keyspace: int
+    ) -> None:
+        """Time deleting the 10% of keys matching a prefix pattern."""
+        store = memory_backend.store
+        matching = keyspace // 10
+
+        def populate() -> None:
+            store.flush()
+            for i in range(keyspace):
+                prefix = "user" if i < matching else "other"
+                store.set(f"{prefix}:{i}".encode(), b"x")
+
+        deleted = benchmark.pedantic(
+            lambda: run(cache.invalidate_pattern("user:*")),
+            setup=populate,
+            rounds=5,
+        )
+
+        assert deleted == matching
+        assert len(store) == keyspace - matching
+
+
+class TestStampede:
+    """Benchmark concurrent misses on one cold key."""
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("callers", [10, 100, 1_000])
+    def test_concurrent_misses(
+        self, benchmark: Any, run: Any, cache_backend: Any, callers: int
+    ) -> None:
+        """Time N callers missing the same key; single-flight computes once."""
+        calls = 0
+
+        @cache.cached(ttl=300, key_prefix="report")
+        async def build_report() -> list[dict[str, Any]]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.001)
+            return _records(10)
+
+        def reset() -> None:
+            nonlocal calls
+            calls = 0
+            run(cache.invalidate_pattern("report:*"))
+
+        async def stampede() -> list[Any]:
+            return await asyncio.gather(*(build_report() for _ in range(callers)))
+
+        results = benchmark.pedantic(lambda: run(stampede()), setup=reset, rounds=5)
+
+        assert len(results) == callers
+        assert calls == 1
@@ -0,0 +1,97 @@
+"""Benchmarks for job submission in template_sample.jobs.worker.
+
+Jobs are enqueued into fakeredis, which has no network latency, so the gap
+between the two paths here is a lower bound: against a real server every
+saved round trip also saves a network RTT.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("arq")
+fakeredis = pytest.importorskip("fakeredis")
+
+from arq.connections import ArqRedis  # noqa: E402
+
+from template_sample.jobs import worker  # noqa: E402
+
+JOBS = 1_000
+
+
+def _emails(count: int) -> list[dict[str, Any]]:
+    """Build send_email_task keyword arguments for ``count`` recipients."""
+    return [
+        {"recipient": f"user-{i}@example.com", "subject": "Hi", "body": "..."}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def arq_redis() -> ArqRedis:
+    """Create an ArqRedis connection backed by fakeredis.
+
+    Returns:
+        ArqRedis sharing a fresh fakeredis server
+    """
+    return ArqRedis(fakeredis.aioredis.FakeRedis().connection_pool)
+
+
+@pytest.fixture
+def flush(run: Any, arq_redis: ArqRedis) -> Any:
+    """Empty the queue between rounds, as a pytest-benchmark setup."""
+
+    def setup() -> None:
+        run(arq_redis.flushdb())
+
+    return setup
+
+
+class TestEnqueueThroughput:
+    """Benchmark enqueueing 1000 jobs per job and in batches."""
+
+    @pytest.mark.perf
+    def test_enqueue_job_loop(
+        self, benchmark: Any, run: Any, arq_redis: ArqRedis, flush: Any
+    ) -> None:
+        """Time one enqueue_task (WATCH/MULTI) call per job."""
+        calls = _emails(JOBS)
+
+        async def enqueue() -> list[str]:
+            return [
+                await worker.enqueue_task(arq_redis, "send_email_task", **call)
+                for call in calls
+            ]
+
+        job_ids = benchmark.pedantic(lambda: run(enqueue()), setup=flush, rounds=5)
+
+        assert len(job_ids) == JOBS
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("batch_size", [100, 1_000])
+    def test_enqueue_many(
+        self,
+        benchmark: Any,
+        run: Any,
+        arq_redis: ArqRedis,
+        flush: Any,
+        batch_size: int,
+    ) -> None:
+        """Time enqueue_many with one Lua round trip per batch."""
+        calls = _emails(JOBS)
+
+        job_ids = benchmark.pedantic(
+            lambda: run(
+                worker.enqueue_many(
+                    arq_redis, "send_email_task", calls, batch_size=batch_size
+                )
+            ),
+            setup=flush,
+            rounds=5,
+        )
+
+        assert all(job_ids)
+        assert len(job_ids) == JOBS
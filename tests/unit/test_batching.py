@@ -0,0 +1,233 @@
+"""Unit tests for micro-batch job execution in template_sample.jobs.batching."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from template_sample.jobs.batching import BatchCall, MicroBatcher, batchable
+
+
+class TestBatchCall:
+    """Test binding batched arguments to parameter names."""
+
+    @pytest.mark.unit
+    def test_bind(self) -> None:
+        """Verify positional and keyword arguments, and mistakes."""
+        call = BatchCall(args=("a@example.com",), kwargs={"subject": "Hi"})
+
+        assert call.bind("recipient", "subject") == {
+            "recipient": "a@example.com",
+            "subject": "Hi",
+        }
+        with pytest.raises(TypeError, match="missing arguments: body"):
+            call.bind("recipient", "subject", "body")
+        with pytest.raises(TypeError, match="unexpected argument 'subject'"):
+            call.bind("recipient")
+        with pytest.raises(TypeError, match="given twice"):
+            call.bind("subject", "recipient")
+
+
+class TestMicroBatcher:
+    """Test batch formation and per-call results."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_flushes_when_full(self) -> None:
+        """Verify calls are grouped into batches of max_size."""
+        batches: list[list[int]] = []
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[int]:
+            batches.append([call.args[0] for call in calls])
+            return [call.args[0] * 10 for call in calls]
+
+        batcher = MicroBatcher(handler, max_size=3, max_wait=10)
+        results = await asyncio.gather(
+            *(batcher.submit({}, BatchCall(args=(i,))) for i in range(6))
+        )
+
+        assert results == [0, 10, 20, 30, 40, 50]
+        assert batches == [[0, 1, 2], [3, 4, 5]]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_flushes_after_max_wait(self) -> None:
+        """Verify a partial batch runs once max_wait has passed."""
+        batches: list[int] = []
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[str]:
+            batches.append(len(calls))
+            return [ctx["job_id"]] * len(calls)
+
+        batcher = MicroBatcher(handler, max_size=100, max_wait=0.01)
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit({"job_id": "first"}, BatchCall()),
+                batcher.submit({"job_id": "second"}, BatchCall()),
+            ),
+            timeout=1,
+        )
+
+        assert batches == [2]
+        assert results == ["first", "first"]
+        assert len(batcher) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_are_per_call(self) -> None:
+        """Verify exception results fail only their call."""
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[Any]:
+            return [
+                ValueError("bounced") if c.args[0] == "bad" else "ok" for c in calls
+            ]
+
+        batcher = MicroBatcher(handler, max_size=2)
+        results = await asyncio.gather(
+            batcher.submit({}, BatchCall(args=("good",))),
+            batcher.submit({}, BatchCall(args=("bad",))),
+            return_exceptions=True,
+        )
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_handler_errors_fail_the_batch(self) -> None:
+        """Verify handler errors and wrong result counts reach every call."""
+
+        async def short(ctx: dict[str, Any], calls: list[BatchCall]) -> list[Any]:
+            return []
+
+        batcher = MicroBatcher(short, max_size=2)
+        results = await asyncio.gather(
+            batcher.submit({}, BatchCall()),
+            batcher.submit({}, BatchCall()),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert "returned 0 results for 2 calls" in str(results[0])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_calls_are_dropped(self) -> None:
+        """Verify a call cancelled before its flush is not sent."""
+        seen: list[Any] = []
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[Any]:
+            seen.extend(call.args[0] for call in calls)
+            return [None] * len(calls)
+
+        batcher = MicroBatcher(handler, max_size=10, max_wait=10)
+        cancelled = asyncio.ensure_future(batcher.submit({}, BatchCall(args=(1,))))
+        kept = asyncio.ensure_future(batcher.submit({}, BatchCall(args=(2,))))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        await batcher.drain()
+
+        assert await kept is None
+        assert seen == [2]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_after_flush_waits_for_the_batch(self) -> None:
+        """Verify a call cancelled mid-batch still returns its result."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[Any]:
+            started.set()
+            await release.wait()
+            return [call.args[0] for call in calls]
+
+        batcher = MicroBatcher(handler, max_size=1)
+        job = asyncio.ensure_future(batcher.submit({}, BatchCall(args=("sent",))))
+        await started.wait()
+        job.cancel()
+        await asyncio.sleep(0)
+
+        assert not job.done()
+        release.set()
+        assert await job == "sent"
+
+    @pytest.mark.unit
+    def test_rejects_bad_limits(self) -> None:
+        """Verify max_size and max_wait are validated."""
+
+        async def handler(ctx: dict[str, Any], calls: list[BatchCall]) -> list[Any]:
+            return []
+
+        with pytest.raises(ValueError, match="max_size"):
+            MicroBatcher(handler, max_size=0)
+        with pytest.raises(ValueError, match="max_wait"):
+            MicroBatcher(handler, max_wait=-1)
+
+
+class TestBatchable:
+    """Test the ARQ task decorator."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_jobs_share_a_batch(self) -> None:
+        """Verify each job gets its own result and keeps its identity."""
+
+        @batchable(max_size=3, max_wait_ms=1000)
+        async def greet(ctx: dict[str, Any], calls: list[BatchCall]) -> list[str]:
+            return [f"{call.job_id}:{call.bind('name')['name']}" for call in calls]
+
+        results = await asyncio.gather(
+            greet({"job_id": "j1", "job_try": 1}, "ann"),
+            greet({"job_id": "j2", "job_try": 1}, name="bob"),
+            greet({"job_id": "j3", "job_try": 2}, "cy"),
+        )
+
+        assert results == ["j1:ann", "j2:bob", "j3:cy"]
+        assert greet.__name__ == "greet"
+        assert asyncio.iscoroutinefunction(greet)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_send_email_task_is_batched(self, monkeypatch: Any) -> None:
+        """Verify the email task sends concurrent jobs in one batch."""
+        from template_sample.jobs import worker
+
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        monkeypatch.setattr(worker.asyncio, "sleep", fake_sleep)
+        batcher = worker.send_email_task.batcher
+        monkeypatch.setattr(batcher, "max_wait", 0)
+
+        results = await asyncio.gather(
+            worker.send_email_task({}, "a@example.com", "Hi", "..."),
+            worker.send_email_task(
+                {}, recipient="b@example.com", subject="Hi", body=""
+            ),
+        )
+
+        assert [result["recipient"] for result in results] == [
+            "a@example.com",
+            "b@example.com",
+        ]
+        assert sleeps == [1]
+
+    @pytest.mark.unit
+    def test_worker_batches_fit_in_max_jobs(self) -> None:
+        """Verify batched tasks leave worker slots for other jobs."""
+        from template_sample.jobs import worker
+
+        batchers = [
+            fn.batcher
+            for fn in worker.WorkerSettings.functions
+            if hasattr(fn, "batcher")
+        ]
+
+        assert batchers
+        assert all(b.max_size < worker.WorkerSettings.max_jobs for b in batchers)
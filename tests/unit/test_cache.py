@@ -0,0 +1,1598 @@
+"""Unit tests for the Redis caching utilities in template_sample.core.cache.
+
+Redis is replaced by an in-process fakeredis instance so the tests run
+without an external server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import secrets
+import threading
+import time
+from typing import Any
+from unittest.mock import ANY
+
+import pytest
+
+pytest.importorskip("redis")
+fakeredis = pytest.importorskip("fakeredis")
+
+from redis.exceptions import ConnectionError as RedisConnectionError  # noqa: E402
+
+from template_sample.core import cache  # noqa: E402
+from template_sample.core.config import Settings  # noqa: E402
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Install a fakeredis client as the global pool and a fresh L1 cache.
+
+    Returns:
+        The fakeredis client used by the cache module.
+    """
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(cache, "_redis_pool", client)
+    monkeypatch.setattr(cache, "_local_cache", cache.LocalCache())
+    monkeypatch.setattr(cache, "_namespace_generations", {})
+    monkeypatch.setattr(cache, "_tracking_task", None)
+    monkeypatch.setattr(cache, "_tracking_local_ttl", 0)
+    monkeypatch.setattr(cache, "_redis_replicas", [])
+    monkeypatch.setattr(cache, "_circuit_breaker", cache.CircuitBreaker())
+    monkeypatch.setattr(cache, "_metrics", cache.CacheMetrics())
+    monkeypatch.setattr(cache, "_size_limit", cache.EntrySizeLimit())
+    return client
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class TestLocalCache:
+    """Test the in-process L1 LRU cache."""
+
+    @pytest.mark.unit
+    def test_get_set_and_counters(self) -> None:
+        """Verify hits and misses are counted."""
+        local = cache.LocalCache()
+
+        assert local.get("missing") is cache._MISSING
+        local.set("key", {"a": 1}, ttl=10, size=8)
+
+        assert local.get("key") == {"a": 1}
+        stats = local.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 8
+
+    @pytest.mark.unit
+    def test_entries_expire(self) -> None:
+        """Verify entries expire after their TTL."""
+        clock = FakeClock()
+        local = cache.LocalCache(clock=clock)
+        local.set("key", "value", ttl=5)
+
+        clock.now = 4.9
+        assert local.get("key") == "value"
+        clock.now = 5.0
+        assert local.get("key", None) is None
+        assert local.stats()["expirations"] == 1
+
+    @pytest.mark.unit
+    def test_lru_eviction_by_count_and_bytes(self) -> None:
+        """Verify least-recently-used entries are evicted first."""
+        local = cache.LocalCache(max_entries=2, max_bytes=100)
+        local.set("a", 1, ttl=10, size=10)
+        local.set("b", 2, ttl=10, size=10)
+        local.get("a")  # "b" is now least recently used
+        local.set("c", 3, ttl=10, size=10)
+
+        assert local.get("b", None) is None
+        assert local.get("a") == 1
+
+        local.set("big", 4, ttl=10, size=95)
+        assert len(local) == 1
+        assert local.stats()["evictions"] == 3
+
+    @pytest.mark.unit
+    def test_oversized_entry_is_rejected(self) -> None:
+        """Verify entries larger than the byte budget are not stored."""
+        local = cache.LocalCache(max_bytes=10)
+
+        assert local.set("key", "x" * 50, ttl=10, size=50) is False
+        assert len(local) == 0
+
+    @pytest.mark.unit
+    def test_delete_pattern(self) -> None:
+        """Verify glob patterns delete matching keys only."""
+        local = cache.LocalCache()
+        local.set("user:1", 1, ttl=10)
+        local.set("user:2", 2, ttl=10)
+        local.set("item:1", 3, ttl=10)
+
+        assert local.delete_pattern("user:*") == 2
+        assert local.get("item:1") == 3
+
+    @pytest.mark.unit
+    def test_set_skipped_after_invalidation(self) -> None:
+        """Verify if_generation rejects fills that raced an invalidation."""
+        local = cache.LocalCache()
+        generation = local.generation
+        local.delete("user:1")  # invalidation arrives while the read is in flight
+
+        assert local.set("user:1", "stale", ttl=10, if_generation=generation) is False
+        assert local.get("user:1", None) is None
+        assert local.set("user:1", "fresh", ttl=10, if_generation=local.generation)
+
+
+class TestCachedDecorator:
+    """Test the @cached decorator against fakeredis."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redis_hit_after_miss(self, fake_redis: Any) -> None:
+        """Verify the wrapped function runs once per key."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="square")
+        async def square(x: int) -> int:
+            nonlocal calls
+            calls += 1
+            return x * x
+
+        assert await square(3) == 9
+        assert await square(3) == 9
+        assert calls == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_methods_are_cached_per_instance(self, fake_redis: Any) -> None:
+        """Verify instances with different cache keys never share entries."""
+
+        class Repo:
+            def __init__(self, db: str) -> None:
+                self.db = db
+
+            def __cache_key__(self) -> str:
+                return self.db
+
+            @cache.cached(ttl=60, key_prefix="repo")
+            async def get(self, item_id: int) -> str:
+                return f"{self.db}:{item_id}"
+
+        assert await Repo("a").get(1) == "a:1"
+        assert await Repo("b").get(1) == "b:1"
+        assert await Repo("a").get(1) == "a:1"
+
+    @pytest.mark.unit
+    def test_options_are_keyword_only(self) -> None:
+        """Verify only ttl, key_prefix and key_builder are positional."""
+        with pytest.raises(TypeError):
+            cache.cached(60, "square", None, 10)  # type: ignore[misc]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_local_tier_skips_redis(self, fake_redis: Any) -> None:
+        """Verify L1 hits are served without touching Redis."""
+
+        @cache.cached(ttl=60, key_prefix="flags", local_ttl=10)
+        async def flags() -> dict[str, bool]:
+            return {"beta": True}
+
+        assert await flags() == {"beta": True}
+        await fake_redis.flushall()
+
+        assert await flags() == {"beta": True}
+        assert cache.get_local_cache().stats()["hits"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_pattern_clears_local_tier(self, fake_redis: Any) -> None:
+        """Verify invalidation drops L1 entries in this process."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="user", local_ttl=10)
+        async def get_user(user_id: str) -> dict[str, str]:
+            nonlocal calls
+            calls += 1
+            return {"id": user_id}
+
+        await get_user("1")
+        await cache.invalidate_pattern("user:*")
+        await get_user("1")
+
+        assert calls == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_stats_include_local_tier(self, fake_redis: Any) -> None:
+        """Verify get_cache_stats exposes the L1 counters."""
+        stats = await cache.get_cache_stats()
+
+        assert "local" in stats
+        assert stats["local"]["hits"] == 0
+
+
+class TestCachedSync:
+    """Test the cached_sync decorator for synchronous functions."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_miss_runs_in_worker_thread(self, fake_redis: Any) -> None:
+        """Verify misses run off the loop thread and hits skip the function."""
+        threads: list[int] = []
+
+        @cache.cached_sync(ttl=60, key_prefix="square")
+        def square(x: int) -> int:
+            threads.append(threading.get_ident())
+            return x * x
+
+        assert await square(4) == 16
+        assert await square(x=4) == 16
+
+        assert threads != [threading.get_ident()]
+        assert len(threads) == 1
+        assert cache.get_cache_metrics().snapshot()["square"]["hits"] == {"redis": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive_during_miss(self, fake_redis: Any) -> None:
+        """Verify a slow sync function doesn't block other coroutines."""
+        release = threading.Event()
+
+        @cache.cached_sync(ttl=60)
+        def slow() -> str:
+            release.wait(timeout=5)
+            return "done"
+
+        task = asyncio.create_task(slow())
+        await asyncio.sleep(0.01)
+        # The loop is free to run this while slow() waits in its thread
+        release.set()
+
+        assert await task == "done"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self, fake_redis: Any) -> None:
+        """Verify single-flight applies to offloaded functions."""
+        calls = 0
+
+        @cache.cached_sync(ttl=60)
+        def report(day: str) -> dict[str, str]:
+            nonlocal calls
+            calls += 1
+            time.sleep(0.02)
+            return {"day": day}
+
+        results = await asyncio.gather(*(report("mon") for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == {"day": "mon"} for result in results)
+
+
+class TestStampedeProtection:
+    """Test single-flight coalescing and the cross-process recompute lock."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self, fake_redis: Any) -> None:
+        """Verify concurrent callers for one key share a single computation."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="slow")
+        async def slow(x: int) -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return x + 1
+
+        results = await asyncio.gather(*(slow(1) for _ in range(20)))
+
+        assert results == [2] * 20
+        assert calls == 1
+        assert cache._inflight == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_single_flight_can_be_disabled(self, fake_redis: Any) -> None:
+        """Verify single_flight=False lets every concurrent miss compute."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="slow", single_flight=False)
+        async def slow() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(*(slow() for _ in range(5)))
+
+        assert calls == 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self, fake_redis: Any) -> None:
+        """Verify a failing computation raises in every coalesced caller."""
+
+        @cache.cached(ttl=60, key_prefix="boom")
+        async def boom() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(boom(), boom(), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lock_waiter_uses_other_workers_value(self, fake_redis: Any) -> None:
+        """Verify a worker that loses the lock waits instead of recomputing."""
+        calls = 0
+
+        @cache.cached(
+            ttl=60,
+            key_prefix="report",
+            key_builder=lambda: "report:today",
+            lock_ttl=1,
+        )
+        async def report() -> dict[str, int]:
+            nonlocal calls
+            calls += 1
+            return {"rows": 0}
+
+        # Simulate another worker holding the lock and finishing shortly
+        await fake_redis.set("report:today:lock", "other", px=1000)
+
+        async def other_worker() -> None:
+            await asyncio.sleep(0.1)
+            await fake_redis.set("report:today", '{"rows": 42}')
+
+        result, _ = await asyncio.gather(report(), other_worker())
+
+        assert result == {"rows": 42}
+        assert calls == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lock_is_released_after_compute(self, fake_redis: Any) -> None:
+        """Verify the lock holder deletes its lock when done."""
+
+        @cache.cached(ttl=60, key_builder=lambda: "k", lock_ttl=5)
+        async def value() -> int:
+            return 7
+
+        assert await value() == 7
+        assert await fake_redis.exists("k:lock") == 0
+
+
+class TestStaleWhileRevalidate:
+    """Test soft/hard TTL handling and probabilistic early refresh."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify a stale entry is returned immediately and then refreshed."""
+        version = 0
+
+        @cache.cached(ttl=60, key_builder=lambda: "items", stale_ttl=30)
+        async def items() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        assert await items() == 1
+        assert 60 < await fake_redis.ttl("items") <= 90
+
+        # Jump past the soft TTL but inside the stale window
+        now = cache.time.time()
+        monkeypatch.setattr(cache.time, "time", lambda: now + 61)
+
+        assert await items() == 1  # stale, served without waiting
+        await cache._inflight["items"]
+        assert version == 2
+
+        monkeypatch.setattr(cache.time, "time", lambda: now + 62)
+        assert await items() == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_plain_entries_are_treated_as_fresh(self, fake_redis: Any) -> None:
+        """Verify entries written without an envelope are still readable."""
+        await fake_redis.set("legacy", "[1, 2]")
+
+        @cache.cached(ttl=60, key_builder=lambda: "legacy", stale_ttl=30)
+        async def legacy() -> list[int]:
+            return []
+
+        assert await legacy() == [1, 2]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stale_ttl", [0, 30])
+    async def test_envelope_lookalikes_round_trip(
+        self, fake_redis: Any, stale_ttl: int
+    ) -> None:
+        """Verify results shaped like an envelope are returned unchanged."""
+        lookalike = {"_swr": 1, "v": "x", "e": 0, "d": 0}
+
+        @cache.cached(ttl=60, key_builder=lambda: "shape", stale_ttl=stale_ttl)
+        async def shape() -> Any:
+            return lookalike
+
+        assert await shape() == lookalike
+        assert await shape() == lookalike
+        assert await cache.get_cached("shape") == (
+            lookalike if not stale_ttl else ["value", lookalike, ANY, ANY]
+        )
+
+    @pytest.mark.unit
+    def test_should_refresh_after_soft_expiry(self) -> None:
+        """Verify stale entries always refresh and fresh ones never do at beta=0."""
+        now = cache.time.time()
+
+        assert cache._should_refresh(now - 1, 0.0, 0.0) is True
+        assert cache._should_refresh(now + 100, 5.0, 0.0) is False
+
+    @pytest.mark.unit
+    def test_early_refresh_probability_grows_near_expiry(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify XFetch refreshes early in proportion to the recompute cost."""
+        now = cache.time.time()
+        # random() == 1 - 1/e gives a jitter of exactly delta * beta
+        monkeypatch.setattr(cache.random, "random", lambda: 1 - 1 / cache.math.e)
+
+        assert cache._should_refresh(now + 0.5, delta=1.0, beta=1.0) is True
+        assert cache._should_refresh(now + 5.0, delta=1.0, beta=1.0) is False
+        assert cache._should_refresh(now + 5.0, delta=1.0, beta=10.0) is True
+
+
+class TestCodecIntegration:
+    """Test that cache operations use the configured codec."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_configured_codec_preserves_types(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify a lossless codec round-trips Decimals through cached()."""
+        from decimal import Decimal
+
+        monkeypatch.setattr(cache, "_codec", cache._codec)
+        cache.configure_codec("pickle", compression="zlib", compress_threshold=0)
+
+        @cache.cached(ttl=60, key_builder=lambda: "total")
+        async def total() -> Decimal:
+            return Decimal("1.10")
+
+        await total()
+        assert await cache.get_cached("total") == Decimal("1.10")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_set_and_get_cached_round_trip(self, fake_redis: Any) -> None:
+        """Verify set_cached/get_cached share the codec framing."""
+        assert await cache.set_cached("k", {"a": [1, 2]}, ttl=60) is True
+
+        raw = await fake_redis.get("k")
+        assert raw[0] & 0x80
+        assert await cache.get_cached("k") == {"a": [1, 2]}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disallowed_format_is_a_miss(self, fake_redis: Any) -> None:
+        """Verify a pickle entry is recomputed and replaced, never unpickled."""
+        import pickle
+
+        await fake_redis.set("p", bytes((0x80 | (2 << 3),)) + pickle.dumps("forged"))
+
+        @cache.cached(ttl=60, key_builder=lambda: "p")
+        async def load() -> str:
+            return "real"
+
+        assert await load() == "real"
+        assert await cache.get_cached("p") == "real"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unencodable_result_is_returned(self, fake_redis: Any) -> None:
+        """Verify a value the codec cannot encode is returned, just not cached."""
+        circular: list[Any] = []
+        circular.append(circular)
+
+        @cache.cached(ttl=60, key_builder=lambda: "circular")
+        async def load() -> list[Any]:
+            return circular
+
+        assert await load() is circular
+        assert await fake_redis.exists("circular") == 0
+
+
+class TestBatchOperations:
+    """Test get_many/set_many/delete_many and the cached_batch decorator."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_set_get_delete_many(self, fake_redis: Any) -> None:
+        """Verify bulk operations round-trip and skip missing keys."""
+        assert await cache.set_many({"a": 1, "b": [2]}, ttl=60) is True
+
+        assert await cache.get_many(["a", "b", "c"]) == {"a": 1, "b": [2]}
+        assert 0 < await fake_redis.ttl("b") <= 60
+        assert await cache.delete_many(["a", "b", "c"]) == 2
+        assert await cache.get_many(["a", "b"]) == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_empty_inputs(self, fake_redis: Any) -> None:
+        """Verify empty batches are no-ops."""
+        assert await cache.get_many([]) == {}
+        assert await cache.set_many({}) is True
+        assert await cache.delete_many([]) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cached_batch_only_loads_missing_ids(self, fake_redis: Any) -> None:
+        """Verify cached_batch computes only uncached ids, in caller order."""
+        requested: list[list[int]] = []
+
+        @cache.cached_batch(ttl=60, key_prefix="item")
+        async def load_items(ids: list[int]) -> dict[int, dict[str, int]]:
+            requested.append(list(ids))
+            # Id 99 does not exist
+            return {i: {"id": i} for i in ids if i != 99}
+
+        first = await load_items([1, 2])
+        second = await load_items([3, 2, 1, 99, 3])
+
+        assert first == {1: {"id": 1}, 2: {"id": 2}}
+        assert list(second) == [3, 2, 1]
+        assert requested == [[1, 2], [3, 99]]
+        assert await fake_redis.exists("item:1", "item:2", "item:3") == 3
+
+
+class TestTagInvalidation:
+    """Test tag registration and invalidate_tags."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_removes_only_tagged_entries(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify argument-derived tags scope invalidation to one user."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="orders", tags=lambda uid: [f"user:{uid}"])
+        async def orders(uid: str) -> list[str]:
+            nonlocal calls
+            calls += 1
+            return [uid]
+
+        await orders("1")
+        await orders("2")
+
+        assert await cache.invalidate_tags("user:1") == 1
+        assert await fake_redis.exists("cache:tag:user:1") == 0
+
+        await orders("1")
+        await orders("2")
+        assert calls == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tag_expiry_only_grows(self, fake_redis: Any) -> None:
+        """Verify a short-lived entry does not shorten its tag's lifetime."""
+        await cache.set_cached("long", 1, ttl=600, tags=["t"])
+        await cache.set_cached("short", 2, ttl=10, tags=["t"])
+
+        assert await fake_redis.ttl("cache:tag:t") > 10
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidation_is_chunked(self, fake_redis: Any) -> None:
+        """Verify tags larger than one chunk are fully invalidated."""
+        for i in range(7):
+            await cache.set_cached(f"k{i}", i, ttl=60, tags=["bulk"])
+
+        assert await cache.invalidate_tags("bulk", chunk_size=2) == 7
+        assert await fake_redis.dbsize() == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_invalidate_decorator_with_tags(self, fake_redis: Any) -> None:
+        """Verify cache_invalidate(tags=...) runs after the wrapped function."""
+        await cache.set_cached("profile:1", {"name": "old"}, tags=["user:1"])
+
+        @cache.cache_invalidate(tags=lambda uid, name: [f"user:{uid}"])
+        async def rename(uid: str, name: str) -> str:
+            return name
+
+        assert await rename("1", "new") == "new"
+        assert await cache.get_cached("profile:1") is None
+
+
+class TestNamespaces:
+    """Test versioned namespace keys and invalidate_namespace."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_namespace_bumps_generation(self, fake_redis: Any) -> None:
+        """Verify invalidating a namespace makes its entries unreachable."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="dash", namespace=lambda uid: f"user:{uid}")
+        async def dashboard(uid: str) -> str:
+            nonlocal calls
+            calls += 1
+            return uid
+
+        await dashboard("1")
+        await dashboard("2")
+        keys = [k.decode() async for k in fake_redis.scan_iter("user:1:*")]
+        assert keys[0].startswith("user:1:v0:dash:")
+
+        assert await cache.invalidate_namespace("user:1") == 1
+        await dashboard("1")
+        await dashboard("2")
+
+        assert calls == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_generation_is_cached_locally(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify other processes see a bump only after the refresh interval."""
+        assert await cache._namespace_generation("ns") == 0
+
+        # Another process bumps the generation
+        await fake_redis.incr("cache:ns:ns")
+        assert await cache._namespace_generation("ns") == 0
+
+        now = cache.time.monotonic()
+        monkeypatch.setattr(
+            cache.time,
+            "monotonic",
+            lambda: now + cache.NAMESPACE_REFRESH_SECONDS + 1,
+        )
+        assert await cache._namespace_generation("ns") == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_invalidate_decorator_with_namespace(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify cache_invalidate(namespace=...) bumps the generation."""
+
+        @cache.cache_invalidate(namespace="catalog")
+        async def update_catalog() -> None:
+            return None
+
+        await update_catalog()
+
+        assert await fake_redis.get("cache:ns:catalog") == b"1"
+
+
+class TestClientTracking:
+    """Test server-assisted client-side caching."""
+
+    @pytest.fixture
+    def tracking_hook(self, monkeypatch: pytest.MonkeyPatch) -> Any:
+        """Accept tracking without sending CLIENT TRACKING (fakeredis lacks it)."""
+        enabled: list[int] = []
+
+        def fake_hook(client_id: int, prefixes: Any) -> Any:
+            async def on_connect(connection: Any) -> None:
+                await connection.on_connect()
+                enabled.append(client_id)
+
+            return on_connect
+
+        monkeypatch.setattr(cache, "_tracking_hook", fake_hook)
+        return enabled
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reads_served_locally_until_invalidated(
+        self, fake_redis: Any, tracking_hook: list[int]
+    ) -> None:
+        """Verify get_cached uses L1 while tracking and drops invalidated keys."""
+        await cache.set_cached("config:limits", {"rpm": 100})
+        await cache.enable_client_tracking()
+        try:
+            assert cache.is_client_tracking_active()
+            assert await cache.get_cached("config:limits") == {"rpm": 100}
+            assert tracking_hook  # pooled connection was set up for tracking
+
+            # Changed behind our back: still served from process memory
+            await fake_redis.set("config:limits", b'{"rpm": 5}')
+            assert await cache.get_cached("config:limits") == {"rpm": 100}
+
+            cache._handle_invalidation(
+                [b"message", b"__redis__:invalidate", [b"config:limits"]]
+            )
+            assert await cache.get_cached("config:limits") == {"rpm": 5}
+        finally:
+            await cache.disable_client_tracking()
+
+        assert not cache.is_client_tracking_active()
+        assert len(cache.get_local_cache()) == 0
+
+    @pytest.mark.unit
+    def test_flush_invalidation_clears_local_cache(self, fake_redis: Any) -> None:
+        """Verify a null key list (FLUSHDB) clears the whole L1 cache."""
+        local = cache.get_local_cache()
+        local.set("a", 1, ttl=10)
+        local.set("b", 2, ttl=10)
+
+        cache._handle_invalidation([b"message", b"__redis__:invalidate", None])
+
+        assert len(local) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unsupported_server_leaves_cache_working(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify a server rejecting CLIENT TRACKING doesn't break connections."""
+        with pytest.raises(cache.RedisError):
+            await cache.enable_client_tracking()
+
+        assert not cache.is_client_tracking_active()
+        assert await cache.set_cached("key", "value")
+        assert await cache.get_cached("key") == "value"
+
+
+class TestMetrics:
+    """Test per-prefix metrics recorded by cache operations."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cached_records_hits_misses_and_timings(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify cached() records per-prefix counters and histograms."""
+
+        @cache.cached(ttl=60, key_prefix="orders", local_ttl=10)
+        async def get_orders(uid: str) -> list[int]:
+            return [1, 2, 3]
+
+        await get_orders("1")  # miss
+        await get_orders("1")  # L1 hit
+        cache.get_local_cache().clear()
+        await get_orders("1")  # Redis hit
+
+        stats = cache.get_cache_metrics().snapshot()["orders"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == {"local": 1, "redis": 1}
+        assert stats["compute_seconds"]["count"] == 1
+        assert stats["serialize_seconds"]["count"] == 1
+        assert stats["payload_bytes"]["sum"] > 0
+        assert stats["deserialize_seconds"]["count"] >= 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_raw_keys_labelled_by_first_segment(self, fake_redis: Any) -> None:
+        """Verify get_cached/get_many use the key's first segment as prefix."""
+        await cache.set_cached("user:1", {"name": "Ada"})
+        await cache.get_cached("user:1")
+        await cache.get_cached("user:2")
+        await cache.get_many(["user:1", "item:9"])
+
+        snapshot = cache.get_cache_metrics().snapshot()
+        assert snapshot["user"]["hits"] == {"redis": 2}
+        assert snapshot["user"]["misses"] == 1
+        assert snapshot["item"]["misses"] == 1
+
+        stats = await cache.get_cache_stats()
+        assert stats["prefixes"]["user"]["misses"] == 1
+
+
+class TestConnectionConfig:
+    """Test building Redis clients from Settings."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_standalone_pool_options(self) -> None:
+        """Verify pool size, blocking wait and health checks come from settings."""
+        from redis.asyncio import BlockingConnectionPool
+
+        config = Settings(
+            redis_max_connections=7,
+            redis_pool_blocking=True,
+            redis_pool_timeout=2.5,
+            redis_health_check_interval=15,
+        )
+        primary, replicas = cache.create_redis_clients(config)
+        try:
+            pool = primary.connection_pool
+            assert isinstance(pool, BlockingConnectionPool)
+            assert pool.max_connections == 7
+            assert pool.timeout == 2.5
+            assert pool.connection_kwargs["health_check_interval"] == 15
+            assert replicas == []
+        finally:
+            await primary.aclose()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replica_urls_used_only_when_enabled(self) -> None:
+        """Verify replica clients are built only with redis_read_from_replicas."""
+        urls = ["redis://replica-1:6379/0", "redis://replica-2:6379/0"]
+        _, replicas = cache.create_redis_clients(Settings(redis_replica_urls=urls))
+        assert replicas == []
+
+        primary, replicas = cache.create_redis_clients(
+            Settings(redis_replica_urls=urls, redis_read_from_replicas=True)
+        )
+        hosts = [r.connection_pool.connection_kwargs["host"] for r in replicas]
+        assert hosts == ["replica-1", "replica-2"]
+        for client in (primary, *replicas):
+            await client.aclose()
+
+    @pytest.mark.unit
+    def test_cluster_and_sentinel_modes(self) -> None:
+        """Verify Cluster and Sentinel clients are built without connecting."""
+        from redis.asyncio import RedisCluster
+        from redis.asyncio.sentinel import SentinelConnectionPool
+        from redis.cluster import LoadBalancingStrategy
+
+        cluster, replicas = cache.create_redis_clients(
+            Settings(redis_mode="cluster", redis_read_from_replicas=True)
+        )
+        assert isinstance(cluster, RedisCluster)
+        assert (
+            cluster.load_balancing_strategy
+            is LoadBalancingStrategy.ROUND_ROBIN_REPLICAS
+        )
+        assert replicas == []
+
+        with pytest.raises(ValueError, match="redis_sentinels"):
+            cache.create_redis_clients(Settings(redis_mode="sentinel"))
+
+        primary, replicas = cache.create_redis_clients(
+            Settings(
+                redis_mode="sentinel",
+                redis_url="redis://:secret@unused:6379/2",
+                redis_sentinels=["sentinel-1:26379", "sentinel-2:26379"],
+                redis_sentinel_service="cache",
+                redis_read_from_replicas=True,
+            )
+        )
+        pool = primary.connection_pool
+        assert isinstance(pool, SentinelConnectionPool)
+        assert pool.service_name == "cache"
+        assert pool.connection_kwargs["db"] == 2
+        assert len(replicas) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reads_routed_to_replicas(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify read_only calls use a replica unless client tracking is on."""
+        replica = fakeredis.aioredis.FakeRedis()
+        monkeypatch.setattr(cache, "_redis_replicas", [replica])
+
+        assert await cache.get_redis(read_only=True) is replica
+        assert await cache.get_redis() is fake_redis
+
+        monkeypatch.setattr(cache, "_tracking_local_ttl", 60)
+        assert await cache.get_redis(read_only=True) is fake_redis
+
+    @pytest.mark.unit
+    def test_settings_read_legacy_env_names(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify REDIS_URL and CACHE_MAX_CONNECTIONS are still honoured."""
+        monkeypatch.setenv("REDIS_URL", "redis://cache:6379/1")
+        monkeypatch.setenv("CACHE_MAX_CONNECTIONS", "20")
+
+        config = Settings()
+
+        assert config.redis_url == "redis://cache:6379/1"
+        assert config.redis_max_connections == 20
+
+    @pytest.mark.unit
+    def test_client_tracking_settings(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Verify client tracking is configured through Settings."""
+        monkeypatch.setenv("REDIS_CLIENT_TRACKING", "1")
+        monkeypatch.setenv("REDIS_CLIENT_TRACKING_PREFIXES", '["user:", "product:"]')
+
+        config = Settings()
+
+        assert config.redis_client_tracking is True
+        assert config.redis_client_tracking_prefixes == ["user:", "product:"]
+
+
+class TestStartup:
+    """Test lazy initialization, connection warm-up and the lifespan hook."""
+
+    @pytest.fixture
+    def uninitialized(self, monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+        """Start without clients; count how often they are created."""
+        created: list[Any] = []
+
+        def create_clients(config: Any = None) -> tuple[Any, list[Any]]:
+            client = fakeredis.aioredis.FakeRedis()
+            created.append(client)
+            return client, []
+
+        monkeypatch.setattr(cache, "_redis_pool", None)
+        monkeypatch.setattr(cache, "_redis_replicas", [])
+        monkeypatch.setattr(cache, "_tracking_task", None)
+        monkeypatch.setattr(cache, "_tracking_local_ttl", 0)
+        monkeypatch.setattr(cache, "create_redis_clients", create_clients)
+        return created
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_create_one_pool(
+        self, uninitialized: list[Any]
+    ) -> None:
+        """Verify a burst of first calls shares one client."""
+        clients = await asyncio.gather(*(cache.get_redis() for _ in range(20)))
+
+        assert len(uninitialized) == 1
+        assert all(client is uninitialized[0] for client in clients)
+
+    @pytest.mark.unit
+    def test_first_calls_from_threads_create_one_pool(
+        self, uninitialized: list[Any]
+    ) -> None:
+        """Verify threads racing the first call still create one client."""
+        barrier = threading.Barrier(8)
+
+        def first_call() -> None:
+            barrier.wait()
+            asyncio.run(cache.get_redis())
+
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(uninitialized) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_first_call_enables_client_tracking(
+        self, uninitialized: list[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify client tracking is enabled from settings on first use."""
+        enabled: list[Any] = []
+
+        async def enable(prefixes: Any = ()) -> None:
+            enabled.append(prefixes)
+
+        monkeypatch.setattr(cache, "enable_client_tracking", enable)
+        monkeypatch.setattr(cache.settings, "redis_client_tracking", True)
+        monkeypatch.setattr(cache.settings, "redis_client_tracking_prefixes", ["user:"])
+
+        await cache.get_redis()
+        await cache.get_redis()
+
+        assert enabled == [["user:"]]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_connections(self, uninitialized: list[Any]) -> None:
+        """Verify open_cache leaves the requested connections in the pool."""
+        await cache.open_cache(min_connections=4)
+
+        pool = uninitialized[0].connection_pool
+        assert len(pool._available_connections) == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_init_cache_wraps_app_lifespan(
+        self, uninitialized: list[Any]
+    ) -> None:
+        """Verify init_cache opens the cache around the app's own lifespan."""
+        from fastapi import FastAPI
+
+        events: list[str] = []
+
+        @contextlib.asynccontextmanager
+        async def app_lifespan(app: FastAPI) -> Any:
+            events.append("cache ready" if cache._redis_pool else "no cache")
+            yield
+            events.append("app stopped")
+
+        app = FastAPI(lifespan=app_lifespan)
+        cache.init_cache(app, min_connections=2)
+
+        async with app.router.lifespan_context(app):
+            assert cache._redis_pool is uninitialized[0]
+
+        assert events == ["cache ready", "app stopped"]
+        assert cache._redis_pool is None
+
+
+class UserNotFoundError(LookupError):
+    """Negative lookup result used by the negative caching tests."""
+
+
+class TestNegativeCaching:
+    """Test caching of None, negative results and exceptions."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_none_result_is_cached(self, fake_redis: Any) -> None:
+        """Verify a None result is a hit, not recomputed on every call."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="lookup")
+        async def lookup(uid: str) -> dict | None:
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await lookup("1") is None
+        assert await lookup("1") is None
+        assert calls == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_none_disabled(self, fake_redis: Any) -> None:
+        """Verify cache_none=False recomputes None results."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="lookup", cache_none=False)
+        async def lookup(uid: str) -> None:
+            nonlocal calls
+            calls += 1
+
+        await lookup("1")
+        await lookup("1")
+
+        assert calls == 2
+        assert await fake_redis.dbsize() == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_negative_results_use_negative_ttl(self, fake_redis: Any) -> None:
+        """Verify None and is_negative results expire after negative_ttl."""
+
+        @cache.cached(
+            ttl=3600, key_prefix="orders", negative_ttl=30, is_negative=lambda r: not r
+        )
+        async def get_orders(uid: str) -> list[int]:
+            return [1] if uid == "1" else []
+
+        await get_orders("1")
+        await get_orders("2")
+
+        ttls = {}
+        async for key in fake_redis.scan_iter("orders:*"):
+            ttls[key] = await fake_redis.ttl(key)
+        assert min(ttls.values()) <= 30
+        assert max(ttls.values()) > 3000
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_negative_exception_is_cached_and_reraised(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify listed exceptions are cached for negative_ttl and re-raised."""
+        calls = 0
+
+        @cache.cached(
+            ttl=3600,
+            key_prefix="profile",
+            local_ttl=60,
+            negative_ttl=30,
+            negative_exceptions=(UserNotFoundError,),
+        )
+        async def get_profile(uid: str) -> dict:
+            nonlocal calls
+            calls += 1
+            raise UserNotFoundError(uid)
+
+        for _ in range(2):
+            with pytest.raises(UserNotFoundError, match="42"):
+                await get_profile("42")
+
+        cache.get_local_cache().clear()  # next hit comes from Redis
+        with pytest.raises(UserNotFoundError) as excinfo:
+            await get_profile("42")
+
+        assert excinfo.value.args == ("42",)
+        assert calls == 1
+        [key] = [key async for key in fake_redis.scan_iter("profile:*")]
+        assert await fake_redis.ttl(key) <= 30
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_other_exceptions_are_not_cached(self, fake_redis: Any) -> None:
+        """Verify exceptions not listed propagate without being stored."""
+
+        @cache.cached(ttl=60, negative_exceptions=(UserNotFoundError,))
+        async def flaky(uid: str) -> dict:
+            raise TimeoutError
+
+        with pytest.raises(TimeoutError):
+            await flaky("1")
+
+        assert await fake_redis.dbsize() == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_error_lookalike_results_are_returned(self, fake_redis: Any) -> None:
+        """Verify a returned dict shaped like a cached error is not raised."""
+        lookalike = {"_cache_error": 1, "type": "builtins:LookupError", "args": []}
+
+        @cache.cached(
+            ttl=60,
+            key_builder=lambda: "lookalike",
+            local_ttl=10,
+            negative_exceptions=(UserNotFoundError,),
+        )
+        async def load() -> dict:
+            return lookalike
+
+        assert await load() == lookalike
+        cache.get_local_cache().clear()
+        assert await load() == lookalike
+
+    @pytest.mark.unit
+    def test_unlisted_subclass_decodes_as_base(self) -> None:
+        """Verify a stored subclass that isn't configured decodes as its base."""
+
+        class LocalNotFoundError(UserNotFoundError):
+            pass
+
+        stored = cache._encode_error(LocalNotFoundError("x"), (UserNotFoundError,))
+        error = cache._decode_error(stored, cache._error_types((UserNotFoundError,)))
+
+        assert type(error) is UserNotFoundError
+        assert error.args == ("x",)
+
+    @pytest.mark.unit
+    def test_stored_type_is_never_imported(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify a forged entry can't make the decoder import a module."""
+        import importlib
+
+        def refuse(name: str, package: str | None = None) -> Any:
+            pytest.fail(f"imported {name}")
+
+        monkeypatch.setattr(importlib, "import_module", refuse)
+        forged = cache._CachedError(
+            {
+                "type": "some_plugin.payload:Boom",
+                "base": "builtins:Exception",
+                "args": ["x"],
+            }
+        )
+
+        error = cache._decode_error(forged, cache._error_types((UserNotFoundError,)))
+
+        assert type(error) is UserNotFoundError
+
+
+class TestCircuitBreaker:
+    """Test the Redis circuit breaker."""
+
+    @pytest.mark.unit
+    def test_opens_after_threshold_within_window(self) -> None:
+        """Verify only connection errors inside the window open the circuit."""
+        from redis.exceptions import ResponseError
+
+        clock = FakeClock()
+        breaker = cache.CircuitBreaker(
+            failure_threshold=3, failure_window=10, clock=clock
+        )
+        breaker.record_error(RedisConnectionError())
+        breaker.record_error(ResponseError())  # server answered: not counted
+        clock.now += 11
+        breaker.record_error(RedisConnectionError())
+        breaker.record_error(RedisConnectionError())
+        assert breaker.state == "closed"
+
+        breaker.record_error(RedisConnectionError())
+        assert breaker.state == "open"
+        assert breaker.times_opened == 1
+
+    @pytest.mark.unit
+    def test_single_half_open_probe(self) -> None:
+        """Verify one probe is allowed after reset_timeout and decides the state."""
+        from redis.exceptions import TimeoutError as RedisTimeoutError
+
+        clock = FakeClock()
+        breaker = cache.CircuitBreaker(
+            failure_threshold=1, reset_timeout=5, clock=clock
+        )
+        breaker.record_error(RedisTimeoutError())
+        assert not breaker.try_acquire_probe()
+
+        clock.now += 5
+        assert breaker.try_acquire_probe()
+        assert breaker.state == "half_open"
+        assert not breaker.try_acquire_probe()
+
+        breaker.record_probe(success=False)
+        assert breaker.state == "open"
+        clock.now += 5
+        assert breaker.try_acquire_probe()
+        breaker.record_probe(success=True)
+        assert breaker.state == "closed"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_redis(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify cached() falls back without touching Redis while open."""
+        redis_calls = 0
+
+        async def unreachable(*args: Any, **kwargs: Any) -> Any:
+            nonlocal redis_calls
+            redis_calls += 1
+            raise RedisConnectionError
+
+        monkeypatch.setattr(fake_redis, "get", unreachable)
+        logged: list[tuple[str, str]] = []
+
+        class RecordingLogger:
+            def __getattr__(self, level: str) -> Any:
+                return lambda event, **fields: logged.append((level, event))
+
+        monkeypatch.setattr(cache, "logger", RecordingLogger())
+
+        @cache.cached(ttl=60, key_prefix="report")
+        async def report() -> str:
+            return "computed"
+
+        for _ in range(10):
+            assert await report() == "computed"
+
+        assert redis_calls == 5  # default threshold, then fail fast
+        assert logged.count(("warning", "cache_error")) == 5
+        assert logged.count(("warning", "cache_circuit_opened")) == 1
+        assert logged.count(("debug", "cache_error")) == 5
+        assert cache.get_circuit_breaker().state == "open"
+        with pytest.raises(cache.CacheUnavailableError):
+            await cache.get_redis()
+        assert "cache_circuit_state 2" in cache.get_cache_metrics().render_prometheus()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_closes_circuit_when_redis_recovers(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify a successful PING after reset_timeout closes the circuit."""
+        clock = FakeClock()
+        breaker = cache.CircuitBreaker(
+            failure_threshold=1, reset_timeout=5, clock=clock
+        )
+        monkeypatch.setattr(cache, "_circuit_breaker", breaker)
+        breaker.record_error(RedisConnectionError())
+
+        clock.now += 5
+        assert await cache.get_redis() is fake_redis
+        assert breaker.state == "closed"
+
+
+class TestPatternInvalidation:
+    """Test streaming, batched pattern invalidation."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unlinks_in_bounded_concurrent_batches(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify batches respect batch_size and max_concurrency."""
+        async with fake_redis.pipeline(transaction=False) as pipe:
+            for i in range(1050):
+                pipe.set(f"user:{i}", b"x")
+            pipe.set("item:1", b"x")
+            await pipe.execute()
+
+        in_flight = 0
+        peak = 0
+        batch_sizes: list[int] = []
+        unlinked: set[bytes] = set()
+
+        # Record instead of deleting: fakeredis's SCAN cursor (unlike Redis's)
+        # skips keys when earlier ones are deleted mid-scan
+        async def tracked_unlink(*keys: bytes) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            batch_sizes.append(len(keys))
+            await asyncio.sleep(0)
+            unlinked.update(keys)
+            in_flight -= 1
+            return len(keys)
+
+        monkeypatch.setattr(fake_redis, "unlink", tracked_unlink)
+        progress: list[tuple[int, int]] = []
+
+        deleted = await cache.invalidate_pattern(
+            "user:*",
+            batch_size=100,
+            max_concurrency=3,
+            on_progress=lambda scanned, done: progress.append((scanned, done)),
+        )
+
+        assert deleted == 1050
+        assert max(batch_sizes) <= 100
+        assert sum(batch_sizes) == 1050
+        assert peak <= 3
+        assert progress[-1] == (1050, 1050)
+        assert unlinked == {f"user:{i}".encode() for i in range(1050)}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_batch_stops_the_scan(
+        self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify a Redis error midway returns the count deleted so far."""
+        for i in range(30):
+            await fake_redis.set(f"user:{i}", b"x")
+
+        unlink = fake_redis.unlink
+        calls = 0
+
+        async def failing_unlink(*keys: Any) -> int:
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise RedisConnectionError
+            return await unlink(*keys)
+
+        monkeypatch.setattr(fake_redis, "unlink", failing_unlink)
+
+        deleted = await cache.invalidate_pattern(
+            "user:*", batch_size=10, max_concurrency=1
+        )
+
+        assert deleted == 10
+        assert calls == 2
+
+
+class TestWarmupRegistry:
+    """Test the warm-up registry and atomic warm_cache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warm_cache_does_not_overwrite_concurrent_set(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify a value stored while the loader ran is kept (SET NX)."""
+
+        async def loader() -> str:
+            await fake_redis.set("config", cache.get_codec().encode("fresh"))
+            return "stale"
+
+        assert await cache.warm_cache("config", loader) is False
+        assert await cache.get_cached("config") == "fresh"
+
+        assert await cache.warm_cache("config", loader, force=True) is True
+        assert await cache.get_cached("config") == "stale"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_warms_by_priority_with_bounded_concurrency(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify priority order, the concurrency limit and the report."""
+        registry = cache.WarmupRegistry()
+        started: list[str] = []
+        running = peak = 0
+
+        def loader(name: str) -> Any:
+            async def load() -> str:
+                nonlocal running, peak
+                started.append(name)
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return name
+
+            return load
+
+        for priority in range(6):
+            registry.register(f"k{priority}", loader(f"k{priority}"), priority=priority)
+        await fake_redis.set("k0", cache.get_codec().encode("cached"))
+
+        report = await registry.run(concurrency=2)
+
+        assert started == ["k5", "k4", "k3", "k2", "k1"]
+        assert peak == 2
+        assert report.count("warmed") == 5
+        assert report.count("skipped") == 1
+        assert all(result.seconds >= 0.01 for result in report.slowest(5))
+        assert await cache.get_cached("k5") == "k5"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_budget_and_failures_are_reported(self, fake_redis: Any) -> None:
+        """Verify slow and failing loaders don't hold up the run."""
+        registry = cache.WarmupRegistry()
+
+        @registry.warmer("slow", priority=2)
+        async def slow() -> str:
+            await asyncio.sleep(0.3)
+            return "slow"
+
+        @registry.warmer("broken", priority=1)
+        async def broken() -> str:
+            msg = "db down"
+            raise RuntimeError(msg)
+
+        @registry.warmer("late")
+        async def late() -> str:
+            return "late"
+
+        report = await registry.run(concurrency=1, budget=0.05)
+
+        statuses = {result.key: result.status for result in report.results}
+        assert statuses == {
+            "slow": "timeout",
+            "broken": "not_started",
+            "late": "not_started",
+        }
+        assert report.seconds < 0.5
+
+        report = await registry.run(concurrency=2)
+        errors = {result.key: result.error for result in report.results}
+        assert errors["broken"] == "RuntimeError: db down"
+        assert await cache.get_cached("late") == "late"
+
+
+class TestMemoryBackend:
+    """Test the cache API running on the in-memory backend."""
+
+    @pytest.fixture
+    def memory_redis(self, fake_redis: Any, monkeypatch: pytest.MonkeyPatch) -> Any:
+        """Replace the fakeredis client with one built for redis_mode=memory."""
+        client, replicas = cache.create_redis_clients(Settings(redis_mode="memory"))
+        assert isinstance(client, cache.MemoryRedis)
+        assert replicas == []
+        monkeypatch.setattr(cache, "_redis_pool", client)
+        return client
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cached_with_tags_namespace_and_lock(self, memory_redis: Any) -> None:
+        """Verify the decorator's Redis features work without a server."""
+        calls = 0
+
+        @cache.cached(
+            ttl=60,
+            key_prefix="orders",
+            lock_ttl=5,
+            tags=lambda uid: [f"user:{uid}"],
+            namespace="orders",
+        )
+        async def get_orders(uid: str) -> list[str]:
+            nonlocal calls
+            calls += 1
+            return [f"{uid}-1"]
+
+        assert await get_orders("u1") == ["u1-1"]
+        assert await get_orders("u1") == ["u1-1"]
+        assert calls == 1
+        # The recompute lock was released via the compare-and-delete script
+        assert not [key async for key in memory_redis.scan_iter(match="*:lock")]
+
+        assert await cache.invalidate_tags("user:u1") == 1
+        await get_orders("u1")
+        await cache.invalidate_namespace("orders")
+        await get_orders("u1")
+        assert calls == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pattern_invalidation_and_batches(self, memory_redis: Any) -> None:
+        """Verify invalidate_pattern, batch operations and stats."""
+        await cache.set_many({f"user:{i}": i for i in range(10)}, ttl=60)
+        await cache.set_cached("order:1", "x")
+
+        assert await cache.get_many(["user:3", "user:99"]) == {"user:3": 3}
+        assert await cache.invalidate_pattern("user:*", batch_size=4) == 10
+        assert await cache.get_cached("order:1") == "x"
+
+        stats = await cache.get_cache_stats()
+        assert stats["hits"] >= 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_tracking_is_refused(self, memory_redis: Any) -> None:
+        """Verify client tracking reports the backend can't support it."""
+        with pytest.raises(cache.RedisError, match="memory backend"):
+            await cache.enable_client_tracking()
+
+    @pytest.mark.unit
+    def test_fakeredis_mode(self) -> None:
+        """Verify redis_mode=fakeredis builds a fakeredis client."""
+        client, _ = cache.create_redis_clients(Settings(redis_mode="fakeredis"))
+
+        assert isinstance(client, fakeredis.aioredis.FakeRedis)
+
+
+class TestEntrySizeLimit:
+    """Test the oversized entry policies."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_skip_policy(self, fake_redis: Any) -> None:
+        """Verify oversized results are returned but not cached."""
+        calls = 0
+
+        @cache.cached(ttl=60, key_prefix="export", max_entry_bytes=100)
+        async def export() -> str:
+            nonlocal calls
+            calls += 1
+            return "x" * 500
+
+        assert await export() == "x" * 500
+        assert await export() == "x" * 500
+
+        assert calls == 2
+        assert await fake_redis.dbsize() == 0
+        oversized = cache.get_cache_metrics().snapshot()["export"]["oversized"]
+        assert oversized == {"skipped": 2}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_compress_policy(self, fake_redis: Any) -> None:
+        """Verify oversized entries are compressed, or skipped if still too big."""
+        cache.configure_entry_size_limit(200, "compress")
+
+        assert await cache.set_cached("report:1", "abc" * 1000) is True
+        assert len(await fake_redis.get("report:1")) <= 200
+        assert await cache.get_cached("report:1") == "abc" * 1000
+
+        random_text = secrets.token_hex(500)
+        assert await cache.set_cached("report:2", random_text) is False
+
+        oversized = cache.get_cache_metrics().snapshot()["report"]["oversized"]
+        assert oversized == {"compressed": 1, "skipped": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_chunk_policy(self, fake_redis: Any) -> None:
+        """Verify chunked entries round-trip and count as misses once broken."""
+        calls = 0
+        rows = [{"id": i, "memo": "payment"} for i in range(200)]
+
+        cache.configure_entry_size_limit(1024, "chunk", chunk_bytes=1024)
+
+        @cache.cached(ttl=60, key_builder=lambda: "ledger:today")
+        async def ledger() -> list[dict[str, Any]]:
+            nonlocal calls
+            calls += 1
+            return rows
+
+        assert await ledger() == rows
+        assert await ledger() == rows
+        assert calls == 1
+
+        chunk_keys = [key async for key in fake_redis.scan_iter("ledger:today:chunk:*")]
+        assert len(chunk_keys) > 1
+        assert len(await fake_redis.get("ledger:today")) < 64
+        assert await cache.get_cached("ledger:today") == rows
+        assert await cache.get_many(["ledger:today"]) == {"ledger:today": rows}
+
+        # A lost chunk turns the entry into a miss rather than corrupt data
+        await fake_redis.delete(chunk_keys[0])
+        assert await ledger() == rows
+        assert calls == 2
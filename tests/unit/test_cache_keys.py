@@ -0,0 +1,170 @@
+"""Unit tests for cache key building in template_sample.core.cache_keys."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import time
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from template_sample.core.cache_keys import canonical_bytes, make_key_builder
+
+
+async def get_orders(user_id: str, status: str = "open", *, limit: int = 10) -> list:
+    """Sample cached function."""
+    return []
+
+
+@dataclasses.dataclass
+class Filter:
+    """Sample dataclass argument."""
+
+    field: str
+    value: int
+
+
+class TestMakeKeyBuilder:
+    """Test argument normalization and hashing."""
+
+    @pytest.mark.unit
+    def test_equivalent_calls_share_a_key(self) -> None:
+        """Verify positional, keyword and defaulted forms normalize together."""
+        build_key = make_key_builder(get_orders, prefix="orders")
+
+        key = build_key("1")
+        assert build_key("1", "open") == key
+        assert build_key(user_id="1", limit=10) == key
+        assert build_key("1", status="open", limit=10) == key
+        assert build_key("1", limit=11) != key
+
+    @pytest.mark.unit
+    def test_key_format_and_digest_size(self) -> None:
+        """Verify keys are prefix plus a hex digest of the configured width."""
+        prefix, digest = make_key_builder(get_orders)("1").split(":")
+        short = make_key_builder(get_orders, digest_size=8)("1")
+
+        assert prefix == "get_orders"
+        assert len(digest) == 32
+        assert len(short.split(":")[1]) == 16
+
+    @pytest.mark.unit
+    def test_self_is_keyed_by_default(self) -> None:
+        """Verify methods are keyed per instance unless sharing is opted in."""
+
+        class Repo:
+            def __init__(self, db: str) -> None:
+                self.db = db
+
+            def __cache_key__(self) -> str:
+                return self.db
+
+            def find(self, item_id: int) -> None:
+                return None
+
+        per_instance = make_key_builder(Repo.find)
+        shared = make_key_builder(Repo.find, ignore_self=True)
+
+        assert per_instance(Repo("a"), 1) == per_instance(Repo("a"), 1)
+        assert per_instance(Repo("a"), 1) != per_instance(Repo("b"), 1)
+        assert shared(Repo("a"), 1) == shared(Repo("b"), 1)
+
+    @pytest.mark.unit
+    def test_variadic_signatures_use_bind(self) -> None:
+        """Verify *args/**kwargs functions are keyed on all their arguments."""
+
+        def search(*terms: str, **filters: Any) -> None:
+            return None
+
+        build_key = make_key_builder(search)
+
+        assert build_key("a", "b", x=1) == build_key("a", "b", x=1)
+        assert build_key("a", "b") != build_key("b", "a")
+
+    @pytest.mark.unit
+    def test_invalid_arguments_raise_type_error(self) -> None:
+        """Verify calls the function would reject raise like the call would."""
+        build_key = make_key_builder(get_orders)
+
+        with pytest.raises(TypeError):
+            build_key()
+        with pytest.raises(TypeError):
+            build_key("1", unknown=True)
+
+
+class TestCanonicalBytes:
+    """Test the canonical argument encoding."""
+
+    @pytest.mark.unit
+    def test_dict_and_set_order_do_not_matter(self) -> None:
+        """Verify mapping and set ordering does not change the encoding."""
+        assert canonical_bytes({"a": 1, "b": 2}) == canonical_bytes({"b": 2, "a": 1})
+        assert canonical_bytes({3, 1, 2}) == canonical_bytes({2, 3, 1})
+
+    @pytest.mark.unit
+    def test_types_are_distinguished(self) -> None:
+        """Verify values with the same text but different types differ."""
+        encodings = {
+            canonical_bytes(value)
+            for value in ("1", 1, 1.0, True, Decimal(1), b"1", {"1"}, None)
+        }
+
+        assert len(encodings) == 8
+
+    @pytest.mark.unit
+    def test_dataclasses_and_cache_key_hook(self) -> None:
+        """Verify dataclasses encode by value and __cache_key__ is honoured."""
+
+        class Tenant:
+            def __init__(self, tenant_id: str) -> None:
+                self.tenant_id = tenant_id
+
+            def __cache_key__(self) -> str:
+                return self.tenant_id
+
+        assert canonical_bytes(Filter("a", 1)) == canonical_bytes(Filter("a", 1))
+        assert canonical_bytes(Filter("a", 1)) != canonical_bytes(Filter("a", 2))
+        assert canonical_bytes(Tenant("t1")) == canonical_bytes(Tenant("t1"))
+        assert canonical_bytes(Tenant) == canonical_bytes(Tenant)
+        assert canonical_bytes(Filter) != canonical_bytes(Tenant)
+
+    @pytest.mark.unit
+    def test_unencodable_values_fall_back_to_repr(self) -> None:
+        """Verify values neither JSON encoder accepts still get a stable key."""
+        build_key = make_key_builder(get_orders)
+
+        assert canonical_bytes({(1, 2): "a"}) == b'["repr","{(1, 2): \'a\'}"]'
+        assert build_key({(1, 2): "a"}) == build_key({(1, 2): "a"})
+        assert build_key({(1, 2): "a"}) != build_key({(1, 3): "a"})
+
+
+class TestKeyBuilderPerformance:
+    """Compare the key builder with the previous repr/md5 builder."""
+
+    @staticmethod
+    def legacy_key(*args: Any, **kwargs: Any) -> str:
+        """Reproduce the previous default key builder."""
+        key_data = f"{args}:{sorted(kwargs.items())}"
+        key_hash = hashlib.md5(key_data.encode(), usedforsecurity=False).hexdigest()
+        return f"get_orders:{key_hash[:8]}"
+
+    @pytest.mark.perf
+    def test_large_arguments_are_faster_than_repr(self) -> None:
+        """Verify large arguments are keyed faster than with repr()."""
+        build_key = make_key_builder(get_orders)
+        big = {"ids": list(range(20_000)), "note": "x" * 10_000}
+        rounds = 50
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self.legacy_key("1", status=big)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            build_key("1", status=big)
+        current = time.perf_counter() - start
+
+        assert current < legacy, f"legacy={legacy:.4f}s new={current:.4f}s"
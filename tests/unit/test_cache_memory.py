@@ -0,0 +1,234 @@
+"""Unit tests for the in-memory cache backend."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+pytest.importorskip("redis")
+
+from redis.exceptions import ResponseError
+
+from template_sample.core.cache_memory import (
+    KeyIndex,
+    MemoryRedis,
+    MemoryStore,
+)
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestKeyIndex:
+    """Test the sorted key index used for pattern scans."""
+
+    @pytest.mark.unit
+    def test_iter_prefix_and_discard(self) -> None:
+        """Verify prefix ranges, including prefixes ending in 0xff."""
+        index = KeyIndex()
+        for key in (b"user:1", b"user:10", b"user:2", b"order:1", b"a\xff", b"b"):
+            index.add(key)
+        index.add(b"user:1")
+
+        assert list(index.iter_prefix(b"user:1")) == [b"user:1", b"user:10"]
+        assert list(index.iter_prefix(b"a\xff")) == [b"a\xff"]
+        assert list(index.iter_prefix(b"missing")) == []
+
+        index.discard(b"user:1")
+        index.discard(b"never-added")
+
+        assert len(index) == 5
+        assert list(index.iter_prefix(b"user:")) == [b"user:10", b"user:2"]
+        assert list(index.iter_prefix()) == [
+            b"a\xff",
+            b"b",
+            b"order:1",
+            b"user:10",
+            b"user:2",
+        ]
+
+    @pytest.mark.unit
+    def test_prefixes_span_sublists(self) -> None:
+        """Verify splits and removals keep the index sorted and searchable."""
+        rng = random.Random(7)
+        index = KeyIndex(load=4)
+        expected: set[bytes] = set()
+        for _ in range(2000):
+            key = b"k:%d:%d" % (rng.randrange(20), rng.randrange(50))
+            if rng.random() < 0.3:
+                index.discard(key)
+                expected.discard(key)
+            else:
+                index.add(key)
+                expected.add(key)
+
+        assert len(index) == len(expected)
+        assert list(index.iter_prefix()) == sorted(expected)
+        for prefix in (b"k:1", b"k:1:", b"k:19:4", b"x"):
+            assert list(index.iter_prefix(prefix)) == sorted(
+                key for key in expected if key.startswith(prefix)
+            )
+
+
+class TestMemoryStore:
+    """Test expiry, eviction and scans of the backing store."""
+
+    @pytest.mark.unit
+    def test_expired_keys_are_purged_through_the_heap(self) -> None:
+        """Verify expiry on read and bulk purging, ignoring superseded TTLs."""
+        clock = FakeClock()
+        store = MemoryStore(clock=clock)
+        store.set(b"short", b"1", ttl=5)
+        store.set(b"long", b"2", ttl=50)
+        store.set(b"reset", b"3", ttl=5)
+        store.set(b"reset", b"3", ttl=50)
+
+        clock.now = 10
+        assert store.get(b"short") is None
+        assert store.purge_expired() == 0
+        assert sorted(store.scan()) == [b"long", b"reset"]
+
+        clock.now = 60
+        assert store.purge_expired() == 2
+        assert len(store) == 0
+        assert store.used_bytes == 0
+
+    @pytest.mark.unit
+    def test_lru_eviction_by_entries_and_bytes(self) -> None:
+        """Verify least recently used keys go first when a limit is hit."""
+        store = MemoryStore(max_entries=2)
+        store.set(b"a", b"1")
+        store.set(b"b", b"2")
+        store.get(b"a")
+        store.set(b"c", b"3")
+
+        assert sorted(store.scan()) == [b"a", b"c"]
+        assert store.evictions == 1
+
+        store = MemoryStore(max_bytes=15)
+        store.set(b"a", b"x" * 8)
+        store.set(b"b", b"x" * 8)
+
+        assert store.scan() == [b"b"]
+
+    @pytest.mark.unit
+    def test_used_bytes_tracks_actual_memory(self) -> None:
+        """Verify used_bytes, which max_bytes limits, includes bookkeeping."""
+        tracemalloc = pytest.importorskip("tracemalloc")
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            store = MemoryStore()
+            for i in range(5000):
+                key = f"user:{i:08d}:profile:abcdefghijklmn".encode()
+                store.set(key, b"%020d" % i, ttl=60)
+            store.add_members(b"tag", [b"member-%d" % i for i in range(1000)])
+            allocated = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+        assert 0.7 < store.used_bytes / allocated < 1.3
+
+        store.flush()
+        assert store.used_bytes == 0
+
+    @pytest.mark.unit
+    def test_scan_matches_glob_under_prefix(self) -> None:
+        """Verify glob patterns, including ones with no literal prefix."""
+        store = MemoryStore()
+        for key in (b"user:1:profile", b"user:1:orders", b"user:2:profile"):
+            store.set(key, b"x")
+
+        assert sorted(store.scan(b"user:1:*")) == [b"user:1:orders", b"user:1:profile"]
+        assert sorted(store.scan(b"*:profile")) == [
+            b"user:1:profile",
+            b"user:2:profile",
+        ]
+        assert store.scan(b"user:?:orders") == [b"user:1:orders"]
+
+    @pytest.mark.unit
+    def test_types_and_counters(self) -> None:
+        """Verify sets, INCR and WRONGTYPE errors."""
+        store = MemoryStore()
+        assert store.add_members(b"tag", [b"a", b"b", b"a"]) == 2
+        assert store.incr(b"n") == 1
+        assert store.incr(b"n", 5) == 6
+
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            store.get(b"tag")
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            store.add_members(b"n", [b"c"])
+        assert store.type(b"tag") == "set"
+        assert store.type(b"missing") == "none"
+
+
+class TestMemoryRedis:
+    """Test the redis-py compatible adapter."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_string_commands(self) -> None:
+        """Verify SET options and return values match redis-py."""
+        client = MemoryRedis()
+
+        assert await client.set("k", "v", ex=60) is True
+        assert await client.set("k", "other", nx=True) is None
+        assert await client.set("missing", "v", xx=True) is None
+        assert await client.get("k") == b"v"
+        assert await client.mget(["k", "missing"]) == [b"v", None]
+        assert await client.ttl("k") == 60
+        assert await client.exists("k", "k", "missing") == 2
+        assert await client.delete("k", "missing") == 1
+        assert await client.ttl("k") == -2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_expire_options(self) -> None:
+        """Verify EXPIRE NX/GT as used for tag set TTLs."""
+        client = MemoryRedis()
+        await client.sadd("tag", "a")
+
+        assert await client.expire("tag", 10, nx=True) is True
+        assert await client.expire("tag", 100, nx=True) is False
+        assert await client.expire("tag", 5, gt=True) is False
+        assert await client.expire("tag", 50, gt=True) is True
+        assert await client.ttl("tag") == 50
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pipeline_and_scans(self) -> None:
+        """Verify pipelined writes and SCAN/SSCAN iteration."""
+        client = MemoryRedis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.setex("a:1", 60, b"x")
+            pipe.setex("a:2", 60, b"y")
+            pipe.sadd("tag", "a:1", "a:2")
+            results = await pipe.execute()
+
+        assert results == [True, True, 2]
+        assert sorted([key async for key in client.scan_iter(match="a:*")]) == [
+            b"a:1",
+            b"a:2",
+        ]
+        assert [key async for key in client.scan_iter(_type="set")] == [b"tag"]
+        assert sorted([m async for m in client.sscan_iter("tag")]) == [b"a:1", b"a:2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unregistered_script_is_rejected(self) -> None:
+        """Verify eval only runs scripts with a Python equivalent."""
+        client = MemoryRedis()
+
+        with pytest.raises(ResponseError, match="NOSCRIPT"):
+            await client.eval("return 1", 0)
@@ -0,0 +1,69 @@
+"""Unit tests for in-process cache metrics."""
+
+from __future__ import annotations
+
+import pytest
+
+from template_sample.core.cache_metrics import CacheMetrics, Histogram
+
+
+class TestHistogram:
+    """Test fixed-bucket histograms."""
+
+    @pytest.mark.unit
+    def test_bucket_bounds_are_inclusive(self) -> None:
+        """Verify values equal to a bound land in that bucket (le semantics)."""
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [2, 3, 4]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(6.0)
+
+
+class TestCacheMetrics:
+    """Test counters, snapshots and Prometheus export."""
+
+    @pytest.mark.unit
+    def test_snapshot_groups_by_prefix(self) -> None:
+        """Verify snapshot() reports counters and histogram totals per prefix."""
+        metrics = CacheMetrics()
+        metrics.inc("hits", "user", tier="local")
+        metrics.inc("hits", "user", tier="redis", amount=2)
+        metrics.inc("misses", "user")
+        metrics.observe("compute_seconds", "user", 0.25)
+
+        assert metrics.snapshot() == {
+            "user": {
+                "hits": {"local": 1, "redis": 2},
+                "misses": 1,
+                "compute_seconds": {"count": 1, "sum": 0.25},
+            }
+        }
+
+    @pytest.mark.unit
+    def test_disabled_records_nothing(self) -> None:
+        """Verify a disabled instance ignores every call."""
+        metrics = CacheMetrics(enabled=False)
+        metrics.inc("hits", "user", tier="redis")
+        metrics.observe("payload_bytes", "user", 100)
+
+        assert metrics.snapshot() == {}
+
+    @pytest.mark.unit
+    def test_render_prometheus(self) -> None:
+        """Verify the text exposition format, including label escaping."""
+        metrics = CacheMetrics()
+        metrics.inc("hits", 'we"ird', tier="redis")
+        metrics.observe("payload_bytes", "user", 100)
+
+        text = metrics.render_prometheus()
+
+        assert "# TYPE cache_hits_total counter" in text
+        assert 'cache_hits_total{prefix="we\\"ird",tier="redis"} 1' in text
+        assert 'cache_payload_bytes_bucket{prefix="user",le="64"} 0' in text
+        assert 'cache_payload_bytes_bucket{prefix="user",le="256"} 1' in text
+        assert 'cache_payload_bytes_bucket{prefix="user",le="+Inf"} 1' in text
+        assert 'cache_payload_bytes_count{prefix="user"} 1' in text
+        assert text.endswith("\n")
@@ -0,0 +1,247 @@
+"""Unit tests for the streaming file pipeline in template_sample.jobs.file_pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from template_sample.jobs import file_pipeline
+from template_sample.jobs.file_pipeline import (
+    OffsetCheckpoint,
+    RecordBatch,
+    iter_batches,
+    iter_records,
+    run_file_pipeline,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _write_lines(path: Path, count: int) -> Path:
+    path.write_bytes(b"".join(b"%d,name-%d\n" % (i, i) for i in range(count)))
+    return path
+
+
+def _ids(records: list[bytes]) -> list[int]:
+    return [int(record.split(b",")[0]) for record in records]
+
+
+class ShuffledPool:
+    """Process pool stand-in whose results complete out of order."""
+
+    def __init__(self) -> None:
+        """Start with no calls."""
+        self.calls = 0
+
+    async def run(self, fn: Any, *args: Any) -> Any:
+        """Run fn after a delay that is longer for earlier calls."""
+        self.calls += 1
+        await asyncio.sleep(0.01 * (5 - self.calls % 5))
+        return fn(*args)
+
+
+class TestIterRecords:
+    """Test the chunked record reader."""
+
+    @pytest.mark.unit
+    def test_records_span_chunks(self, tmp_path: Path) -> None:
+        """Verify CRLF, blank lines, a missing final EOL and tiny chunks."""
+        path = tmp_path / "upload.csv"
+        path.write_bytes(b"alpha\r\n\nbeta,gamma\nlast")
+
+        records = list(iter_records(path, chunk_size=3))
+
+        assert records == [(7, b"alpha"), (19, b"beta,gamma"), (23, b"last")]
+        assert list(iter_records(path, 7, chunk_size=4)) == records[1:]
+
+    @pytest.mark.unit
+    def test_quoted_newlines_stay_in_the_record(self, tmp_path: Path) -> None:
+        """Verify quoted newlines and escaped quotes, split across chunks."""
+        path = tmp_path / "upload.csv"
+        path.write_bytes(b'1,"a\r\n\nb"\n2,"say ""hi""\n"\n3,c\n')
+
+        records = list(iter_records(path, chunk_size=2, quote=b'"'))
+
+        assert records == [
+            (10, b'1,"a\r\n\nb"'),
+            (26, b'2,"say ""hi""\n"'),
+            (30, b"3,c"),
+        ]
+        assert list(iter_records(path, 10, quote=b'"')) == records[1:]
+        assert len(list(iter_records(path))) == 5
+
+    @pytest.mark.unit
+    def test_batches_cover_the_file(self, tmp_path: Path) -> None:
+        """Verify batch offsets are contiguous and resumable."""
+        path = _write_lines(tmp_path / "upload.csv", 25)
+
+        batches = list(iter_batches(path, batch_size=10, chunk_size=16))
+
+        assert [len(batch.records) for batch in batches] == [10, 10, 5]
+        assert batches[0].start == 0
+        assert batches[1].start == batches[0].end
+        assert batches[-1].end == path.stat().st_size
+        resumed = next(iter_batches(path, batches[1].end, batch_size=10))
+        assert resumed == batches[2]
+
+
+class TestRunFilePipeline:
+    """Test the parse/transform/write pipeline."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_writes_in_file_order(self, tmp_path: Path) -> None:
+        """Verify out-of-order transforms are still written in order."""
+        path = _write_lines(tmp_path / "upload.csv", 95)
+        written: list[int] = []
+
+        async def write(ids: list[int], batch: RecordBatch) -> None:
+            written.extend(ids)
+
+        result = await run_file_pipeline(
+            path,
+            _ids,
+            write,
+            pool=ShuffledPool(),  # type: ignore[arg-type]
+            batch_size=10,
+            chunk_size=64,
+        )
+
+        assert written == list(range(95))
+        assert (result.records, result.batches, result.end) == (
+            95,
+            10,
+            path.stat().st_size,
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slow_writer_applies_backpressure(self, tmp_path: Path) -> None:
+        """Verify a stalled writer stops the reader after a few batches."""
+        path = _write_lines(tmp_path / "upload.csv", 1000)
+        release = asyncio.Event()
+        transformed = 0
+
+        def count(records: list[bytes]) -> int:
+            nonlocal transformed
+            transformed += 1
+            return len(records)
+
+        async def write(size: int, batch: RecordBatch) -> None:
+            await release.wait()
+
+        run = asyncio.ensure_future(
+            run_file_pipeline(path, count, write, batch_size=10, queue_size=2)
+        )
+        await asyncio.sleep(0.1)
+
+        assert transformed <= 4
+        release.set()
+        assert (await asyncio.wait_for(run, timeout=5)).records == 1000
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stage_errors_stop_the_pipeline(self, tmp_path: Path) -> None:
+        """Verify a failing transform surfaces and nothing after it is written."""
+        path = _write_lines(tmp_path / "upload.csv", 100)
+        written: list[int] = []
+
+        def transform(records: list[bytes]) -> list[int]:
+            if b"30,name-30" in records:
+                raise ValueError("bad row")
+            return _ids(records)
+
+        async def write(ids: list[int], batch: RecordBatch) -> None:
+            written.extend(ids)
+
+        with pytest.raises(ValueError, match="bad row"):
+            await run_file_pipeline(path, transform, write, batch_size=10)
+
+        assert written == list(range(30))
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reader_is_closed_on_failure(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify the batch generator is closed when a later stage fails."""
+        path = _write_lines(tmp_path / "upload.csv", 10)
+        closed = asyncio.Event()
+
+        def endless(*args: Any, **kwargs: Any) -> Any:
+            try:
+                while True:
+                    yield RecordBatch(0, 1, [b"0,name-0"])
+            finally:
+                closed.set()
+
+        async def write(ids: list[int], batch: RecordBatch) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(file_pipeline, "iter_batches", endless)
+
+        with pytest.raises(OSError, match="disk full"):
+            await run_file_pipeline(path, _ids, write)
+
+        assert closed.is_set()
+
+
+class TestCheckpointResume:
+    """Test resuming a failed run from its checkpoint."""
+
+    @pytest.fixture
+    def redis(self) -> Any:
+        """Create a fakeredis client.
+
+        Returns:
+            Async fakeredis client
+        """
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.aioredis.FakeRedis()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retry_resumes_after_last_written_batch(
+        self, tmp_path: Path, redis: Any
+    ) -> None:
+        """Verify a retry skips written batches and clears the checkpoint."""
+        path = _write_lines(tmp_path / "upload.csv", 50)
+        checkpoint = OffsetCheckpoint(redis, "upload:checkpoint:f1")
+        written: list[int] = []
+        fail_at = 20
+
+        async def write(ids: list[int], batch: RecordBatch) -> None:
+            if fail_at in ids:
+                raise ConnectionError("database went away")
+            written.extend(ids)
+
+        with pytest.raises(ConnectionError):
+            await run_file_pipeline(
+                path, _ids, write, checkpoint=checkpoint, batch_size=10
+            )
+        offset, records = await checkpoint.load(path.stat().st_size)
+        assert records == 20
+        assert offset == len(b"".join(b"%d,name-%d\n" % (i, i) for i in range(20)))
+
+        fail_at = -1
+        result = await run_file_pipeline(
+            path, _ids, write, checkpoint=checkpoint, batch_size=10
+        )
+
+        assert written == list(range(50))
+        assert (result.records, result.batches, result.resumed_from) == (50, 3, offset)
+        assert await redis.exists("upload:checkpoint:f1") == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_changed_file_restarts(self, tmp_path: Path, redis: Any) -> None:
+        """Verify a checkpoint for a file of another size is ignored."""
+        checkpoint = OffsetCheckpoint(redis, "upload:checkpoint:f2", ttl=60)
+        await checkpoint.save(100, 10, size=500)
+
+        assert await checkpoint.load(500) == (100, 10)
+        assert await checkpoint.load(400) == (0, 0)
+        assert 0 < await redis.ttl("upload:checkpoint:f2") <= 60
@@ -0,0 +1,57 @@
+"""Unit tests for health check endpoints."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("redis")
+fakeredis = pytest.importorskip("fakeredis")
+
+from redis.exceptions import ConnectionError as RedisConnectionError  # noqa: E402
+
+from template_sample.api import health  # noqa: E402
+from template_sample.core import cache  # noqa: E402
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Install a fakeredis client and a fresh circuit breaker."""
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(cache, "_redis_pool", client)
+    monkeypatch.setattr(cache, "_circuit_breaker", cache.CircuitBreaker())
+    return client
+
+
+class TestCacheCheck:
+    """Test the cache readiness check."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reports_reachable_cache(self, fake_redis: Any) -> None:
+        """Verify a reachable Redis passes with the breaker state attached."""
+        check = await health.check_cache()
+
+        assert check.status is True
+        assert check.critical is False
+        assert check.detail == {
+            "circuit": {"state": "closed", "recent_failures": 0, "times_opened": 0}
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_without_contacting_redis(
+        self, fake_redis: Any
+    ) -> None:
+        """Verify an open breaker is reported without a Redis round-trip."""
+        breaker = cache.get_circuit_breaker()
+        for _ in range(breaker.failure_threshold):
+            breaker.record_error(RedisConnectionError())
+
+        check = await health.check_cache()
+
+        assert check.status is False
+        assert "circuit breaker is open" in (check.error or "")
+        assert check.detail is not None
+        assert check.detail["circuit"]["state"] == "open"
@@ -0,0 +1,128 @@
+"""Unit tests for CPU-bound job offload in template_sample.jobs.process_pool.
+
+These start real (spawned) child processes, so the functions they run are
+defined at module level where the children can import them.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from template_sample.jobs import process_pool
+from template_sample.jobs.process_pool import (
+    ProcessPool,
+    configure_process_pool,
+    get_process_context,
+    run_in_process,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def _set_greeting(context: dict[str, Any], greeting: str) -> None:
+    context["greeting"] = greeting
+
+
+def _context_value(key: str) -> Any:
+    return get_process_context()[key]
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _crash() -> None:
+    os._exit(1)
+
+
+@run_in_process
+def cube(value: int, *, offset: int = 0) -> int:
+    """Cube a number in the process pool."""
+    return value**3 + offset
+
+
+@pytest.fixture
+def pool() -> Iterator[ProcessPool]:
+    """Create a two-process pool and shut it down after the test.
+
+    Yields:
+        Pool whose children know a greeting
+    """
+    pool = ProcessPool(2, initializer=_set_greeting, initargs=("hello",))
+    yield pool
+    pool.shutdown()
+
+
+class TestProcessPool:
+    """Test running functions in child processes."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warm_and_shared_context(self, pool: ProcessPool) -> None:
+        """Verify warm-up starts every child and runs the initializer."""
+        assert await pool.warm() == 2
+
+        assert await pool.run(_context_value, "greeting") == "hello"
+        assert await pool.run(_square, 12) == 144
+        assert await pool.run(_pid) != os.getpid()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="needs Python 3.11+")
+    async def test_children_are_recycled(self) -> None:
+        """Verify max_tasks_per_child replaces a child after its tasks."""
+        pool = ProcessPool(1, max_tasks_per_child=1)
+        try:
+            first = await pool.run(_pid)
+            second = await pool.run(_pid)
+        finally:
+            pool.shutdown()
+
+        assert first != second
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_recovers_from_a_dead_child(self, pool: ProcessPool) -> None:
+        """Verify a crashed child fails its job and the pool is replaced."""
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(_crash)
+
+        assert await pool.run(_square, 3) == 9
+
+    @pytest.mark.unit
+    def test_rejects_bad_sizes(self) -> None:
+        """Verify worker and recycling limits are validated."""
+        with pytest.raises(ValueError, match="max_workers"):
+            ProcessPool(0)
+        with pytest.raises(ValueError, match="max_tasks_per_child"):
+            ProcessPool(max_tasks_per_child=0)
+
+
+class TestRunInProcess:
+    """Test the ARQ task decorator."""
+
+    @pytest.fixture(autouse=True)
+    def _global_pool(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+        """Install a one-process global pool for the test."""
+        monkeypatch.setattr(process_pool, "_process_pool", None)
+        yield
+        configure_process_pool().shutdown()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_task_runs_in_the_pool(self) -> None:
+        """Verify the task drops ctx and runs the function by name."""
+        configure_process_pool(max_workers=1)
+
+        assert await cube({"redis": object()}, 3, offset=1) == 28
+        assert cube.__name__ == "cube"
@@ -0,0 +1,253 @@
+"""Unit tests for priority queues in template_sample.jobs.queues.
+
+Redis is replaced by fakeredis wrapped in ArqRedis. fakeredis has no INFO
+command, which ``arq.Worker.main`` logs on startup, so jobs are started
+through ``Worker.start_jobs`` instead of the polling loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+pytest.importorskip("arq")
+fakeredis = pytest.importorskip("fakeredis")
+
+from arq import cron, func  # noqa: E402
+from arq.connections import ArqRedis  # noqa: E402
+
+from template_sample.jobs.queues import (  # noqa: E402
+    MultiQueueWorker,
+    QueueMetrics,
+    QueueSpec,
+    WeightedSemaphore,
+    sample_queue_depths,
+)
+
+
+@pytest.fixture
+def arq_redis() -> ArqRedis:
+    """Create an ArqRedis connection backed by fakeredis.
+
+    Returns:
+        ArqRedis sharing a fresh fakeredis server
+    """
+    return ArqRedis(fakeredis.aioredis.FakeRedis().connection_pool)
+
+
+class TestQueueSpec:
+    """Test queue specification validation."""
+
+    @pytest.mark.unit
+    def test_rejects_bad_weight_and_cap(self) -> None:
+        """Verify weights and caps must be positive."""
+        with pytest.raises(ValueError, match="weight"):
+            QueueSpec("q", weight=0)
+        with pytest.raises(ValueError, match="max_jobs"):
+            QueueSpec("q", max_jobs=0)
+
+
+class TestWeightedSemaphore:
+    """Test slot sharing between queues."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_uncontended_queue_uses_every_slot(self) -> None:
+        """Verify a single busy queue is not limited by its weight."""
+        semaphore = WeightedSemaphore(3, [QueueSpec("high", 6), QueueSpec("low")])
+        low = semaphore.for_queue("low")
+
+        for _ in range(3):
+            await asyncio.wait_for(low.acquire(), timeout=1)
+
+        assert semaphore.available == 0
+        assert low.locked()
+        low.release()
+        assert semaphore.held("low") == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_contended_slots_follow_weights(self) -> None:
+        """Verify freed slots go to waiting queues by weighted round-robin."""
+        semaphore = WeightedSemaphore(1, [QueueSpec("high", 3), QueueSpec("low")])
+        await semaphore.acquire("high")
+        granted: list[str] = []
+
+        async def wait(queue: str) -> None:
+            await semaphore.acquire(queue)
+            granted.append(queue)
+
+        waiters = [
+            asyncio.ensure_future(wait(queue)) for queue in ("low",) * 6 + ("high",) * 6
+        ]
+        await asyncio.sleep(0)
+        for _ in range(8):
+            semaphore.release(granted[-1] if granted else "high")
+            await asyncio.sleep(0)
+
+        assert granted == ["high", "high", "low", "high"] * 2
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_capped_queue_leaves_slots_to_others(self) -> None:
+        """Verify a queue at its cap waits while other queues still run."""
+        semaphore = WeightedSemaphore(
+            4, [QueueSpec("default"), QueueSpec("bulk", max_jobs=1)]
+        )
+        await semaphore.acquire("bulk")
+        blocked = asyncio.ensure_future(semaphore.acquire("bulk"))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(semaphore.acquire("default"), timeout=1)
+        assert not blocked.done()
+        assert semaphore.available == 2
+
+        semaphore.release("bulk")
+        await asyncio.wait_for(blocked, timeout=1)
+        assert semaphore.held("bulk") == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self) -> None:
+        """Verify cancelling a waiter leaves the slot for others."""
+        semaphore = WeightedSemaphore(1, [QueueSpec("a"), QueueSpec("b")])
+        await semaphore.acquire("a")
+        cancelled = asyncio.ensure_future(semaphore.acquire("b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        semaphore.release("a")
+
+        await asyncio.wait_for(semaphore.acquire("a"), timeout=1)
+        assert semaphore.held("b") == 0
+        with pytest.raises(ValueError, match="released more slots"):
+            semaphore.release("b")
+
+
+class TestQueueMetrics:
+    """Test queue depth and wait-time metrics."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_depths_and_waits(self, arq_redis: ArqRedis) -> None:
+        """Verify depth sampling, the snapshot and Prometheus output."""
+        metrics = QueueMetrics()
+        await arq_redis.enqueue_job("task", _queue_name="arq:queue:high")
+        await arq_redis.enqueue_job("task", _queue_name="arq:queue:high")
+
+        depths = await sample_queue_depths(
+            arq_redis, ["arq:queue:high", "arq:queue"], metrics
+        )
+        metrics.observe_wait("arq:queue:high", 0.2)
+
+        assert depths == {"arq:queue:high": 2, "arq:queue": 0}
+        assert metrics.snapshot()["arq:queue:high"] == {
+            "depth": 2,
+            "started": 1,
+            "wait_seconds_sum": 0.2,
+        }
+        text = metrics.render_prometheus()
+        assert 'jobs_queue_depth{queue="arq:queue:high"} 2' in text
+        assert (
+            'jobs_queue_wait_seconds_bucket{queue="arq:queue:high",le="0.5"} 1' in text
+        )
+        assert 'jobs_queue_wait_seconds_count{queue="arq:queue:high"} 1' in text
+
+
+class TestMultiQueueWorker:
+    """Test running several queues in one process."""
+
+    @pytest.mark.unit
+    def test_requires_unique_queues(self) -> None:
+        """Verify settings without queues, or with duplicates, are rejected."""
+        with pytest.raises(ValueError, match="at least one QueueSpec"):
+            MultiQueueWorker({"functions": []})
+        with pytest.raises(ValueError, match="unique"):
+            MultiQueueWorker({"queues": [QueueSpec("a"), QueueSpec("a")]})
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arq_takes_slots_through_worker_sem(
+        self, arq_redis: ArqRedis
+    ) -> None:
+        """Verify arq still limits jobs with Worker.sem, which is replaced."""
+        release = asyncio.Event()
+
+        async def wait(ctx: dict[str, Any]) -> None:
+            await release.wait()
+
+        runner = MultiQueueWorker(
+            {
+                "functions": [func(wait, name="wait")],
+                "queues": [QueueSpec("arq:queue")],
+                "max_jobs": 2,
+            },
+            redis_pool=arq_redis,
+        )
+        await runner.start()
+        (worker,) = runner.workers
+
+        await arq_redis.enqueue_job("wait")
+        await worker.start_jobs(await arq_redis.zrange("arq:queue", 0, -1))
+
+        assert runner.semaphore.held("arq:queue") == 1
+        release.set()
+        await asyncio.gather(*worker.tasks.values())
+        assert runner.semaphore.available == 2
+        await runner.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_jobs_from_every_queue(self, arq_redis: ArqRedis) -> None:
+        """Verify per-queue workers share slots, context and hooks."""
+        events: list[str] = []
+
+        async def record(ctx: dict[str, Any], name: str) -> str:
+            events.append(f"{ctx['queue_tag']}:{name}")
+            return name
+
+        async def nightly(ctx: dict[str, Any]) -> None: ...
+
+        async def startup(ctx: dict[str, Any]) -> None:
+            events.append("startup")
+            ctx["queue_tag"] = "shared"
+
+        async def shutdown(ctx: dict[str, Any]) -> None:
+            events.append("shutdown")
+
+        metrics = QueueMetrics()
+        runner = MultiQueueWorker(
+            {
+                "functions": [func(record, name="record")],
+                "cron_jobs": [cron(nightly, hour=2, minute=0)],
+                "queues": [QueueSpec("arq:queue:high", 3), QueueSpec("arq:queue")],
+                "max_jobs": 4,
+                "on_startup": startup,
+                "on_shutdown": shutdown,
+            },
+            redis_pool=arq_redis,
+            metrics=metrics,
+        )
+        await runner.start()
+        high, default = runner.workers
+
+        assert [w.queue_name for w in runner.workers] == ["arq:queue:high", "arq:queue"]
+        assert [bool(w.cron_jobs) for w in runner.workers] == [True, False]
+        assert high.ctx is default.ctx is runner.ctx
+
+        await arq_redis.enqueue_job("record", "a", _queue_name="arq:queue:high")
+        await arq_redis.enqueue_job("record", "b", _queue_name="arq:queue")
+        for worker in runner.workers:
+            job_ids = await arq_redis.zrange(worker.queue_name, 0, -1)
+            await worker.start_jobs(job_ids)
+            await asyncio.gather(*worker.tasks.values())
+
+        assert runner.semaphore.available == 4
+        assert set(metrics.snapshot()) == {"arq:queue:high", "arq:queue"}
+
+        await runner.close()
+        assert events == ["startup", "shared:a", "shared:b", "shutdown"]
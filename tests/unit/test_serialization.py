@@ -0,0 +1,178 @@
+"""Unit tests for cache value serialization in template_sample.core.serialization."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from template_sample.core.serialization import (
+    CacheCodec,
+    JsonSerializer,
+    compress_payload,
+)
+
+SAMPLE = {
+    "total": Decimal("10.25"),
+    "at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+    "day": date(2024, 1, 2),
+    "id": uuid.UUID(int=7),
+    "rows": list(range(100)),
+}
+
+
+class TestCacheCodec:
+    """Test framing, format dispatch and compression."""
+
+    @pytest.mark.unit
+    def test_json_matches_legacy_stringification(self) -> None:
+        """Verify the JSON serializer stores unsupported types as strings."""
+        codec = CacheCodec("json")
+
+        decoded = codec.decode(codec.encode(SAMPLE))
+
+        assert decoded["total"] == "10.25"
+        assert decoded["rows"] == SAMPLE["rows"]
+
+    @pytest.mark.unit
+    def test_pickle_round_trips_exactly(self) -> None:
+        """Verify pickle preserves types."""
+        codec = CacheCodec("pickle")
+
+        assert codec.decode(codec.encode(SAMPLE)) == SAMPLE
+
+    @pytest.mark.unit
+    def test_msgpack_round_trips_extension_types(self) -> None:
+        """Verify msgpack preserves Decimal, datetime, date and UUID."""
+        pytest.importorskip("msgpack")
+        codec = CacheCodec("msgpack")
+
+        assert codec.decode(codec.encode(SAMPLE)) == SAMPLE
+
+    @pytest.mark.unit
+    def test_legacy_unframed_json_is_readable(self) -> None:
+        """Verify payloads written before framing still decode."""
+        codec = CacheCodec("pickle")
+        legacy = json.dumps({"a": [1, 2]}).encode()
+
+        assert codec.decode(legacy) == {"a": [1, 2]}
+        assert codec.decode('{"a": 1}') == {"a": 1}
+
+    @pytest.mark.unit
+    def test_decodes_other_formats_for_migration(self) -> None:
+        """Verify a codec reads entries written by a differently configured one."""
+        old = CacheCodec("json", allowed_formats={"pickle"})
+        new = CacheCodec("pickle", compression="zlib", compress_threshold=0)
+
+        assert new.decode(old.encode({"a": 1})) == {"a": 1}
+        assert old.decode(new.encode({"a": 1})) == {"a": 1}
+
+    @pytest.mark.unit
+    def test_rejects_pickle_unless_allowed(self) -> None:
+        """Verify a JSON codec never unpickles a pickle-framed payload."""
+
+        class Exploit:
+            def __reduce__(self) -> tuple[Any, ...]:
+                return (pytest.fail, ("pickle payload was deserialized",))
+
+        payload = bytes((0x80 | (2 << 3),)) + pickle.dumps(Exploit())
+
+        with pytest.raises(ValueError, match="not allowed"):
+            CacheCodec("json").decode(payload)
+        with pytest.raises(ValueError, match="not allowed"):
+            CacheCodec("json", compression="zlib").decode(payload)
+        with pytest.raises(ValueError, match="serializer"):
+            CacheCodec("json", allowed_formats={"yaml"})
+
+    @pytest.mark.unit
+    def test_json_wide_integers_round_trip(self) -> None:
+        """Verify integers wider than 64 bits survive with or without orjson."""
+        codec = CacheCodec("json")
+        value = {"big": 2**70 + 1, "small": 1}
+
+        decoded = codec.decode(codec.encode(value))
+
+        assert decoded == value
+        assert isinstance(decoded["big"], int)
+
+    @pytest.mark.unit
+    def test_record_flag_is_out_of_band(self) -> None:
+        """Verify the record flag survives compression and never affects values."""
+        codec = CacheCodec("json", compression="zlib", compress_threshold=0)
+        value = ["x"] * 100
+
+        assert codec.decode_frame(codec.encode(value)) == (value, False)
+        assert codec.decode_frame(codec.encode(value, record=True)) == (value, True)
+        assert codec.decode_frame(b'{"legacy": 1}') == ({"legacy": 1}, False)
+        record = CacheCodec("pickle").encode(value, record=True)
+        assert CacheCodec("pickle").decode_frame(compress_payload(record, "zlib")) == (
+            value,
+            True,
+        )
+
+    @pytest.mark.unit
+    def test_compression_threshold(self) -> None:
+        """Verify only payloads above the threshold are compressed."""
+        codec = CacheCodec("json", compression="zlib", compress_threshold=100)
+        small = codec.encode([1])
+        large = codec.encode(["x"] * 1000)
+
+        assert small[0] & 0x07 == 0
+        assert large[0] & 0x07 == 1
+        assert len(large) < len(JsonSerializer().dumps(["x"] * 1000))
+        assert codec.decode(large) == ["x"] * 1000
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("compression", "module"), [("zstd", "zstandard"), ("lz4", "lz4")]
+    )
+    def test_optional_compressors(self, compression: str, module: str) -> None:
+        """Verify optional compressors round-trip when installed."""
+        pytest.importorskip(module)
+        codec = CacheCodec("json", compression=compression, compress_threshold=0)
+
+        assert codec.decode(codec.encode(["x"] * 1000)) == ["x"] * 1000
+
+    @pytest.mark.unit
+    def test_incompressible_payload_stored_raw(self) -> None:
+        """Verify compression is skipped when it would not save space."""
+        codec = CacheCodec("pickle", compression="zlib", compress_threshold=0)
+
+        assert codec.encode(b"\x00")[0] & 0x07 == 0
+
+    @pytest.mark.unit
+    def test_unknown_names_and_ids_raise(self) -> None:
+        """Verify unknown serializer/compressor names and headers are rejected."""
+        with pytest.raises(ValueError, match="serializer"):
+            CacheCodec("yaml")
+        with pytest.raises(ValueError, match="compressor"):
+            CacheCodec("json", compression="brotli")
+        with pytest.raises(ValueError, match="serializer id"):
+            CacheCodec().decode(bytes((0x80 | (15 << 3),)) + b"{}")
+
+
+class TestCompressPayload:
+    """Test compressing payloads after encoding."""
+
+    @pytest.mark.unit
+    def test_compresses_uncompressed_payloads_only(self) -> None:
+        """Verify the serializer is kept and compressed input is left alone."""
+        payload = CacheCodec("pickle").encode(SAMPLE)
+
+        compressed = compress_payload(payload, "zlib")
+
+        assert len(compressed) < len(payload)
+        assert CacheCodec("pickle").decode(compressed) == SAMPLE
+        assert compress_payload(compressed, "zlib") == compressed
+        assert compress_payload(b'{"legacy": 1}', "zlib") == b'{"legacy": 1}'
+
+    @pytest.mark.unit
+    def test_unknown_compressor(self) -> None:
+        """Verify unknown compressor names are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache compressor"):
+            compress_payload(CacheCodec().encode("x"), "brotli")
@@ -0,0 +1,262 @@
+"""Unit tests for the ARQ job helpers in template_sample.jobs.worker.
+
+Redis is replaced by an in-process fakeredis instance wrapped in ArqRedis,
+so jobs are enqueued exactly as they would be against a server.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("arq")
+fakeredis = pytest.importorskip("fakeredis")
+
+from arq.connections import ArqRedis  # noqa: E402
+from arq.jobs import Job, JobStatus  # noqa: E402
+
+from template_sample.jobs import worker  # noqa: E402
+
+
+@pytest.fixture
+def arq_redis() -> ArqRedis:
+    """Create an ArqRedis connection backed by fakeredis.
+
+    Returns:
+        ArqRedis sharing a fresh fakeredis server
+    """
+    return ArqRedis(fakeredis.aioredis.FakeRedis().connection_pool)
+
+
+class TestEnqueueMany:
+    """Test bulk job submission."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_jobs_match_enqueue_job(self, arq_redis: ArqRedis) -> None:
+        """Verify ids come back in order and jobs read back like arq's own."""
+        calls: list[Any] = [("user_1", {"n": 1}), {"user_id": "user_2", "data": {}}]
+        calls += [(f"user_{i}", {}) for i in range(3, 8)]
+
+        job_ids = await worker.enqueue_many(
+            arq_redis, "example_background_task", calls, batch_size=3
+        )
+
+        assert len(job_ids) == len(calls)
+        assert all(job_ids)
+        queued = await arq_redis.zrange(arq_redis.default_queue_name, 0, -1)
+        assert sorted(job.decode() for job in queued) == sorted(job_ids)
+
+        first = await Job(job_ids[0], arq_redis).info()
+        second = await Job(job_ids[1], arq_redis).info()
+        assert first is not None
+        assert second is not None
+        assert (first.function, first.args, first.kwargs) == (
+            "example_background_task",
+            ("user_1", {"n": 1}),
+            {},
+        )
+        assert second.kwargs == {"user_id": "user_2", "data": {}}
+        assert await Job(job_ids[0], arq_redis).status() == JobStatus.queued
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batches_run_by_evalsha(
+        self, arq_redis: ArqRedis, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify each batch runs the loaded script and declares the queue key."""
+        await arq_redis.script_load(worker._ENQUEUE_BATCH_SCRIPT)
+        evalsha = arq_redis.evalsha
+        batch_keys: list[tuple[Any, ...]] = []
+
+        async def record(sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+            batch_keys.append(keys_and_args[:numkeys])
+            return await evalsha(sha, numkeys, *keys_and_args)
+
+        monkeypatch.setattr(arq_redis, "evalsha", record)
+
+        await worker.enqueue_many(
+            arq_redis, "cleanup_old_data", [()] * 5, queue_name="arq:low", batch_size=2
+        )
+
+        assert [len(keys) for keys in batch_keys] == [5, 5, 3]
+        assert all(keys[0] == "arq:low" for keys in batch_keys)
+        assert await arq_redis.zcard("arq:low") == 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deduplicates_ids(self, arq_redis: ArqRedis) -> None:
+        """Verify repeated ids, within a call or already queued, are skipped."""
+        existing = await arq_redis.enqueue_job("send_email_task", _job_id="email:a")
+        assert existing is not None
+
+        job_ids = await worker.enqueue_many(
+            arq_redis,
+            "send_email_task",
+            [{"recipient": r} for r in ("a", "b", "c", "b")],
+            job_id=lambda args, kwargs: f"email:{kwargs['recipient']}",
+            batch_size=2,
+        )
+
+        assert job_ids == [None, "email:b", "email:c", None]
+        assert await arq_redis.zcard("arq:queue") == 3  # existing, b and c
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queue_defer_and_expiry(self, arq_redis: ArqRedis) -> None:
+        """Verify the queue name, deferred score and job key TTL."""
+        [job_id] = await worker.enqueue_many(
+            arq_redis,
+            "cleanup_old_data",
+            [()],
+            queue_name="arq:low",
+            defer_by=60,
+            expires=120,
+        )
+        assert job_id is not None
+
+        info = await Job(job_id, arq_redis, _queue_name="arq:low").info()
+        assert info is not None
+        score = await arq_redis.zscore("arq:low", job_id)
+        assert score == pytest.approx(info.enqueue_time.timestamp() * 1000 + 60_000)
+        assert 0 < await arq_redis.pttl(f"arq:job:{job_id}") <= 120_000
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rejects_bad_calls(self, arq_redis: ArqRedis) -> None:
+        """Verify non-tuple arguments and empty batches are rejected."""
+        with pytest.raises(TypeError, match="mappings or tuples"):
+            await worker.enqueue_many(
+                arq_redis,
+                "send_email_task",
+                ["a"],  # type: ignore[list-item]
+            )
+        with pytest.raises(ValueError, match="batch_size"):
+            await worker.enqueue_many(arq_redis, "send_email_task", [], batch_size=0)
+
+        assert await worker.enqueue_many(arq_redis, "send_email_task", []) == []
+
+
+class TestQueueRouting:
+    """Test routing tasks to their configured queue."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_routing_off_by_default(self, arq_redis: ArqRedis) -> None:
+        """Verify tasks stay on the default queue unless routing is enabled."""
+        job_id = await worker.enqueue_task(arq_redis, "process_file_upload", "f1", "/x")
+
+        assert worker.queue_for("send_email_task") == "arq:queue"
+        assert await arq_redis.zrange("arq:queue", 0, -1) == [job_id.encode()]
+        assert await arq_redis.zcard(worker.BULK_QUEUE) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_enqueue_task_uses_task_queue(
+        self, arq_redis: ArqRedis, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify tasks land on their queue unless one is given."""
+        monkeypatch.setattr(worker.settings, "job_queue_routing", True)
+        routed = await worker.enqueue_task(arq_redis, "process_file_upload", "f1", "/x")
+        default = await worker.enqueue_task(arq_redis, "example_background_task", "u")
+        override = await worker.enqueue_task(
+            arq_redis, "process_file_upload", "f2", "/y", _queue_name="arq:queue"
+        )
+
+        assert await arq_redis.zrange(worker.BULK_QUEUE, 0, -1) == [routed.encode()]
+        assert sorted(await arq_redis.zrange("arq:queue", 0, -1)) == sorted(
+            [default.encode(), override.encode()]
+        )
+        assert {spec.name for spec in worker.WorkerSettings.queues} >= set(
+            worker.WorkerSettings.task_queues.values()
+        )
+
+
+class TestProcessFileUpload:
+    """Test the streaming upload task."""
+
+    @pytest.mark.unit
+    def test_parse_rows(self) -> None:
+        """Verify CSV quoting and encoding are handled per line."""
+        rows = worker.parse_rows([b'1,"Smith, Ann"', "2,Zo\u00eb".encode()])
+
+        assert rows == [["1", "Smith, Ann"], ["2", "Zo\u00eb"]]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_upload_streams_through_the_pool(
+        self, tmp_path: Any, arq_redis: ArqRedis, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify the task parses in the process pool, stores and cleans up."""
+        from template_sample.jobs import process_pool
+
+        monkeypatch.setattr(process_pool, "_process_pool", None)
+        monkeypatch.setattr(worker.WorkerSettings, "process_pool_workers", 1)
+        path = tmp_path / "upload.csv"
+        path.write_bytes(b'id,note\n1,"two\nlines"\n2,b\n')
+        stored: list[list[str]] = []
+
+        async def upload_writer(
+            file_id: str, rows: list[list[str]], batch: Any
+        ) -> None:
+            stored.extend(rows)
+
+        ctx: dict[str, Any] = {"redis": arq_redis}
+
+        await worker.startup(ctx)
+        ctx["upload_writer"] = upload_writer
+        try:
+            result = await worker.process_file_upload(ctx, "f1", str(path))
+        finally:
+            await worker.shutdown(ctx)
+
+        assert stored == [["id", "note"], ["1", "two\nlines"], ["2", "b"]]
+        assert result["status"] == "completed"
+        assert result["records_stored"] == 3
+        assert result["resumed_from_offset"] == 0
+        assert await arq_redis.exists("upload:checkpoint:f1") == 0
+        assert ctx["process_pool"]._executor is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_process_pool_starts_lazily(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify startup spawns child processes only when warming is on."""
+        from template_sample.jobs import process_pool
+
+        monkeypatch.setattr(process_pool, "_process_pool", None)
+        monkeypatch.setattr(worker.WorkerSettings, "process_pool_workers", 1)
+        ctx: dict[str, Any] = {}
+
+        await worker.startup(ctx)
+        try:
+            assert ctx["process_pool"]._executor is None
+            monkeypatch.setattr(worker.WorkerSettings, "process_pool_warm", True)
+            await worker.startup(ctx)
+            assert ctx["process_pool"]._executor is not None
+        finally:
+            await worker.shutdown(ctx)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_upload_without_writer_is_not_stored(
+        self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Verify rows are not reported as stored when there is no writer."""
+        from template_sample.jobs import process_pool
+
+        monkeypatch.setattr(process_pool, "_process_pool", None)
+        path = tmp_path / "upload.csv"
+        path.write_bytes(b"1,a\n2,b\n")
+
+        pool = process_pool.configure_process_pool(max_workers=1)
+        try:
+            result = await worker.process_file_upload({}, "f1", str(path))
+        finally:
+            pool.shutdown()
+
+        assert result["status"] == "parsed"
+        assert result["records_processed"] == 2
+        assert result["records_stored"] == 0